@@ -0,0 +1,252 @@
+import numpy as np
+from gymnasium import spaces
+
+from FYP.agent_components.actions.HRL.lane_changer import BatchedLaneChanger
+from FYP.agent_components.actions.HRL.speed_changer import BatchedSpeedChanger
+from highway_env.vehicle.kinematics import Vehicle
+
+
+class BatchedCustomActions:
+    """
+    The high-level actions of `CustomActions`, executed in all the scenes of a `BatchedHighwayEnv` at once.
+
+    The sub-policies of all scenes are batched controllers (`BatchedLaneChanger` and `BatchedSpeedChanger`), whose
+    low-level actions are computed together and applied in a single step of the batched environment, so that the
+    throughput of high-level actions scales with that of the batched simulator.
+
+    High-level actions last a variable number of low-level steps, so the wrapper is stepped like an `AsyncEnvPool`:
+    actions are sent to some scenes with `send`, and `recv` steps the scenes until enough of them have completed their
+    high-level action. Scenes which are not executing a high-level action (not sent any yet, or completed and waiting
+    to be returned) are paused in the batched environment, so that each episode only progresses with its own
+    high-level actions, as in `CustomActions`.
+
+    Scenes whose episode ends are reset automatically: the returned observation is the first of the next episode, and
+    the final one is in the info under `terminal_observation`.
+
+    Attributes:
+        env (BatchedHighwayEnv): The batched environment.
+        num_envs (int): The number of scenes.
+        action_space (gym.spaces): The high-level action space of each scene, as in `CustomActions`.
+        observation_space (gym.spaces): The observation space of each scene.
+        lane_changer (BatchedLaneChanger): The lane change and forward movement sub-policies of the scenes.
+        speed_changer (BatchedSpeedChanger): The speed change sub-policies of the scenes.
+        pending (set): Indices of the scenes which have been sent an action, and have not returned yet.
+        HL_step_count (np.ndarray): Number of high-level steps taken in the current episode of each scene.
+        LL_step_count (np.ndarray): Number of low-level steps taken in the current episode of each scene.
+        timesteps_HL (np.ndarray): Number of high-level steps taken across all episodes of each scene.
+        timesteps_LL (np.ndarray): Number of low-level steps taken across all episodes of each scene.
+        episode_count (np.ndarray): Number of episodes of each scene.
+        total_speed (np.ndarray): Total speed of the vehicle of each scene over the low-level steps of the episode.
+        right_lane_count (np.ndarray): Number of low-level steps of the episode performed in the rightmost lane.
+    """
+
+    FORWARD_DISTANCE = 10
+    """The distance of the forward movements [m], see `CustomActions.forward_10_meters`."""
+
+    def __init__(self, env):
+        """
+        Initializes the wrapper.
+
+        Args:
+            env (BatchedHighwayEnv): The batched environment.
+        """
+        self.env = env
+        self.num_envs = env.num_envs
+        self.action_space = spaces.Discrete(5)
+        self.observation_space = env.single_observation_space
+        self.lane_changer = BatchedLaneChanger(env)
+        self.speed_changer = BatchedSpeedChanger(env)
+        self.leftmost_lane = 0
+        self.rightmost_lane = env.lanes_count - 1
+        self.pending = set()
+
+        self.HL_step_count = np.zeros(self.num_envs, dtype=int)
+        self.LL_step_count = np.zeros(self.num_envs, dtype=int)
+        self.timesteps_HL = np.zeros(self.num_envs, dtype=int)
+        self.timesteps_LL = np.zeros(self.num_envs, dtype=int)
+        self.episode_count = np.zeros(self.num_envs, dtype=int)
+        self.total_speed = np.zeros(self.num_envs)
+        self.right_lane_count = np.zeros(self.num_envs, dtype=int)
+
+        # The high-level step of each scene in progress
+        self.observations = None
+        self.rewards = np.zeros(self.num_envs)
+        self.completed = np.zeros(self.num_envs, dtype=bool)
+        self.terminated = np.zeros(self.num_envs, dtype=bool)
+        self.truncated = np.zeros(self.num_envs, dtype=bool)
+        self.terminal_observations = [None] * self.num_envs
+        self.last_info = [{} for _ in range(self.num_envs)]
+
+    def reset(self, seed=None):
+        """
+        Resets all the scenes and their counters.
+
+        Args:
+            seed (int, optional): The seed of the batched environment. Defaults to None.
+
+        Returns:
+            np.ndarray: The observations of the scenes.
+        """
+        self.observations, _ = self.env.reset(seed=seed)
+        self.pending.clear()
+        self.lane_changer.active[:] = self.speed_changer.active[:] = False
+        self.HL_step_count[:] = self.LL_step_count[:] = 0
+        self.total_speed[:] = self.right_lane_count[:] = 0
+        self.episode_count += 1
+        self._start_transitions(np.ones(self.num_envs, dtype=bool))
+        return self.observations.copy()
+
+    def send(self, actions, env_ids):
+        """
+        Starts high-level actions in some scenes, checking that they are possible as in `CustomActions.step`.
+
+        Args:
+            actions (np.ndarray): The high-level actions, one per scene.
+            env_ids (np.ndarray): The indices of the scenes, which must not be pending.
+        """
+        env_ids = np.asarray(env_ids, dtype=int)
+        busy = self.pending.intersection(env_ids.tolist())
+        if busy:
+            raise ValueError(f"Environments {sorted(busy)} have not returned their previous step yet")
+        sent = np.zeros(self.num_envs, dtype=bool)
+        sent[env_ids] = True
+        action = np.zeros(self.num_envs, dtype=int)
+        action[env_ids] = np.asarray(actions, dtype=int).reshape(-1)
+
+        # Lane changes and forward movements, see CustomActions.HL_actions
+        lane_change = np.select([action == 1, action == 2], [-1, 1], 0)
+        destination_lane = self.env.lane[:, 0] + lane_change
+        lane_change[(destination_lane < self.leftmost_lane) | (destination_lane > self.rightmost_lane)] = 0
+        distance = np.where(action == 0, self.FORWARD_DISTANCE, 0)
+        lane = sent & (action <= 2)
+        self.lane_changer.start(lane, lane_change[lane], distance[lane])
+
+        # Speed changes
+        speed_change = np.select([action == 3, action == 4], [-1, 1], 0)
+        destination_speed = self.env.speed[:, 0] + speed_change
+        speed_change[(destination_speed < Vehicle.MIN_SPEED) | (destination_speed > Vehicle.MAX_SPEED)] = 0
+        speed = sent & (action >= 3)
+        self.speed_changer.start(speed, speed_change[speed])
+
+        self._start_transitions(sent)
+        self.pending.update(env_ids.tolist())
+
+    def recv(self, min_batch=1):
+        """
+        Steps all the scenes until at least `min_batch` pending scenes have completed their high-level action, and
+        returns the results of the pending scenes which have.
+
+        Args:
+            min_batch (int, optional): The minimum number of scenes to return. Defaults to 1.
+
+        Returns:
+            tuple: The observations, rewards, dones and infos of the returned scenes, and their indices.
+        """
+        if not 0 < min_batch <= len(self.pending):
+            raise ValueError(f"Cannot wait for {min_batch} environments, {len(self.pending)} are pending")
+        pending = np.zeros(self.num_envs, dtype=bool)
+        pending[list(self.pending)] = True
+        while np.count_nonzero(pending & self.completed) < min_batch:
+            self._low_level_step(pending)
+
+        env_ids = np.flatnonzero(pending & self.completed)
+        dones = self.terminated[env_ids] | self.truncated[env_ids]
+        infos = [self._high_level_info(env_id) for env_id in env_ids]
+        self.pending.difference_update(env_ids.tolist())
+        return self.observations[env_ids].copy(), self.rewards[env_ids].copy(), dones, infos, env_ids
+
+    def step(self, actions):
+        """
+        Sends high-level actions to all the scenes, and waits until all of them have completed.
+
+        Args:
+            actions (np.ndarray): The high-level actions, one per scene.
+
+        Returns:
+            tuple: The observations, rewards, dones and infos of the scenes, in order.
+        """
+        self.send(actions, range(self.num_envs))
+        obs, rewards, dones, infos, env_ids = self.recv(min_batch=self.num_envs)
+        return obs, rewards, dones, infos
+
+    def close(self):
+        self.env.close()
+
+    def _start_transitions(self, scenes):
+        """Starts new high-level steps in some scenes."""
+        self.rewards[scenes] = 0
+        self.completed[scenes] = self.terminated[scenes] = self.truncated[scenes] = False
+
+    def _low_level_step(self, pending):
+        """
+        Performs a low-level step of the scenes executing a high-level action, with the actions of their sub-policies.
+        The other scenes are paused.
+
+        Args:
+            pending (np.ndarray): A mask of the pending scenes, whose high-level steps are in progress or completed.
+        """
+        running = pending & ~self.completed
+        actions = np.zeros((self.num_envs, 2))  # Neutral actions, for the paused scenes
+        lane, speed = self.lane_changer.active, self.speed_changer.active
+        actions[lane] = self.lane_changer.choose_action()[lane]
+        actions[speed] = self.speed_changer.choose_action()[speed]
+        self.env.paused[:] = ~running
+        self.observations, reward, terminated, truncated, info = self.env.step(actions)
+        self.env.paused[:] = False
+
+        self.rewards[running] += reward[running]
+        self.LL_step_count[running] += 1
+        self.timesteps_LL[running] += 1
+        self.total_speed[running] += info["speed"][running]
+        lane = np.rint(info["rewards"]["right_lane_reward"] * max(self.rightmost_lane, 1))
+        self.right_lane_count[running] += lane[running] == self.rightmost_lane
+        for scene in np.flatnonzero(running):
+            self.last_info[scene] = {"position": info["position"][scene], "speed": info["speed"][scene],
+                                     "crashed": info["crashed"][scene],
+                                     "on_road": bool(info["rewards"]["on_road_reward"][scene])}
+
+        # Sub-policies end with the episode, otherwise when they are done
+        ended = running & (terminated | truncated)
+        self.terminated |= ended & terminated
+        self.truncated |= ended & truncated
+        for scene in np.flatnonzero(ended):
+            self.terminal_observations[scene] = info["final_observation"][scene]
+        self.lane_changer.active &= ~ended
+        self.speed_changer.active &= ~ended
+        self.completed |= running & (ended | self.lane_changer.done() | self.speed_changer.done())
+
+    def _high_level_info(self, scene):
+        """
+        Completes the high-level step of a scene, updating its counters, and resetting them if its episode has ended.
+
+        Args:
+            scene (int): The index of the scene.
+
+        Returns:
+            dict: The info of the high-level step, as in `CustomActions.step`.
+        """
+        self.HL_step_count[scene] += 1
+        self.timesteps_HL[scene] += 1
+        last_info = self.last_info[scene]
+        info = {
+            "HL_step_count": int(self.HL_step_count[scene]),
+            "LL_step_count": int(self.LL_step_count[scene]),
+            "timesteps_HL": int(self.timesteps_HL[scene]),
+            "timesteps_LL": int(self.timesteps_LL[scene]),
+            "episode_count": int(self.episode_count[scene]),
+            "pos_x": last_info["position"][0],
+            "pos_y": last_info["position"][1],
+            "speed": last_info["speed"],
+            "crashed": last_info["crashed"],
+            "average_speed": self.total_speed[scene] / max(1, self.LL_step_count[scene]),
+            "right_lane_count": int(self.right_lane_count[scene]),
+            "on_road": last_info["on_road"],
+            "truncated": bool(self.truncated[scene]),
+        }
+        if self.terminated[scene] or self.truncated[scene]:
+            info["terminal_observation"] = self.terminal_observations[scene]
+            info["TimeLimit.truncated"] = bool(self.truncated[scene] and not self.terminated[scene])
+            self.HL_step_count[scene] = self.LL_step_count[scene] = 0
+            self.total_speed[scene] = self.right_lane_count[scene] = 0
+            self.episode_count[scene] += 1
+        return info
@@ -3,6 +3,7 @@ from gymnasium import spaces
 
 from FYP.agent_components.actions.HRL.lane_changer import LaneChanger
 from FYP.agent_components.actions.HRL.speed_changer import SpeedChanger
+from FYP.agent_components.custom_reward import CustomReward
 from highway_env.vehicle.kinematics import Vehicle
 
 
@@ -26,18 +27,30 @@ class CustomActions(gym.ActionWrapper):
             the current episode, so average can be calculated.
         right_lane_count (int): Counts the number of low-level actions performed while the vehicle is in the
             rightmost lane.
+        macro_step (bool): Whether the intermediate low-level actions only simulate the environment and compute
+            their reward, the observation and info being computed once at the end of the high-level action. Only
+            enabled when all the inner wrappers are supported, see `MACRO_STEP_WRAPPERS`.
+        last_action (list): The last low-level action performed in a macro-step.
 
     Methods:
         reset(**kwargs): Resets the environment and counters.
         step(action): Performs a high-level action in the environment and returns the result.
     """
 
-    def __init__(self, env):
+    MACRO_STEP_WRAPPERS = (gym.wrappers.OrderEnforcing, gym.wrappers.PassiveEnvChecker, CustomReward)
+    """The inner wrappers supported by macro-steps: the checks of gym.make, and the custom rewards."""
+
+    def __init__(self, env, macro_step=False):
         """
         Initializes the custom wrapper.
 
         Args:
             env (gym.Env): The original Gymnasium environment to be wrapped.
+            macro_step (bool, optional): Whether to execute the high-level actions as macro-steps, which skip the
+                    observation and info of the intermediate low-level actions. Macro-steps bypass the `step` of the
+                    inner wrappers, only replaying their `reward`, `observation` and `CustomReward.update_info`, so
+                    full low-level steps are used instead when a wrapper is not in `MACRO_STEP_WRAPPERS`. With
+                    supported wrappers, the results are the same as with full low-level steps. Defaults to False.
         """
         super().__init__(env)
         self.HL_step_count = 0
@@ -51,6 +64,9 @@ class CustomActions(gym.ActionWrapper):
         self.rightmost_lane = self.env.unwrapped.config['lanes_count'] - 1
         self.total_speed = 0
         self.right_lane_count = 0
+        self.macro_step = macro_step and all(type(wrapper) in self.MACRO_STEP_WRAPPERS
+                                             for wrapper in self.inner_wrappers())
+        self.last_action = None
 
     def reset(self, **kwargs):
         """
@@ -172,7 +188,8 @@ class CustomActions(gym.ActionWrapper):
             changer = SpeedChanger(self.env, 0)
 
         # Execute low-level until high-level action is done
-        obs, reward, terminated, truncated, info = changer.step()
+        step_fn = self.simulate_step if self.macro_step else None
+        obs, reward, terminated, truncated, info = changer.step(step_fn)
 
         self.total_speed += self.env.unwrapped.vehicle.speed
         if self.env.unwrapped.vehicle.lane_index[2] == self.rightmost_lane:
@@ -180,14 +197,20 @@ class CustomActions(gym.ActionWrapper):
 
         cumulative_reward = reward
 
-        while not changer.done() and not terminated:
-            obs, reward, terminated, truncated, info = changer.step()
+        # In macro-steps, the end of the sub-policy is only applied once the observation is computed, as in full steps
+        done_fn = changer.completed if self.macro_step else changer.done
+        while not done_fn() and not terminated:
+            obs, reward, terminated, truncated, info = changer.step(step_fn)
             cumulative_reward += reward
 
             self.total_speed += self.env.unwrapped.vehicle.speed
             if self.env.unwrapped.vehicle.lane_index[2] == self.rightmost_lane:
                 self.right_lane_count += 1
 
+        if self.macro_step:
+            obs, info = self.observe_step()
+            changer.done()
+
         self.LL_step_count += changer.step_count
         self.timesteps_LL += changer.step_count
         self.HL_step_count += 1
@@ -196,11 +219,62 @@ class CustomActions(gym.ActionWrapper):
         # Useful for evaluation logs
         info["HL_step_count"] = self.HL_step_count
         info["LL_step_count"] = self.LL_step_count
+        info["timesteps_HL"] = self.timesteps_HL
+        info["timesteps_LL"] = self.timesteps_LL
+        info["episode_count"] = self.episode_count
         info["pos_x"] = obs[0][1]
         info["pos_y"] = obs[0][2]
         info["average_speed"] = self.total_speed / max(1, self.LL_step_count)
         info["right_lane_count"] = self.right_lane_count
-        info["on_road"] = self.env.unwrapped.vehicle.on_road
+        info["on_road"] = self.env.unwrapped.perception.on_road(self.env.unwrapped.vehicle)
         info["truncated"] = truncated
 
         return obs, cumulative_reward, terminated, truncated, info
+
+    def inner_wrappers(self):
+        """
+        Lists the wrappers between this wrapper and the original environment.
+
+        Returns:
+            list: The wrappers, from the innermost to the outermost.
+        """
+        wrappers = []
+        env = self.env
+        while isinstance(env, gym.Wrapper):
+            wrappers.insert(0, env)
+            env = env.env
+        return wrappers
+
+    def simulate_step(self, action):
+        """
+        Performs a low-level action of a macro-step, simulating the environment and computing its reward (including
+        that of the reward wrappers) without computing its observation and info.
+
+        Args:
+            action: The low-level action [acceleration, steering].
+
+        Returns:
+            tuple: The result of the low-level step (observation, reward, terminated, truncated, info), in which the
+                observation and info are None.
+        """
+        reward, terminated, truncated = self.env.unwrapped.simulate_step(action)
+        for wrapper in self.inner_wrappers():
+            if isinstance(wrapper, gym.RewardWrapper):
+                reward = wrapper.reward(reward)
+        self.last_action = action
+        return None, reward, terminated, truncated, None
+
+    def observe_step(self):
+        """
+        Computes the observation and info at the end of a macro-step, as returned by the last low-level step.
+
+        Returns:
+            tuple: The observation and info dictionary.
+        """
+        obs, info = self.env.unwrapped.observe_step(self.last_action)
+        for wrapper in self.inner_wrappers():
+            if isinstance(wrapper, gym.ObservationWrapper):
+                obs = wrapper.observation(obs)
+            if isinstance(wrapper, CustomReward):
+                wrapper.update_info(info)
+        return obs, info
@@ -1,3 +1,8 @@
+import numpy as np
+
+from highway_env.road.lane import AbstractLane, StraightLane
+
+
 class LaneChanger:
     """
     A behavior model for changing lanes or moving forward a specified distance within a highway environment.
@@ -6,12 +11,19 @@ class LaneChanger:
     a given distance, based on the environment's configuration and the vehicle's current state. It takes into account
     the policy frequency of the environment to calculate a lane position tolerance, ensuring smooth transitions.
 
+    The geometry of the target lane is precomputed when the sub-policy starts, so that its completion is evaluated
+    from the cached state of the vehicle (its lane index and position) without projecting it on its lane.
+
     Attributes:
         env (Environment): The simulation environment containing the vehicle.
+        base_env (AbstractEnv): The unwrapped environment, whose controlled vehicle is read at each step.
         change (int): Specifies the direction and magnitude of the lane change (-1 for left, 1 for right, 0 for no lane
                     change). This determines the target lane relative to the vehicle's current lane.
         destination_lane (int): The index of the target lane after the change has been made. Calculated based on
                     the current lane and the change direction.
+        destination_lane_index (tuple): The full index (origin node, destination node, lane id) of the target lane.
+        lane_origin (np.ndarray): The start of the target lane, if it is a straight lane, otherwise None.
+        lane_normal (np.ndarray): The lateral direction of the target lane, if it is a straight lane, otherwise None.
         step_count (int): Tracks the number of steps taken since the beginning of the action. This is used to
                     monitor progress towards the action's completion.
         vehicle_posX (float): Records the initial x-position (longitudinal position) of the vehicle when the lane change
@@ -35,12 +47,29 @@ class LaneChanger:
                     is required. Defaults to 0.
         """
         self.env = env
+        self.base_env = env.unwrapped
         self.change = change
         self.destination_lane = self.get_current_lane() + self.change
         self.step_count = 0
         self.vehicle_posX = self.get_current_posX()
         self.target_distance = distance or 0
-        self.lane_position_tolerance = (1 / (self.env.unwrapped.config['policy_frequency'])) * 1.5
+        self.lane_position_tolerance = (1 / (self.base_env.config['policy_frequency'])) * 1.5
+        self.destination_lane_index, self.lane_origin, self.lane_normal = self.destination_geometry()
+
+    def destination_geometry(self):
+        """
+        Precomputes the geometry of the target lane.
+
+        Returns:
+            tuple: The index of the target lane, and its start and lateral direction if it is an existing straight
+                lane (None otherwise).
+        """
+        _from, _to, _ = self.base_env.vehicle.lane_index
+        lanes = self.base_env.road.network.graph[_from][_to]
+        lane = lanes[self.destination_lane] if 0 <= self.destination_lane < len(lanes) else None
+        if isinstance(lane, StraightLane):
+            return (_from, _to, self.destination_lane), lane.start, lane.direction_lateral
+        return (_from, _to, self.destination_lane), None, None
 
     def get_current_lane(self):
         """
@@ -49,7 +78,7 @@ class LaneChanger:
         Returns:
             int: The index of the lane in which the vehicle is currently located.
         """
-        return self.env.unwrapped.vehicle.lane_index[2]
+        return self.base_env.vehicle.lane_index[2]
 
     def get_current_posX(self):
         """
@@ -58,21 +87,39 @@ class LaneChanger:
         Returns:
             float: The vehicle's current x-position.
         """
-        return self.env.unwrapped.vehicle.position[0]
+        return self.base_env.vehicle.position[0]
 
-    def step(self):
+    def step(self, step_fn=None):
         """
         Executes a step in the environment towards completing the lane change or moving forward.
 
+        Args:
+            step_fn (callable, optional): The function performing the low-level action. Defaults to the step of the
+                    environment.
+
         Returns:
-            The result of the environment step (observation, reward, done, info).
+            The result of the step function, by default the result of the environment step (observation, reward,
+            terminated, truncated, info).
         """
         self.step_count += 1
-        return self.env.step(self.choose_action())
+        return (step_fn or self.env.step)(self.choose_action())
 
     def done(self):
         """
-        Checks whether the specified lane change or forward movement has been completed.
+        Checks whether the specified lane change or forward movement has been completed, and resets the vehicle's
+        heading and steering once a lane change is completed.
+
+        Returns:
+            bool: True if the specified action (lane change or forward movement) is completed, False otherwise.
+        """
+        done = self.completed()
+        if done and self.change != 0:
+            self.reset_after_change()
+        return done
+
+    def completed(self):
+        """
+        Checks whether the specified lane change or forward movement has been completed, without modifying the vehicle.
 
         For lane changes, completion is determined by the vehicle's presence within the target lane and within
         the `lane_position_tolerance`.
@@ -82,15 +129,31 @@ class LaneChanger:
         Returns:
             bool: True if the specified action (lane change or forward movement) is completed, False otherwise.
         """
-        done = (self.destination_lane == self.get_current_lane() and
-                self.lane_position_tolerance > self.env.unwrapped.vehicle.lane_offset[1] > -self.lane_position_tolerance)
-
-        if done and self.change == 0:
-            distance_covered = self.get_current_posX() - self.vehicle_posX
+        vehicle = self.base_env.vehicle
+        if vehicle.lane_index[2] != self.destination_lane:
+            return False
+        lateral_offset = self.lateral_offset(vehicle)
+        if not self.lane_position_tolerance > lateral_offset > -self.lane_position_tolerance:
+            return False
+        if self.change == 0:
+            distance_covered = vehicle.position[0] - self.vehicle_posX
             return distance_covered >= self.target_distance
+        return True
 
-        self.reset_after_change() if done else None
-        return done
+    def lateral_offset(self, vehicle):
+        """
+        Computes the lateral offset of the vehicle from the center of its lane, from the precomputed geometry when it is
+        on the target lane.
+
+        Args:
+            vehicle (Vehicle): The controlled vehicle.
+
+        Returns:
+            float: The lateral offset [m].
+        """
+        if self.lane_normal is not None and vehicle.lane_index == self.destination_lane_index:
+            return np.dot(vehicle.position - self.lane_origin, self.lane_normal)
+        return vehicle.lane.local_coordinates(vehicle.position)[1]
 
     def reset_after_change(self):
         """
@@ -98,8 +161,9 @@ class LaneChanger:
 
         This ensures that the vehicle aligns properly with the lane and is ready for subsequent actions.
         """
-        self.env.unwrapped.vehicle.heading = 0  # Reset heading to straight forward
-        self.env.unwrapped.vehicle.action['steering'] = 0.0  # Reset steering to neutral
+        self.base_env.vehicle.heading = 0  # Reset heading to straight forward
+        self.base_env.vehicle.action['steering'] = 0.0  # Reset steering to neutral
+        self.base_env.perception.clear()  # The lane offsets have changed with the heading
 
     def choose_action(self):
         """
@@ -108,15 +172,107 @@ class LaneChanger:
         Returns:
            list: The action [acceleration, steering] to be taken.
         """
-        steering = self.env.unwrapped.vehicle.action['steering']
-        acceleration = self.env.unwrapped.vehicle.action['acceleration']
+        vehicle = self.base_env.vehicle
+        acceleration = vehicle.action['acceleration']
 
-        lane_difference = self.destination_lane - self.get_current_lane()
+        lane_difference = self.destination_lane - vehicle.lane_index[2]
         if lane_difference > 0:
-            steering = 0.5 / self.env.unwrapped.vehicle.speed  # Adjust steering for right lane change
+            steering = 0.5 / vehicle.speed  # Adjust steering for right lane change
         elif lane_difference < 0:
-            steering = -0.5 / self.env.unwrapped.vehicle.speed  # Adjust steering for left lane change
+            steering = -0.5 / vehicle.speed  # Adjust steering for left lane change
         else:
             steering = 0  # No steering adjustment needed for straight movement
 
         return [acceleration, steering]
+
+
+class BatchedLaneChanger:
+    """
+    The LaneChanger sub-policies of the ego-vehicles of all the scenes of a `BatchedHighwayEnv`, executed together.
+
+    Each scene executes its own sub-policy, started with `start`. The low-level actions and completions of all scenes
+    are computed in single vectorized passes over the state arrays of the batched environment, whose lanes are
+    straight and centered on multiples of the lane width.
+
+    Attributes:
+        env (BatchedHighwayEnv): The batched environment.
+        active (np.ndarray): Whether each scene is executing a sub-policy.
+        change (np.ndarray): The lane change of each scene (-1 for left, 1 for right, 0 for no lane change).
+        destination_lane (np.ndarray): The index of the target lane of each scene.
+        destination_y (np.ndarray): The lateral position of the center of the target lane of each scene.
+        start_x (np.ndarray): The x-position of each ego-vehicle when its sub-policy started.
+        target_distance (np.ndarray): The distance to move forward in each scene, for forward movements.
+        lane_position_tolerance (float): The tolerance on the lateral offset from the center of the target lanes.
+    """
+
+    def __init__(self, env):
+        """
+        Initializes the sub-policies, all inactive.
+
+        Args:
+            env (BatchedHighwayEnv): The batched environment.
+        """
+        self.env = env
+        self.active = np.zeros(env.num_envs, dtype=bool)
+        self.change = np.zeros(env.num_envs, dtype=int)
+        self.destination_lane = np.zeros(env.num_envs, dtype=int)
+        self.destination_y = np.zeros(env.num_envs)
+        self.start_x = np.zeros(env.num_envs)
+        self.target_distance = np.zeros(env.num_envs)
+        self.lane_position_tolerance = (1 / (env.config['policy_frequency'])) * 1.5
+
+    def start(self, scenes, change, distance=None):
+        """
+        Starts sub-policies in some scenes, precomputing their target lanes.
+
+        Args:
+            scenes (np.ndarray): A mask of the scenes.
+            change (np.ndarray or int): The lane changes of these scenes.
+            distance (np.ndarray or float, optional): The distances to move forward. Defaults to 0.
+        """
+        self.active[scenes] = True
+        self.change[scenes] = change
+        self.destination_lane[scenes] = self.env.lane[scenes, 0] + self.change[scenes]
+        self.destination_y[scenes] = self.destination_lane[scenes] * AbstractLane.DEFAULT_WIDTH
+        self.start_x[scenes] = self.env.x[scenes, 0]
+        self.target_distance[scenes] = 0 if distance is None else distance
+
+    def choose_action(self):
+        """
+        Determines the low-level actions of all scenes, see `LaneChanger.choose_action`.
+
+        Returns:
+            np.ndarray: The actions [acceleration, steering] of the scenes, meaningful for active scenes only.
+        """
+        lane_difference = self.destination_lane - self.env.lane[:, 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            steering = np.sign(lane_difference) * 0.5 / self.env.speed[:, 0]
+        steering[lane_difference == 0] = 0  # No steering adjustment needed for straight movement
+        return np.stack([self.env.ego_action[:, 0], steering], axis=1)
+
+    def completed(self):
+        """
+        Checks which sub-policies have been completed, without modifying the vehicles, see `LaneChanger.completed`.
+
+        Returns:
+            np.ndarray: A mask of the active scenes whose sub-policy is completed.
+        """
+        in_lane = (self.env.lane[:, 0] == self.destination_lane) \
+            & (np.abs(self.env.y[:, 0] - self.destination_y) < self.lane_position_tolerance)
+        moved = self.env.x[:, 0] - self.start_x >= self.target_distance
+        return self.active & in_lane & ((self.change != 0) | moved)
+
+    def done(self):
+        """
+        Checks which sub-policies have been completed, resets the heading and steering of the ego-vehicles which have
+        completed a lane change, and deactivates the completed sub-policies.
+
+        Returns:
+            np.ndarray: A mask of the scenes whose sub-policy is completed.
+        """
+        done = self.completed()
+        changed = done & (self.change != 0)
+        self.env.heading[changed, 0] = 0
+        self.env.ego_action[changed, 1] = 0
+        self.active &= ~done
+        return done
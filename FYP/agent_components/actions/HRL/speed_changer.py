@@ -1,3 +1,5 @@
+import numpy as np
+
 
 class SpeedChanger:
     """
@@ -6,12 +8,17 @@ class SpeedChanger:
     This class manages the acceleration or deceleration of a vehicle to reach a desired speed,
     taking into account the environment's policy frequency to determine the granularity of speed adjustments.
 
+    The range of speeds completing the adjustment is precomputed when the sub-policy starts, so that its completion
+    is evaluated from the cached speed of the vehicle.
+
     Attributes:
         env (Env): The wrapped environment in which the vehicle operates in.
+        base_env (AbstractEnv): The unwrapped environment, whose controlled vehicle is read at each step.
         change (int): Specifies the direction and magnitude of the speed change.
         desired_speed (float): The target speed the vehicle aims to reach.
         step_count (int): Number of steps taken since the beginning of the speed adjustment.
         speed_offset (float): A small margin around the desired speed to account for the granularity of speed adjustments.
+        min_speed (float): The lowest speed completing the adjustment, `desired_speed - speed_offset`.
     """
 
     def __init__(self, env, change):
@@ -23,39 +30,55 @@ class SpeedChanger:
             change (int): Specifies the magnitude of the speed change.
         """
         self.env = env
+        self.base_env = env.unwrapped
         self.change = change
         self.desired_speed = self.get_current_speed() + change
-        self.speed_offset = (1/(self.env.unwrapped.config['policy_frequency']))
+        self.speed_offset = (1/(self.base_env.config['policy_frequency']))
+        self.min_speed = self.desired_speed - self.speed_offset
         self.step_count = 0
 
     def get_current_speed(self):
         """Returns the current speed of the vehicle."""
-        return self.env.unwrapped.vehicle.speed
+        return self.base_env.vehicle.speed
 
-    def step(self):
+    def step(self, step_fn=None):
         """
         Executes a step in the environment towards adjusting the vehicle's speed.
 
+        Args:
+            step_fn (callable, optional): The function performing the low-level action. Defaults to the step of the
+                    environment.
+
         Returns:
-            The result of the environment step (observation, reward, done, info).
+            The result of the step function, by default the result of the environment step (observation, reward,
+            terminated, truncated, info).
         """
         self.step_count += 1
-        return self.env.step(self.choose_action())
+        return (step_fn or self.env.step)(self.choose_action())
 
     def done(self):
         """
-        Checks if the target speed has been reached within a specified margin.
+        Checks if the target speed has been reached within a specified margin, and resets the acceleration once it is.
 
         Returns:
             bool: True if the speed adjustment is completed, False otherwise.
         """
-        done = (self.desired_speed - self.speed_offset <= self.get_current_speed() <= self.desired_speed)
+        done = self.completed()
 
         if done:
             # Reset acceleration to 0 once the target speed is reached
-            self.env.unwrapped.vehicle.action['acceleration'] = 0
+            self.base_env.vehicle.action['acceleration'] = 0
         return done
 
+    def completed(self):
+        """
+        Checks if the target speed has been reached within a specified margin, without modifying the vehicle.
+
+        Returns:
+            bool: True if the speed adjustment is completed, False otherwise.
+        """
+        return self.min_speed <= self.get_current_speed() <= self.desired_speed
+
     def choose_action(self):
         """
         Determines the low-level action required to adjust the speed towards the desired target.
@@ -63,10 +86,9 @@ class SpeedChanger:
         Returns:
             list: The action [acceleration, steering] to be taken.
         """
-        current_speed = self.get_current_speed()
-
-        steering = self.env.unwrapped.vehicle.action['steering']
-        acceleration = self.env.unwrapped.vehicle.action['acceleration']
+        vehicle = self.base_env.vehicle
+        current_speed = vehicle.speed
+        steering = vehicle.action['steering']
 
         # Decide on acceleration based on the current vs. desired speed
         if current_speed < self.desired_speed:
@@ -77,3 +99,82 @@ class SpeedChanger:
             acceleration = 0  # Maintain current speed
 
         return [acceleration, steering]
+
+
+class BatchedSpeedChanger:
+    """
+    The SpeedChanger sub-policies of the ego-vehicles of all the scenes of a `BatchedHighwayEnv`, executed together.
+
+    Each scene executes its own sub-policy, started with `start`. The low-level actions and completions of all scenes
+    are computed in single vectorized passes over the state arrays of the batched environment.
+
+    Attributes:
+        env (BatchedHighwayEnv): The batched environment.
+        active (np.ndarray): Whether each scene is executing a sub-policy.
+        change (np.ndarray): The speed change of each scene.
+        desired_speed (np.ndarray): The target speed of each scene.
+        min_speed (np.ndarray): The lowest speed completing the adjustment in each scene.
+        speed_offset (float): A small margin around the desired speeds to account for the granularity of speed
+                adjustments.
+    """
+
+    def __init__(self, env):
+        """
+        Initializes the sub-policies, all inactive.
+
+        Args:
+            env (BatchedHighwayEnv): The batched environment.
+        """
+        self.env = env
+        self.active = np.zeros(env.num_envs, dtype=bool)
+        self.change = np.zeros(env.num_envs)
+        self.desired_speed = np.zeros(env.num_envs)
+        self.min_speed = np.zeros(env.num_envs)
+        self.speed_offset = (1/(env.config['policy_frequency']))
+
+    def start(self, scenes, change):
+        """
+        Starts sub-policies in some scenes, precomputing their target speeds.
+
+        Args:
+            scenes (np.ndarray): A mask of the scenes.
+            change (np.ndarray or int): The speed changes of these scenes.
+        """
+        self.active[scenes] = True
+        self.change[scenes] = change
+        self.desired_speed[scenes] = self.env.speed[scenes, 0] + self.change[scenes]
+        self.min_speed[scenes] = self.desired_speed[scenes] - self.speed_offset
+
+    def choose_action(self):
+        """
+        Determines the low-level actions of all scenes, see `SpeedChanger.choose_action`.
+
+        Returns:
+            np.ndarray: The actions [acceleration, steering] of the scenes, meaningful for active scenes only.
+        """
+        speed = self.env.speed[:, 0]
+        acceleration = np.where(speed < self.desired_speed, 0.1, np.where(speed > self.desired_speed, -0.1, 0))
+        return np.stack([acceleration, self.env.ego_action[:, 1]], axis=1)
+
+    def completed(self):
+        """
+        Checks which sub-policies have been completed, without modifying the vehicles, see `SpeedChanger.completed`.
+
+        Returns:
+            np.ndarray: A mask of the active scenes whose sub-policy is completed.
+        """
+        speed = self.env.speed[:, 0]
+        return self.active & (self.min_speed <= speed) & (speed <= self.desired_speed)
+
+    def done(self):
+        """
+        Checks which sub-policies have been completed, resets the acceleration of their ego-vehicles, and deactivates
+        them.
+
+        Returns:
+            np.ndarray: A mask of the scenes whose sub-policy is completed.
+        """
+        done = self.completed()
+        self.env.ego_action[done, 0] = 0
+        self.active &= ~done
+        return done
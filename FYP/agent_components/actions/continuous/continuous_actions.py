@@ -67,11 +67,13 @@ class ContinuousActions(gym.ActionWrapper):
 
         # Additional information for evaluation purposes
         info["step_count"] = self.step_count    # should be the same as episode len
+        info["timesteps"] = self.timesteps
+        info["episode_count"] = self.episode_count
         info["pos_x"] = obs[0][1]
         info["pos_y"] = obs[0][2]
         info["average_speed"] = self.total_speed / max(1, self.step_count)
         info["right_lane_count"] = self.right_lane_count
-        info["on_road"] = self.env.unwrapped.vehicle.on_road
+        info["on_road"] = self.env.unwrapped.perception.on_road(self.env.unwrapped.vehicle)
         info["truncated"] = truncated
 
         return obs, reward, terminated, truncated, info
@@ -115,4 +115,10 @@ class LowLevelSplitEnv(gym.ActionWrapper):
         if self.done():
             terminated = True
 
+        # Counters for the training logs, when the environment runs in a worker process
+        info["step_count"] = self.step_count
+        info["timesteps"] = self.timesteps
+        info["episode_count"] = self.episode_count
+        info["done_count_all_episodes"] = self.done_count_all_episodes
+
         return obs, reward, terminated, truncated, info
@@ -0,0 +1,223 @@
+from multiprocessing.connection import wait
+
+import numpy as np
+from stable_baselines3.common.type_aliases import TrainFrequencyUnit
+from stable_baselines3.common.utils import configure_logger
+
+from FYP.agent_components.shared_memory_vec_env import SharedMemoryVecEnv
+
+
+class AsyncEnvPool(SharedMemoryVecEnv):
+    """
+    A pool of environments running in worker processes, which can be stepped asynchronously.
+
+    High-level actions (see `CustomActions`) last a variable number of low-level steps, so in a synchronous vectorized
+    environment every step waits for the slowest environment. Instead, actions are sent to some environments with
+    `send`, and `recv` returns as soon as enough of them have finished their step, whichever they are. Environments
+    which have returned can be sent new actions right away, while the others are still running.
+
+    The pool is also a regular vectorized environment: `step` sends actions to all environments and waits for all of
+    them, in order.
+
+    Attributes:
+        pending (set): Indices of the environments which have been sent an action, and have not returned yet.
+    """
+
+    def __init__(self, env_fns, start_method=None):
+        """
+        Starts the worker processes and allocates the shared memory buffer.
+
+        Args:
+            env_fns (list): Functions building the environments, one per worker process.
+            start_method (str, optional): The method used to start the processes, see `SharedMemoryVecEnv`.
+        """
+        self.pending = set()
+        super().__init__(env_fns, start_method=start_method)
+
+    def send(self, actions, env_ids):
+        """
+        Sends actions to some environments, which start stepping in their worker processes.
+
+        Args:
+            actions (np.ndarray): The actions, one per environment.
+            env_ids (np.ndarray): The indices of the environments, which must not be pending.
+        """
+        env_ids = [int(env_id) for env_id in env_ids]
+        busy = self.pending.intersection(env_ids)
+        if busy:
+            raise ValueError(f"Environments {sorted(busy)} have not returned their previous step yet")
+        for env_id, action in zip(env_ids, actions):
+            self.remotes[env_id].send(("step", action))
+        self.pending.update(env_ids)
+
+    def recv(self, min_batch=1, timeout=None):
+        """
+        Waits until at least `min_batch` pending environments have finished their step, and returns their results.
+
+        Environments which are done are reset automatically, as in `SharedMemoryVecEnv`: the returned observation is
+        the first of the next episode, and the final one is in the info under `terminal_observation`.
+
+        Args:
+            min_batch (int, optional): The minimum number of environments to return. Defaults to 1.
+            timeout (float, optional): The maximum time to wait for each environment to return [s], after which the
+                    environments which have returned so far are returned. Defaults to None, waiting indefinitely.
+
+        Returns:
+            tuple: The observations, rewards, dones and infos of the returned environments, and their indices.
+        """
+        if not 0 < min_batch <= len(self.pending):
+            raise ValueError(f"Cannot wait for {min_batch} environments, {len(self.pending)} are pending")
+        env_ids = []
+        remotes = {self.remotes[env_id]: env_id for env_id in self.pending}
+        while len(env_ids) < min_batch:
+            ready = wait(list(remotes), timeout)
+            if not ready:
+                break
+            env_ids.extend(remotes.pop(remote) for remote in ready)
+        infos = []
+        for env_id in env_ids:
+            info, self.reset_infos[env_id] = self.remotes[env_id].recv()
+            infos.append(info)
+        self.pending.difference_update(env_ids)
+        env_ids = np.array(env_ids, dtype=int)
+        return self.observations[env_ids], self.rewards[env_ids], self.dones[env_ids], infos, env_ids
+
+    def reset(self):
+        """
+        Resets all the environments, which must not be pending: their step replies would be read as reset replies.
+
+        Returns:
+            np.ndarray: The observations of the environments.
+        """
+        if self.pending:
+            raise ValueError(f"Environments {sorted(self.pending)} have not returned their previous step yet")
+        return super().reset()
+
+    def step_async(self, actions):
+        self.send(actions, range(self.num_envs))
+        self.waiting = True
+
+    def step_wait(self):
+        obs, rewards, dones, infos, env_ids = self.recv(min_batch=self.num_envs)
+        self.waiting = False
+        order = np.argsort(env_ids)
+        return obs[order], rewards[order], dones[order], [infos[i] for i in order]
+
+    def close(self):
+        """
+        Waits for the pending environments, then closes the worker processes and releases the shared memory buffer.
+        """
+        if not self.closed and self.pending:
+            self.recv(min_batch=len(self.pending))
+            self.waiting = False
+        super().close()
+
+
+class OffPolicyPoolCollector:
+    """
+    Collects transitions from an `AsyncEnvPool` into the replay buffer of a stable-baselines3 off-policy model
+    (e.g. DQN for high-level actions).
+
+    SB3's own rollout collection steps all environments in lockstep, which would stall on the longest high-level
+    action. Off-policy algorithms only need independent transitions though, so here each environment is sent its next
+    action as soon as it returns, and each transition is stored as it comes. `learn` interleaves the collection with
+    the gradient steps of the model, following its `train_freq`, `gradient_steps` and `learning_starts` settings.
+
+    Attributes:
+        pool (AsyncEnvPool): The environments.
+        model: The off-policy model, whose policy selects the actions.
+        replay_buffer: The replay buffer storing the transitions, with a single environment (`n_envs=1`).
+        min_batch (int): The minimum number of environments to wait for, before selecting their next actions together.
+        timeout (float): The maximum time to wait for each environment to return [s], or None to wait indefinitely.
+    """
+
+    def __init__(self, pool, model, replay_buffer=None, min_batch=1, timeout=None):
+        """
+        Initializes the collector and resets the environments.
+
+        Args:
+            pool (AsyncEnvPool): The environments.
+            model: The off-policy model.
+            replay_buffer (optional): The replay buffer, defaults to that of the model, which must then have been
+                    created with a single environment.
+            min_batch (int, optional): The minimum number of environments to wait for. Defaults to 1.
+            timeout (float, optional): The maximum time to wait for each environment to return [s]. Defaults to None,
+                    waiting indefinitely.
+        """
+        self.pool = pool
+        self.model = model
+        self.replay_buffer = replay_buffer if replay_buffer is not None else model.replay_buffer
+        if self.replay_buffer.n_envs != 1:
+            raise ValueError("The replay buffer must be created for a single environment (n_envs=1)")
+        self.min_batch = min_batch
+        self.timeout = timeout
+        self.last_obs = pool.reset()
+        self.last_actions = None
+
+    def collect(self, n_transitions, deterministic=False):
+        """
+        Steps the environments asynchronously until `n_transitions` transitions have been stored.
+
+        Args:
+            n_transitions (int): The number of transitions to collect.
+            deterministic (bool, optional): Whether to select actions deterministically. Defaults to False.
+
+        Returns:
+            list: The infos of the collected transitions.
+        """
+        if self.last_actions is None:
+            self.last_actions, _ = self.model.predict(self.last_obs, deterministic=deterministic)
+            self.pool.send(self.last_actions, range(self.pool.num_envs))
+
+        collected = []
+        while len(collected) < n_transitions:
+            obs, rewards, dones, infos, env_ids = self.pool.recv(min(self.min_batch, len(self.pool.pending)),
+                                                                 timeout=self.timeout)
+            if not len(env_ids):
+                continue  # No environment has returned before the timeout
+            for k, env_id in enumerate(env_ids):
+                next_obs = infos[k]["terminal_observation"] if dones[k] else obs[k]
+                self.replay_buffer.add(self.last_obs[env_id:env_id + 1], np.expand_dims(next_obs, 0),
+                                       self.last_actions[env_id:env_id + 1], rewards[k:k + 1], dones[k:k + 1],
+                                       infos[k:k + 1])
+            self.model.num_timesteps += len(env_ids)
+            collected.extend(infos)
+
+            self.last_obs[env_ids] = obs
+            actions, _ = self.model.predict(obs, deterministic=deterministic)
+            self.last_actions[env_ids] = actions
+            self.pool.send(actions, env_ids)
+        return collected
+
+    def learn(self, total_timesteps, deterministic=False):
+        """
+        Trains the model on transitions collected asynchronously, as `OffPolicyAlgorithm.learn` does synchronously.
+
+        Every `train_freq` transitions, once more than `learning_starts` transitions have been collected, the model
+        takes `gradient_steps` gradient steps (as many as transitions collected if negative). The model's per-step
+        updates (e.g. the exploration rate and target network of DQN) are applied for each transition.
+
+        Args:
+            total_timesteps (int): The number of transitions to collect.
+            deterministic (bool, optional): Whether to select actions deterministically. Defaults to False.
+
+        Returns:
+            The trained model.
+        """
+        model = self.model
+        if model.train_freq.unit != TrainFrequencyUnit.STEP:
+            raise ValueError("Only a train frequency in steps is supported by asynchronous collection")
+        if not hasattr(model, "_logger"):
+            model.set_logger(configure_logger(model.verbose, model.tensorboard_log))
+        model._total_timesteps = model.num_timesteps + total_timesteps
+        while model.num_timesteps < model._total_timesteps:
+            infos = self.collect(min(model.train_freq.frequency, model._total_timesteps - model.num_timesteps),
+                                 deterministic=deterministic)
+            model._update_current_progress_remaining(model.num_timesteps, model._total_timesteps)
+            for _ in infos:
+                model._on_step()
+            if model.num_timesteps > model.learning_starts:
+                gradient_steps = model.gradient_steps if model.gradient_steps >= 0 else len(infos)
+                if gradient_steps > 0:
+                    model.train(gradient_steps=gradient_steps, batch_size=model.batch_size)
+        return model
@@ -1,3 +1,5 @@
+from functools import partial
+
 import gymnasium as gym
 
 from FYP.agent_components.custom_reward import CustomReward
@@ -69,7 +71,8 @@ class ConfigEnv:
 
         Args:
             action_type (str, optional): Specifies the type of actions to be used in the environment. `continuous` for
-                    default continuous actions, `high-level` for custom high-level actions. Defaults to `continuous`.
+                    default continuous actions, `high-level` for custom high-level actions, executed as macro-steps
+                    (see `CustomActions`). Defaults to `continuous`.
             render_mode (str, optional): Render mode (`human`, `rgb_array`, or None) for visual output.
                     Defaults to None, in which case the environment will not render visuals unless explicitly
                     requested later.
@@ -96,7 +99,65 @@ class ConfigEnv:
         # End  of additional functionality
 
         elif action_type == "high-level":
-            env = CustomActions(env)
+            env = CustomActions(env, macro_step=True)
         else:
             env = ContinuousActions(env)
         return env
+
+    def create_vec(self, n_envs, action_type="continuous", custom_rewards="no", seed=None, start_method=None,
+                   asynchronous=False):
+        """
+        Instantiates several highway environments, configured and wrapped as in `create`, each in its own worker
+        process, and vectorizes them for parallel rollouts. Observations are returned through shared memory.
+
+        Args:
+            n_envs (int): The number of environments (and worker processes).
+            action_type (str, optional): Specifies the type of actions to be used in the environments, see `create`.
+                    Defaults to `continuous`.
+            custom_rewards (str, optional): Specifies the type of rewards to be used in the environments, see
+                    `create`. Defaults to `no`.
+            seed (int, optional): The seed of the first environment, the others being seeded with the following
+                    integers. Defaults to None.
+            start_method (str, optional): The method used to start the worker processes, see `SharedMemoryVecEnv`.
+            asynchronous (bool, optional): Whether to return an `AsyncEnvPool`, whose environments can also be stepped
+                    independently of each other. Defaults to False.
+
+        Returns:
+            SharedMemoryVecEnv: The vectorized environments, ready for training.
+        """
+        # Imported here, so that single environments can be created without stable-baselines3
+        from FYP.agent_components.async_env_pool import AsyncEnvPool
+        from FYP.agent_components.shared_memory_vec_env import SharedMemoryVecEnv
+
+        env_fns = [partial(self.create, action_type=action_type, custom_rewards=custom_rewards)
+                   for _ in range(n_envs)]
+        env = (AsyncEnvPool if asynchronous else SharedMemoryVecEnv)(env_fns, start_method=start_method)
+        if seed is not None:
+            env.seed(seed)
+        return env
+
+    def create_batched(self, n_envs, seed=None):
+        """
+        Instantiates a batch of highway scenes simulated together in a single process, with vectorized dynamics, and
+        wraps them with high-level actions executed by batched sub-policies.
+
+        The batched simulator supports a subset of the configuration, see `BatchedHighwayEnv`: the observations only
+        contain its supported kinematic features, and the rewards are the original ones.
+
+        Args:
+            n_envs (int): The number of scenes.
+            seed (int, optional): The seed of the scenes. Defaults to None.
+
+        Returns:
+            BatchedCustomActions: The scenes with high-level actions, stepped like an `AsyncEnvPool`.
+        """
+        # Imported here, as the batched simulator is only needed for batched high-level actions
+        from highway_env.envs.batched_highway_env import BatchedHighwayEnv
+        from FYP.agent_components.actions.HRL.batched_custom_actions import BatchedCustomActions
+
+        config = dict(self.config)
+        features = [feature for feature in config["observation"]["features"] if feature in BatchedHighwayEnv.FEATURES]
+        config["observation"] = dict(config["observation"], features=features)
+        env = BatchedCustomActions(BatchedHighwayEnv(n_envs, config=config))
+        env.reset(seed=seed)
+        return env
@@ -55,16 +55,23 @@ class CustomReward(gymnasium.RewardWrapper):
         """
         obs, reward, done, truncated, info = super().step(action)
         reward = self.reward(reward)  # Modify the reward based on custom logic
+        self.update_info(info)
 
-        # Update the 'info' dictionary with detailed reward components
+        return obs, reward, done, truncated, info
+
+    def update_info(self, info):
+        """
+        Updates the 'info' dictionary with the detailed reward components of the last step.
+
+        Parameters:
+        info (dict): The info dictionary of the step.
+        """
         info['rewards'] = {
             'right_lane_reward': self.lane_reward,
             'high_speed_reward': self.speed_reward
         }
 
-        info['on_road'] = self.env.unwrapped.vehicle.on_road
-
-        return obs, reward, done, truncated, info
+        info['on_road'] = self.env.unwrapped.perception.on_road(self.env.unwrapped.vehicle)
 
     def calculate_reward_components(self, vehicle, road, config):
         """
@@ -82,9 +89,10 @@ class CustomReward(gymnasium.RewardWrapper):
         vehicle: The vehicle for which the reward is being calculated.
         road: The road on which the vehicle is located.
         """
+        perception = self.env.unwrapped.perception
         lane_position = vehicle.lane_index[2]
-        neighbours = road.network.all_side_lanes(vehicle.lane_index)
-        if self.lane_position_tolerance > vehicle.lane_offset[1] > - self.lane_position_tolerance:
+        neighbours = perception.side_lanes(vehicle.lane_index)
+        if self.lane_position_tolerance > perception.lane_offset(vehicle)[1] > - self.lane_position_tolerance:
             self.lane_reward = lane_position / max(len(neighbours) - 1, 1)
         else:
             self.lane_reward = 0
@@ -119,6 +127,6 @@ class CustomReward(gymnasium.RewardWrapper):
             reward = utils.lmap(reward,
                                 [0, config["high_speed_reward"] + config["right_lane_reward"]],
                                 [0, 1])
-        reward *= float(vehicle.on_road)
+        reward *= float(self.env.unwrapped.perception.on_road(vehicle))
         reward *= float(not vehicle.crashed)
         return reward
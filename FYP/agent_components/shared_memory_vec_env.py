@@ -0,0 +1,196 @@
+import multiprocessing as mp
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import SubprocVecEnv, VecEnv
+from stable_baselines3.common.vec_env.base_vec_env import CloudpickleWrapper
+
+
+def _shared_arrays(buffer, n_envs, observation_space):
+    """
+    Lays out the observations, rewards and dones of all environments in a shared memory buffer.
+
+    Args:
+        buffer (memoryview): The shared memory buffer, or None to only compute its size.
+        n_envs (int): The number of environments.
+        observation_space (spaces.Box): The observation space of a single environment.
+
+    Returns:
+        tuple: The size of the buffer in bytes, and the observations, rewards and dones arrays (None if no buffer).
+    """
+    layout = [((n_envs,) + observation_space.shape, observation_space.dtype),
+              ((n_envs,), np.float64),
+              ((n_envs,), np.bool_)]
+    arrays, offset = [], 0
+    for shape, dtype in layout:
+        dtype = np.dtype(dtype)
+        offset = -(-offset // dtype.alignment) * dtype.alignment
+        if buffer is not None:
+            arrays.append(np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset))
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return (offset, *(arrays or [None] * len(layout)))
+
+
+def _worker(remote, parent_remote, env_fn_wrapper, rank):
+    """
+    Runs an environment in a worker process, writing its observations, rewards and dones into shared memory.
+
+    Only the info dicts (and the terminal observations within them) are sent back through the pipe.
+
+    Args:
+        remote (Connection): The worker end of the pipe.
+        parent_remote (Connection): The main process end of the pipe, closed in the worker.
+        env_fn_wrapper (CloudpickleWrapper): The function building the environment.
+        rank (int): The index of the environment in the shared arrays.
+    """
+    from stable_baselines3.common.env_util import is_wrapped
+
+    parent_remote.close()
+    env = env_fn_wrapper.var()
+    buffer, observations, rewards, dones = None, None, None, None
+    reset_info = {}
+    while True:
+        try:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                observation, reward, terminated, truncated, info = env.step(data)
+                done = terminated or truncated
+                info["TimeLimit.truncated"] = truncated and not terminated
+                if done:
+                    # Save the final observation, as the environment is reset automatically
+                    info["terminal_observation"] = observation
+                    observation, reset_info = env.reset()
+                observations[rank], rewards[rank], dones[rank] = observation, reward, done
+                remote.send((info, reset_info))
+            elif cmd == "reset":
+                maybe_options = {"options": data[1]} if data[1] else {}
+                observation, reset_info = env.reset(seed=data[0], **maybe_options)
+                observations[rank] = observation
+                remote.send(reset_info)
+            elif cmd == "attach":
+                buffer = SharedMemory(name=data[0])
+                _, observations, rewards, dones = _shared_arrays(buffer.buf, data[1], env.observation_space)
+                remote.send(None)
+            elif cmd == "render":
+                remote.send(env.render())
+            elif cmd == "close":
+                env.close()
+                del observations, rewards, dones
+                if buffer is not None:
+                    buffer.close()
+                remote.close()
+                break
+            elif cmd == "get_spaces":
+                remote.send((env.observation_space, env.action_space))
+            elif cmd == "env_method":
+                method = getattr(env, data[0])
+                remote.send(method(*data[1], **data[2]))
+            elif cmd == "get_attr":
+                remote.send(getattr(env, data))
+            elif cmd == "set_attr":
+                remote.send(setattr(env, data[0], data[1]))
+            elif cmd == "is_wrapped":
+                remote.send(is_wrapped(env, data))
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+        except EOFError:
+            break
+
+
+class SharedMemoryVecEnv(SubprocVecEnv):
+    """
+    A vectorized environment running each environment in its own process, like `SubprocVecEnv`, but returning the
+    observations, rewards and dones through a shared memory buffer instead of pickling them through pipes.
+
+    Each worker writes into its own rows of the buffer, so the main process only has to wait for the (small) info
+    dicts to know that a step is complete. Only Box observation spaces are supported.
+
+    Attributes:
+        observations (np.ndarray): The shared observations of all environments.
+        rewards (np.ndarray): The shared rewards of the last step of all environments.
+        dones (np.ndarray): The shared dones of the last step of all environments.
+
+    See:
+        stable_baselines3.common.vec_env.SubprocVecEnv, from which the worker protocol is taken.
+    """
+
+    def __init__(self, env_fns, start_method=None):
+        """
+        Starts the worker processes and allocates the shared memory buffer.
+
+        Args:
+            env_fns (list): Functions building the environments, one per worker process.
+            start_method (str, optional): The method used to start the processes (`fork`, `spawn` or `forkserver`).
+                Defaults to `forkserver` where available, `spawn` otherwise.
+        """
+        self.waiting = False
+        self.closed = False
+        n_envs = len(env_fns)
+
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+        # The workers share the resource tracker of the main process, which is started beforehand for forked workers
+        # to inherit it: otherwise each one would start its own, and track the buffer as leaked at shutdown
+        resource_tracker.ensure_running()
+
+        self.remotes, self.work_remotes = zip(*[ctx.Pipe() for _ in range(n_envs)])
+        self.processes = []
+        for rank, (work_remote, remote, env_fn) in enumerate(zip(self.work_remotes, self.remotes, env_fns)):
+            args = (work_remote, remote, CloudpickleWrapper(env_fn), rank)
+            process = ctx.Process(target=_worker, args=args, daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+        self.remotes[0].send(("get_spaces", None))
+        observation_space, action_space = self.remotes[0].recv()
+        if not isinstance(observation_space, spaces.Box):
+            self.close()
+            raise ValueError(f"SharedMemoryVecEnv only supports Box observation spaces, not {observation_space}")
+
+        size, _, _, _ = _shared_arrays(None, n_envs, observation_space)
+        self.buffer = SharedMemory(create=True, size=size)
+        _, self.observations, self.rewards, self.dones = _shared_arrays(self.buffer.buf, n_envs, observation_space)
+        for remote in self.remotes:
+            remote.send(("attach", (self.buffer.name, n_envs)))
+        for remote in self.remotes:
+            remote.recv()
+
+        VecEnv.__init__(self, n_envs, observation_space, action_space)
+
+    def step_async(self, actions):
+        for remote, action in zip(self.remotes, actions):
+            remote.send(("step", action))
+        self.waiting = True
+
+    def step_wait(self):
+        results = [remote.recv() for remote in self.remotes]
+        self.waiting = False
+        infos, reset_infos = zip(*results)
+        self.reset_infos = list(reset_infos)
+        return self.observations.copy(), self.rewards.copy(), self.dones.copy(), list(infos)
+
+    def reset(self):
+        for env_idx, remote in enumerate(self.remotes):
+            remote.send(("reset", (self._seeds[env_idx], self._options[env_idx])))
+        self.reset_infos = [remote.recv() for remote in self.remotes]
+        # Seeds and options are only used once
+        self._reset_seeds()
+        self._reset_options()
+        return self.observations.copy()
+
+    def close(self):
+        """
+        Closes the worker processes and releases the shared memory buffer.
+        """
+        if self.closed:
+            return
+        super().close()
+        if getattr(self, "buffer", None) is not None:
+            del self.observations, self.rewards, self.dones
+            self.buffer.close()
+            self.buffer.unlink()
+            self.buffer = None
@@ -1,4 +1,20 @@
 from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import VecEnv
+
+# Counters logged for each action type. Counters of the current episode are averaged over parallel environments,
+# while counters accumulated over all episodes are summed.
+EPISODE_COUNTERS = {
+    "high-level": ["HL_step_count", "LL_step_count"],
+    "continuous": ["step_count"],
+    "low-level-slow-down-1": ["step_count"],
+    "low-level-speed-up-1": ["step_count"],
+}
+TOTAL_COUNTERS = {
+    "high-level": ["episode_count", "timesteps_HL", "timesteps_LL"],
+    "continuous": ["episode_count", "timesteps"],
+    "low-level-slow-down-1": ["episode_count", "timesteps", "done_count_all_episodes"],
+    "low-level-speed-up-1": ["episode_count", "timesteps", "done_count_all_episodes"],
+}
 
 
 class CustomCallback(BaseCallback):
@@ -6,7 +22,8 @@ class CustomCallback(BaseCallback):
     Custom callback for logging additional information during training.
 
     Attributes:
-        env_wrapper: The wrapped environment to access additional data.
+        env_wrapper: The wrapped environment to access additional data, or a vectorized environment whose workers
+            report their counters in the step infos.
         action_type: The action type.
     """
 
@@ -15,6 +32,21 @@ class CustomCallback(BaseCallback):
         self.env_wrapper = env_wrapper
         self.action_type = action_type
 
+    def counters(self):
+        """
+        Collects the counters of each environment.
+
+        The counters of a single environment are read from the wrapper, while those of vectorized environments are
+        read from the infos of the last step, since the wrappers live in the worker processes.
+
+        Returns:
+            list: A dictionary of counters per environment.
+        """
+        names = EPISODE_COUNTERS.get(self.action_type, []) + TOTAL_COUNTERS.get(self.action_type, [])
+        if isinstance(self.env_wrapper, VecEnv):
+            return [{name: info[name] for name in names if name in info} for info in self.locals.get("infos", [])]
+        return [{name: getattr(self.env_wrapper, name) for name in names}]
+
     def _on_step(self) -> bool:
         """
         Logs the info to TensorBoard.
@@ -23,21 +55,13 @@ class CustomCallback(BaseCallback):
             bool: True to continue training, False otherwise.
         """
         if self.env_wrapper is not None:
-            if self.action_type == "high-level":
-                self.logger.record("custom/HL_step_count", self.env_wrapper.HL_step_count)
-                self.logger.record("custom/LL_step_count", self.env_wrapper.LL_step_count)
-                self.logger.record("custom/episode_count", self.env_wrapper.episode_count)
-                self.logger.record("custom/timesteps_HL", self.env_wrapper.timesteps_HL)
-                self.logger.record("custom/timesteps_LL", self.env_wrapper.timesteps_LL)
-            if self.action_type == "continuous":
-                self.logger.record("custom/step_count", self.env_wrapper.step_count)
-                self.logger.record("custom/episode_count", self.env_wrapper.episode_count)
-                self.logger.record("custom/timesteps", self.env_wrapper.timesteps)
-
-            # Additional functionality
-            if self.action_type == "low-level-slow-down-1" or self.action_type == "low-level-speed-up-1":
-                self.logger.record("custom/step_count", self.env_wrapper.step_count)
-                self.logger.record("custom/episode_count", self.env_wrapper.episode_count)
-                self.logger.record("custom/timesteps", self.env_wrapper.timesteps)
-                self.logger.record("custom/done_count_all_episodes", self.env_wrapper.done_count_all_episodes)
+            counters = self.counters()
+            for name in EPISODE_COUNTERS.get(self.action_type, []):
+                values = [env_counters[name] for env_counters in counters if name in env_counters]
+                if values:
+                    self.logger.record(f"custom/{name}", sum(values) / len(values))
+            for name in TOTAL_COUNTERS.get(self.action_type, []):
+                values = [env_counters[name] for env_counters in counters if name in env_counters]
+                if values:
+                    self.logger.record(f"custom/{name}", sum(values))
         return True
@@ -1,9 +1,11 @@
 import logging
+import os
 
-from gymnasium.wrappers import RecordVideo
 from stable_baselines3.common.monitor import Monitor
 
 from FYP.agent_components.config_env import ConfigEnv
+from highway_env.envs.common.scenario_store import ScenarioStore
+from highway_env.envs.common.video import AsyncRecordVideo
 from stable_baselines3 import PPO
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -13,7 +15,8 @@ class LoadModel:
     """Class for loading trained model to interact with the environment."""
 
     def __init__(self, model_path, action_type, custom_rewards, render_mode=None, algorithm_type=None,
-                 eval_log_path=None, num_episodes=1, video_log_path=None):
+                 eval_log_path=None, num_episodes=1, video_log_path=None, scenario_store=None,
+                 trace_path=None):
         """
         Initialize instance.
 
@@ -30,7 +33,14 @@ class LoadModel:
                               save the episode reward, length, time, and other data for a specified number of episodes
                               in a CSV file.
         - num_episodes (int): Number of episodes to render or perform evaluation. Default is 1.
-        - video_log_path (str): Path to store recorded video (optional if want to record, with one episode only).
+        - video_log_path (str): Path to store recorded videos (optional if want to record, one video per episode).
+                              The videos are encoded in a background thread while the episodes run.
+        - scenario_store (str): Directory of a scenario store (optional). If specified, episode k starts from the
+                              stored scenario k, so that different models are evaluated on identical episodes. The
+                              store is recorded with seeds 0 to num_episodes - 1 if it does not exist yet.
+        - trace_path (str): Directory of an episode trace (optional). If specified, the kinematics of every frame are
+                              recorded, so that the episodes can be evaluated headless (render_mode None) and rendered
+                              afterwards with scripts/replay_trace.py.
         """
         self.model_path = model_path
         self.algorithm_type = algorithm_type
@@ -41,6 +51,8 @@ class LoadModel:
         self.eval_log_path = eval_log_path
         self.num_episodes = num_episodes
         self.video_log_path = video_log_path
+        self.scenario_store = scenario_store
+        self.trace_path = trace_path
 
     def load_model(self):
         """Load the RL model based on the specified algorithm type."""
@@ -64,8 +76,7 @@ class LoadModel:
             if self.video_log_path is not None:
                 env = ConfigEnv().create(action_type=self.action_type, custom_rewards=self.custom_rewards,
                                          render_mode="rgb_array")
-                env = RecordVideo(env, self.video_log_path)
-                self.num_episodes = 1
+                env = AsyncRecordVideo(env, self.video_log_path, episode_trigger=lambda episode: True)
             else:
                 env = ConfigEnv().create(action_type=self.action_type, custom_rewards=self.custom_rewards,
                                          render_mode=self.render_mode)
@@ -73,6 +84,17 @@ class LoadModel:
             logging.error(f"Environment setup failed: {e}")
             return
 
+        scenarios = None
+        if self.scenario_store is not None:
+            env.unwrapped.configure({"scenario_store": self.scenario_store})
+            if os.path.exists(os.path.join(self.scenario_store, ScenarioStore.METADATA_FILE)):
+                scenarios = ScenarioStore(self.scenario_store)
+            else:
+                scenarios = ScenarioStore.record(env.unwrapped, self.scenario_store, seeds=range(self.num_episodes))
+
+        if self.trace_path is not None:
+            env.unwrapped.configure({"trace": self.trace_path})
+
         if self.eval_log_path is not None:
             info_keywords = self.get_info_keywords()
             env = Monitor(env, self.eval_log_path, info_keywords=info_keywords)
@@ -86,7 +108,8 @@ class LoadModel:
         for episode in range(self.num_episodes):
             print("Episode:", episode + 1)
             done = truncated = False
-            obs, info = env.reset()
+            options = {"scenario_id": episode % len(scenarios)} if scenarios is not None else None
+            obs, info = env.reset(options=options)
 
             while not (done or truncated):
                 if self.algorithm_type is None:
@@ -151,9 +174,18 @@ if __name__ == "__main__":
     # num_episodes = 1000
 
     video_log_path = None
-    # if want to record - 1 episode:
+    # if want to record - one video per episode:
     # video_log_path = "video_recordings/"
 
+    scenario_store = None
+    # if want to evaluate all models on the same stored episodes:
+    # scenario_store = "eval_logs/scenarios/"
+
+    trace_path = None
+    # if want to record the episodes to render them afterwards with scripts/replay_trace.py (e.g. with render_mode=None):
+    # trace_path = "eval_logs/traces/"
+
     LoadModel(model_path=model_path, algorithm_type=algorithm_type, action_type=action_type,
               custom_rewards=custom_rewards, render_mode=render_mode, eval_log_path=eval_log_path,
-              num_episodes=num_episodes, video_log_path=video_log_path).interact_with_environment()
+              num_episodes=num_episodes, video_log_path=video_log_path,
+              scenario_store=scenario_store, trace_path=trace_path).interact_with_environment()
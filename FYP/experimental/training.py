@@ -8,7 +8,8 @@ class Training:
     Class for training.
 
     Attributes:
-        - env: The environment for the agent.
+        - env: The environment for the agent, either a single environment or vectorized environments created with
+            `ConfigEnv.create_vec`.
         - action_type (str): The type of action for the environment (`continuous` or `high-level` for continuous
             or hierarchical agent, respectively).
         - log_path (str): The directory path where log files will be saved.
@@ -18,10 +19,12 @@ class Training:
             respectively).
         - updated_model_path (str): The file path for saving the updated trained model. Default to None, however,
             the path must be specified if `mode='train_more'`
+        - n_envs (int): The number of environments collecting rollouts in parallel. Defaults to the number of
+            environments of `env` if it is vectorized, 1 otherwise.
     """
 
     def __init__(self, env, action_type, log_path, model_path, total_timesteps=int(2e4),
-                 mode="train", updated_model_path="None"):
+                 mode="train", updated_model_path="None", n_envs=None):
         self.env = env
         self.action_type = action_type
         self.log_path = log_path
@@ -29,6 +32,7 @@ class Training:
         self.total_timesteps = total_timesteps
         self.mode = mode
         self.updated_model_path = updated_model_path
+        self.n_envs = n_envs or getattr(env, "num_envs", 1)
 
     def run(self):
         """
@@ -45,7 +49,8 @@ class Training:
         n_cpu = 6
         batch_size = 64
         policy_kwargs = dict(net_arch=[dict(pi=[256, 256], vf=[256, 256])])
-        n_steps = batch_size * 12 // n_cpu
+        # Rollouts of batch_size * 12 steps are split over the parallel environments
+        n_steps = batch_size * 12 // (n_cpu if self.n_envs == 1 else self.n_envs)
 
         if self.mode == "train":
             model = PPO("MlpPolicy", self.env, policy_kwargs=policy_kwargs, n_steps=n_steps,
@@ -72,6 +77,7 @@ if __name__ == "__main__":
     model_path = log_path + "model.zip"
     custom_rewards = "no"
     render_mode = "human"
+    n_envs = 1  # e.g. 6 to collect rollouts in parallel worker processes (without rendering)
 
     # action_type = "continuous"
     # mode = "train"
@@ -81,7 +87,10 @@ if __name__ == "__main__":
     # render_mode = "human"
 
     # Environment setup
-    env = ConfigEnv().create(action_type=action_type, render_mode=render_mode, custom_rewards=custom_rewards)
+    if n_envs > 1:
+        env = ConfigEnv().create_vec(n_envs, action_type=action_type, custom_rewards=custom_rewards)
+    else:
+        env = ConfigEnv().create(action_type=action_type, render_mode=render_mode, custom_rewards=custom_rewards)
 
     # Train or continue training the model
     model = Training(env=env, action_type=action_type, log_path=log_path, model_path=model_path, mode=mode).run()
@@ -61,3 +61,31 @@ def test_speed_change_possible(wrapped_env):
     assert wrapped_env.speed_change_possible(wrapped_env.subpolicies[3]().change)
     # Speed up by 1m/s
     assert not wrapped_env.speed_change_possible(wrapped_env.subpolicies[4]().change)
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+@pytest.mark.parametrize("custom_rewards", ["no", "yes"])
+def test_macro_step(custom_rewards, seed):
+    """Test that macro-steps give the same results as full low-level steps."""
+    from FYP.agent_components.config_env import ConfigEnv
+
+    macro_env = ConfigEnv().create(action_type="high-level", custom_rewards=custom_rewards)
+    full_env = ConfigEnv().create(action_type="high-level", custom_rewards=custom_rewards)
+    full_env.macro_step = False
+    assert macro_env.macro_step
+    for env in [macro_env, full_env]:
+        env.reset(seed=seed)
+    for action in [2, 2, 3, 4, 0, 1]:
+        obs, reward, terminated, truncated, info = macro_env.step(action)
+        full_obs, full_reward, full_terminated, full_truncated, full_info = full_env.step(action)
+        assert (obs == full_obs).all()
+        assert (reward, terminated, truncated) == (full_reward, full_terminated, full_truncated)
+        assert repr(info) == repr(full_info)
+
+
+def test_macro_step_unsupported_wrapper():
+    """Test that full low-level steps are used when an inner wrapper would be bypassed by macro-steps."""
+    env = gym.make("highway-v0", config={"action": {"type": "ContinuousAction"}})
+    assert CustomActions(env, macro_step=True).macro_step
+    assert not CustomActions(gym.wrappers.TimeLimit(env, 10), macro_step=True).macro_step
+    assert not CustomActions(gym.wrappers.RecordEpisodeStatistics(env), macro_step=True).macro_step
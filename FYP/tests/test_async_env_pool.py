@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("stable_baselines3")
+
+from FYP.agent_components.async_env_pool import OffPolicyPoolCollector
+from FYP.agent_components.config_env import ConfigEnv
+
+
+@pytest.fixture
+def pool():
+    """
+    Set up of a pool of three high-level action environments running in worker processes.
+    """
+    env = ConfigEnv().create_vec(3, action_type="high-level", seed=0, asynchronous=True)
+    env.reset()
+    yield env
+    env.close()
+
+
+def test_recv_partial_batch(pool):
+    """Test that environments are returned as they finish, and can be sent new actions right away."""
+    pool.send(np.array([0, 3, 1]), [0, 1, 2])
+    obs, rewards, dones, infos, env_ids = pool.recv(min_batch=1)
+    assert 1 <= len(env_ids) == len(obs) == len(rewards) == len(dones) == len(infos)
+    assert pool.pending == {0, 1, 2} - set(env_ids)
+
+    pool.send(np.zeros(len(env_ids), dtype=int), env_ids)
+    assert pool.pending == {0, 1, 2}
+    _, _, _, _, env_ids = pool.recv(min_batch=3)
+    assert sorted(env_ids) == [0, 1, 2]
+    assert not pool.pending
+
+
+def test_send_to_pending_env(pool):
+    """Test that an environment cannot be sent an action before it has returned."""
+    pool.send([0], [1])
+    with pytest.raises(ValueError):
+        pool.send([0], [1])
+
+
+def test_step(pool):
+    """Test that the pool can be stepped synchronously, with results in the order of the environments."""
+    obs, rewards, dones, infos = pool.step(np.zeros(3, dtype=int))
+    assert obs.shape == (3,) + pool.observation_space.shape
+    assert [info["HL_step_count"] for info in infos] == [1, 1, 1]
+
+
+def test_reset_pending_env(pool):
+    """Test that the pool cannot be reset while an environment is pending, and stays usable."""
+    pool.send([0], [1])
+    with pytest.raises(ValueError):
+        pool.reset()
+    _, _, _, _, env_ids = pool.recv(min_batch=1)
+    assert list(env_ids) == [1]
+    assert pool.reset().shape == (3,) + pool.observation_space.shape
+
+
+def test_off_policy_collector(pool):
+    """Test that an off-policy model is trained on the transitions collected asynchronously."""
+    from stable_baselines3 import DQN
+
+    model = DQN("MlpPolicy", ConfigEnv().create(action_type="high-level"), buffer_size=100, learning_starts=4,
+                train_freq=2, batch_size=4, seed=0)
+    collector = OffPolicyPoolCollector(pool, model, min_batch=2)
+    collector.learn(total_timesteps=10)
+    assert model.num_timesteps >= 10
+    assert model.replay_buffer.size() == model.num_timesteps
+    assert model._n_updates > 0
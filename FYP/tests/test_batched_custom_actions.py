@@ -0,0 +1,91 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+
+import highway_env
+from FYP.agent_components.actions.HRL.batched_custom_actions import BatchedCustomActions
+from FYP.agent_components.actions.HRL.custom_actions import CustomActions
+from FYP.agent_components.config_env import ConfigEnv
+from highway_env.envs.batched_highway_env import BatchedHighwayEnv
+
+highway_env.register_highway_envs()
+
+
+def config(**kwargs):
+    """The configuration of ConfigEnv, with the kinematic features supported by BatchedHighwayEnv."""
+    config = dict(ConfigEnv().config, **kwargs)
+    config["observation"] = dict(config["observation"], features=["presence", "x", "y", "vx", "vy"])
+    return config
+
+
+@pytest.fixture
+def env():
+    """
+    Set up of a batch of four scenes with high-level actions.
+    """
+    return ConfigEnv().create_batched(4, seed=0)
+
+
+def test_same_as_custom_actions():
+    """Test that the batched sub-policies execute the high-level actions as CustomActions, without traffic."""
+    single = CustomActions(gym.make("highway-v0", config=config(vehicles_count=0, initial_lane_id=1)))
+    single.reset(seed=0)
+    batched = BatchedCustomActions(BatchedHighwayEnv(2, config=config(vehicles_count=0, initial_lane_id=1)))
+    batched.reset(seed=0)
+    for action in [2, 4, 1, 3, 0, 1]:
+        _, reward, _, _, info = single.step(action)
+        _, rewards, _, infos = batched.step([action, action])
+        assert [info["LL_step_count"]] * 2 == [batched_info["LL_step_count"] for batched_info in infos]
+        assert np.allclose(rewards, reward)
+        assert np.all(batched.env.lane[:, 0] == single.unwrapped.vehicle.lane_index[2])
+        assert np.allclose(batched.env.speed[:, 0], single.unwrapped.vehicle.speed)
+
+
+def test_recv_partial_batch(env):
+    """Test that scenes are returned as they complete, and can be sent new actions right away."""
+    env.send(np.array([0, 3, 1, 4]), [0, 1, 2, 3])
+    obs, rewards, dones, infos, env_ids = env.recv(min_batch=1)
+    assert 1 <= len(env_ids) == len(obs) == len(rewards) == len(dones) == len(infos)
+    assert env.pending == {0, 1, 2, 3} - set(env_ids)
+    assert all(info["HL_step_count"] == 1 for info in infos)
+
+    env.send(np.zeros(len(env_ids), dtype=int), env_ids)
+    _, _, _, _, env_ids = env.recv(min_batch=4)
+    assert sorted(env_ids) == [0, 1, 2, 3]
+    assert not env.pending
+
+
+def test_send_to_pending_scene(env):
+    """Test that a scene cannot be sent an action before it has returned."""
+    env.send([0], [1])
+    with pytest.raises(ValueError):
+        env.send([0], [1])
+
+
+def test_episode_end(env):
+    """Test that the counters of a scene are reset when its episode ends."""
+    # Put the vehicle just ahead of the first ego-vehicle onto its path
+    env.env.x[0, 1], env.env.y[0, 1] = env.env.x[0, 0] + 6, env.env.y[0, 0]
+    env.env.speed[0, 1] = env.env.target_speed[0, 1] = 0
+    obs, rewards, dones, infos = env.step(np.zeros(4, dtype=int))
+    assert dones[0] and infos[0]["crashed"]
+    assert infos[0]["terminal_observation"].shape == obs[0].shape
+    assert env.HL_step_count[0] == env.LL_step_count[0] == 0
+    assert env.episode_count[0] == 2 and np.all(env.HL_step_count[1:] == 1)
+
+
+def test_idle_scene(env):
+    """Test that a scene without high-level action is paused, so that its episode only ends during its own step."""
+    # Put the vehicle just ahead of the last ego-vehicle onto its path
+    env.env.x[3, 1], env.env.y[3, 1] = env.env.x[3, 0] + 6, env.env.y[3, 0]
+    env.env.speed[3, 1] = env.env.target_speed[3, 1] = 0
+    x = env.env.x[3].copy()
+    env.send(np.zeros(3, dtype=int), [0, 1, 2])
+    env.recv(min_batch=3)
+    assert np.array_equal(env.env.x[3], x) and env.episode_count[3] == 1
+
+    env.send([0], [3])
+    obs, rewards, dones, infos, env_ids = env.recv()
+    assert list(env_ids) == [3] and dones[0] and infos[0]["crashed"]
+    assert infos[0]["terminal_observation"].shape == obs[0].shape
+    assert env.episode_count[3] == 2
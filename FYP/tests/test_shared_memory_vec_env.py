@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("stable_baselines3")
+
+from FYP.agent_components.config_env import ConfigEnv
+
+
+@pytest.fixture
+def vec_env():
+    """
+    Set up of two continuous-action environments running in worker processes.
+    """
+    env = ConfigEnv().create_vec(2, action_type="continuous", seed=0)
+    yield env
+    env.close()
+
+
+def test_reset(vec_env):
+    """Test that the shared observations match those of environments created in the main process."""
+    obs = vec_env.reset()
+    assert obs.shape == (2,) + vec_env.observation_space.shape
+    for idx in range(2):
+        expected, _ = ConfigEnv().create(action_type="continuous").reset(seed=idx)
+        assert np.array_equal(obs[idx], expected)
+
+
+def test_step(vec_env):
+    """Test that steps return observations, rewards and dones, and the counters of each worker in the infos."""
+    vec_env.reset()
+    actions = np.zeros((2,) + vec_env.action_space.shape)
+    for _ in range(3):
+        obs, rewards, dones, infos = vec_env.step(actions)
+    assert obs.shape == (2,) + vec_env.observation_space.shape
+    assert rewards.shape == dones.shape == (2,)
+    assert isinstance(vec_env.reset_infos, list)
+    assert [info["timesteps"] for info in infos] == [3, 3]
+    assert vec_env.get_attr("timesteps") == [3, 3]
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_shared_memory_release(start_method):
+    """Test that the shared memory buffer is released once at shutdown, without resource tracker warnings."""
+    code = "\n".join([
+        "import numpy as np",
+        "from FYP.agent_components.config_env import ConfigEnv",
+        "if __name__ == '__main__':",
+        "    env = ConfigEnv().create_vec(2, seed=0, start_method='{}')".format(start_method),
+        "    env.reset()",
+        "    env.step(np.zeros((2, 2)))",
+        "    env.close()",
+    ])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, env=env)
+    assert "resource_tracker" not in output.stderr
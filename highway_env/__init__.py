@@ -7,97 +7,97 @@ from gymnasium.envs.registration import register
 
 
 def register_highway_envs():
-    """Import the envs module so that envs register themselves."""
+    """Register the environments, whose modules are only imported when they are created."""
 
     # exit_env.py
     register(
         id='exit-v0',
-        entry_point='highway_env.envs:ExitEnv',
+        entry_point='highway_env.envs.exit_env:ExitEnv',
     )
 
     # highway_env.py
     register(
         id='highway-v0',
-        entry_point='highway_env.envs:HighwayEnv',
+        entry_point='highway_env.envs.highway_env:HighwayEnv',
     )
 
     register(
         id='highway-fast-v0',
-        entry_point='highway_env.envs:HighwayEnvFast',
+        entry_point='highway_env.envs.highway_env:HighwayEnvFast',
     )
 
     # intersection_env.py
     register(
         id='intersection-v0',
-        entry_point='highway_env.envs:IntersectionEnv',
+        entry_point='highway_env.envs.intersection_env:IntersectionEnv',
     )
 
     register(
         id='intersection-v1',
-        entry_point='highway_env.envs:ContinuousIntersectionEnv',
+        entry_point='highway_env.envs.intersection_env:ContinuousIntersectionEnv',
     )
 
     register(
         id='intersection-multi-agent-v0',
-        entry_point='highway_env.envs:MultiAgentIntersectionEnv',
+        entry_point='highway_env.envs.intersection_env:MultiAgentIntersectionEnv',
     )
 
     register(
         id='intersection-multi-agent-v1',
-        entry_point='highway_env.envs:TupleMultiAgentIntersectionEnv',
+        entry_point='highway_env.envs.intersection_env:TupleMultiAgentIntersectionEnv',
     )
 
     # lane_keeping_env.py
     register(
         id='lane-keeping-v0',
-        entry_point='highway_env.envs:LaneKeepingEnv',
+        entry_point='highway_env.envs.lane_keeping_env:LaneKeepingEnv',
         max_episode_steps=200
     )
 
     # merge_env.py
     register(
         id='merge-v0',
-        entry_point='highway_env.envs:MergeEnv',
+        entry_point='highway_env.envs.merge_env:MergeEnv',
     )
 
     # parking_env.py
     register(
         id='parking-v0',
-        entry_point='highway_env.envs:ParkingEnv',
+        entry_point='highway_env.envs.parking_env:ParkingEnv',
     )
 
     register(
         id='parking-ActionRepeat-v0',
-        entry_point='highway_env.envs:ParkingEnvActionRepeat'
+        entry_point='highway_env.envs.parking_env:ParkingEnvActionRepeat'
     )
 
     register(
         id='parking-parked-v0',
-        entry_point='highway_env.envs:ParkingEnvParkedVehicles'
+        entry_point='highway_env.envs.parking_env:ParkingEnvParkedVehicles'
     )
 
     # racetrack_env.py
     register(
         id='racetrack-v0',
-        entry_point='highway_env.envs:RacetrackEnv',
+        entry_point='highway_env.envs.racetrack_env:RacetrackEnv',
     )
 
     # roundabout_env.py
     register(
         id='roundabout-v0',
-        entry_point='highway_env.envs:RoundaboutEnv',
+        entry_point='highway_env.envs.roundabout_env:RoundaboutEnv',
     )
 
     # two_way_env.py
     register(
         id='two-way-v0',
-        entry_point='highway_env.envs:TwoWayEnv',
+        entry_point='highway_env.envs.two_way_env:TwoWayEnv',
         max_episode_steps=15
     )
 
     # u_turn_env.py
     register(
         id='u-turn-v0',
-        entry_point='highway_env.envs:UTurnEnv'
+        entry_point='highway_env.envs.u_turn_env:UTurnEnv'
     )
 
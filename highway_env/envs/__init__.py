@@ -1,10 +1,41 @@
-from highway_env.envs.highway_env import *
-from highway_env.envs.merge_env import *
-from highway_env.envs.parking_env import *
-from highway_env.envs.roundabout_env import *
-from highway_env.envs.two_way_env import *
-from highway_env.envs.intersection_env import *
-from highway_env.envs.lane_keeping_env import *
-from highway_env.envs.u_turn_env import *
-from highway_env.envs.exit_env import *
-from highway_env.envs.racetrack_env import *
+"""
+The environments, imported lazily.
+
+Each environment class is only imported from its module when it is first accessed, so that importing this package,
+e.g. to create a single environment, does not import every environment module and their dependencies.
+"""
+import importlib
+from typing import Any, List
+
+_ENVS = {
+    "highway_env": ["HighwayEnv", "HighwayEnvFast"],
+    "merge_env": ["MergeEnv"],
+    "parking_env": ["GoalEnv", "ParkingEnv", "ParkingEnvActionRepeat", "ParkingEnvParkedVehicles"],
+    "roundabout_env": ["RoundaboutEnv"],
+    "two_way_env": ["TwoWayEnv"],
+    "intersection_env": ["IntersectionEnv", "MultiAgentIntersectionEnv", "ContinuousIntersectionEnv",
+                         "TupleMultiAgentIntersectionEnv"],
+    "lane_keeping_env": ["LaneKeepingEnv"],
+    "u_turn_env": ["UTurnEnv"],
+    "exit_env": ["ExitEnv"],
+    "racetrack_env": ["RacetrackEnv"],
+    "batched_highway_env": ["BatchedHighwayEnv"],
+    "common.abstract": ["AbstractEnv", "MultiAgentWrapper"],
+}
+"""The public names of each environment module."""
+
+_MODULES = {name: module for module, names in _ENVS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _MODULES:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module("{}.{}".format(__name__, _MODULES[name])), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,544 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from gymnasium import spaces
+from gymnasium.utils import seeding
+from gymnasium.vector import VectorEnv
+
+from highway_env import utils
+from highway_env.envs.common.action import ContinuousAction
+from highway_env.envs.common.observation import KinematicObservation
+from highway_env.envs.highway_env import HighwayEnv
+from highway_env.road.lane import AbstractLane
+from highway_env.vehicle.behavior import IDMVehicle
+from highway_env.vehicle.kinematics import Vehicle
+
+
+def _not_zero(x: np.ndarray, eps: float = 1e-2) -> np.ndarray:
+    """Vectorized :py:func:`highway_env.utils.not_zero`."""
+    return np.where(np.abs(x) > eps, x, np.where(x >= 0, eps, -eps))
+
+
+class BatchedHighwayEnv(VectorEnv):
+
+    """
+    A batch of independent highway scenes, simulated together.
+
+    Contrary to a :py:class:`gymnasium.vector.SyncVectorEnv` of :py:class:`HighwayEnv`, which steps each scene in
+    turn, the states of the vehicles of all scenes are stored in (scenes x vehicles) arrays, and the behaviours,
+    kinematics, collisions, observations and rewards of all scenes are computed in single vectorized passes.
+
+    The scenes follow the dynamics of highway-v0, with a few simplifications:
+        - the ego-vehicle is controlled by continuous actions [acceleration, steering];
+        - other vehicles follow the IDM and MOBIL models, all of them deciding at once in each frame, rather than in
+          turn with the decisions of the previous vehicles known;
+        - only collisions involving the ego-vehicle are checked, like in highway-fast-v0;
+        - observations are kinematics of the nearest vehicles, sorted by distance.
+
+    Configurations that these simplifications do not cover, e.g. other observation or action types, shuffled
+    observations or dynamical ego-vehicles, are rejected.
+
+    Terminated or truncated scenes are automatically reset, and their final observation and info are stored in the
+    step info under the "final_observation" and "final_info" keys.
+
+    Scenes can be paused with the ``paused`` mask: their state is left unchanged by the steps, so that their episodes
+    do not progress (e.g. while they wait for an action from a learner which steps the scenes asynchronously).
+    """
+
+    metadata = {"render_modes": []}
+
+    FEATURES: List[str] = ['presence', 'x', 'y', 'vx', 'vy', 'heading', 'cos_h', 'sin_h']
+    """The supported kinematic features."""
+
+    OBSERVATION_OPTIONS: Dict[str, Optional[List]] = {
+        "type": ["Kinematics"], "features": None, "vehicles_count": None, "features_range": None, "absolute": None,
+        "normalize": None, "clip": None, "see_behind": None, "order": ["sorted"], "compact": [None],
+        "observe_intentions": None, "include_obstacles": None}
+    """The supported options of :py:class:`KinematicObservation`, and their supported values if not all of them.
+    Intentions and obstacles are not observed by the supported features."""
+
+    ACTION_OPTIONS: Dict[str, Optional[List]] = {
+        "type": ["ContinuousAction"], "acceleration_range": None, "steering_range": None, "longitudinal": [True],
+        "lateral": [True], "speed_range": [None], "dynamical": [False], "clip": [True]}
+    """The supported options of :py:class:`ContinuousAction`, and their supported values if not all of them."""
+
+    SPEED_LIMIT = 30
+    """The speed limit of the highway lanes [m/s], see :py:meth:`HighwayEnv._create_road`."""
+
+    STATE: List[str] = ['x', 'y', 'heading', 'speed', 'lane', 'target_lane', 'target_speed', 'timer', 'crashed',
+                        'ego_action']
+    """The state arrays modified by the simulation, which are restored in paused scenes."""
+
+    def __init__(self, num_envs: int = 64, config: dict = None) -> None:
+        """
+        :param num_envs: the number of scenes
+        :param config: the configuration of the scenes, see :py:meth:`default_config`
+        """
+        self.config = self.default_config()
+        if config:
+            self.config.update(config)
+        self._check_config()
+
+        self.lanes_count = self.config["lanes_count"]
+        self.vehicles_count = self.config["vehicles_count"] + 1  # Including the ego-vehicle, at index 0
+        observation = self.config["observation"]
+        self.features = observation.get("features", KinematicObservation.FEATURES)
+        self.observed_count = observation.get("vehicles_count", 5)
+        self.absolute = observation.get("absolute", False)
+        self.normalize = observation.get("normalize", True)
+        self.clip = observation.get("clip", True)
+        self.see_behind = observation.get("see_behind", False)
+        action = self.config["action"]
+        self.acceleration_range = action.get("acceleration_range") or ContinuousAction.ACCELERATION_RANGE
+        self.steering_range = action.get("steering_range") or ContinuousAction.STEERING_RANGE
+        self.features_range = observation.get("features_range") or {
+            "x": [-5.0 * Vehicle.MAX_SPEED, 5.0 * Vehicle.MAX_SPEED],
+            "y": [-AbstractLane.DEFAULT_WIDTH * self.lanes_count, AbstractLane.DEFAULT_WIDTH * self.lanes_count],
+            "vx": [-2*Vehicle.MAX_SPEED, 2*Vehicle.MAX_SPEED],
+            "vy": [-2*Vehicle.MAX_SPEED, 2*Vehicle.MAX_SPEED]
+        }
+
+        super().__init__(num_envs,
+                         spaces.Box(shape=(self.observed_count, len(self.features)), low=-np.inf, high=np.inf,
+                                    dtype=np.float32),
+                         spaces.Box(-1., 1., shape=(2,), dtype=np.float32))
+
+        # Vehicles states
+        shape = (num_envs, self.vehicles_count)
+        self.x = np.zeros(shape)
+        self.y = np.zeros(shape)
+        self.heading = np.zeros(shape)
+        self.speed = np.zeros(shape)
+        self.lane = np.zeros(shape, dtype=int)
+        self.target_lane = np.zeros(shape, dtype=int)
+        self.target_speed = np.zeros(shape)
+        self.delta = np.full(shape, IDMVehicle.DELTA)
+        self.timer = np.zeros(shape)
+        self.crashed = np.zeros(shape, dtype=bool)
+        self.ego_action = np.zeros((num_envs, 2))  # [acceleration, steering]
+        self.time = np.zeros(num_envs)
+        self.paused = np.zeros(num_envs, dtype=bool)
+        self.steps = 0
+
+        self._rows = np.arange(num_envs)[:, np.newaxis]
+        self._front = self._rear = np.zeros(shape + (self.lanes_count,), dtype=int)
+        self._has_front = self._has_rear = np.zeros(shape + (self.lanes_count,), dtype=bool)
+        self._is_idm = np.arange(self.vehicles_count)[np.newaxis] > 0
+        self._actions = None
+        self.np_random, _ = seeding.np_random()
+
+    @classmethod
+    def default_config(cls) -> dict:
+        """The default configuration, shared with :py:class:`HighwayEnv`."""
+        config = HighwayEnv.default_config()
+        config.update({
+            "action": {
+                "type": "ContinuousAction"
+            },
+        })
+        return config
+
+    def _check_config(self) -> None:
+        for name, options in [("observation", self.OBSERVATION_OPTIONS), ("action", self.ACTION_OPTIONS)]:
+            for key, value in self.config[name].items():
+                if key not in options:
+                    raise ValueError("BatchedHighwayEnv does not support the {} option {}".format(name, key))
+                if options[key] is not None and value not in options[key]:
+                    raise ValueError("BatchedHighwayEnv only supports the {} option {} in {}, not {}".format(
+                        name, key, options[key], value))
+        if self.config["controlled_vehicles"] != 1:
+            raise ValueError("BatchedHighwayEnv only supports a single controlled vehicle per scene")
+        features = self.config["observation"].get("features", KinematicObservation.FEATURES)
+        unknown_features = set(features) - set(self.FEATURES)
+        if unknown_features:
+            raise ValueError("Unsupported features {}, expected a subset of {}".format(unknown_features,
+                                                                                    self.FEATURES))
+
+    def reset_wait(self,
+                   seed: Optional[Union[int, List[int]]] = None,
+                   options: Optional[dict] = None) -> Tuple[np.ndarray, dict]:
+        """
+        Reset all the scenes.
+
+        :param seed: the seed of the random number generator shared by all scenes
+        :param options: unused
+        :return: the batch of observations, and info
+        """
+        if isinstance(seed, list):
+            seed = seed[0]
+        if seed is not None:
+            self.np_random, _ = seeding.np_random(seed)
+        self.steps = 0
+        self._reset_scenes(np.ones(self.num_envs, dtype=bool))
+        return self._observe(), {}
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions, dtype=float).reshape(self.num_envs, 2)
+
+    def step_wait(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Step all the scenes with the actions given to :py:meth:`step_async`.
+
+        :return: the batches of observations, rewards, terminations, truncations, and info
+        """
+        running = ~self.paused
+        self.time[running] += 1 / self.config["policy_frequency"]
+        paused_state = {name: getattr(self, name)[self.paused] for name in self.STATE} if self.paused.any() else {}
+        self._simulate(self._actions)
+        for name, value in paused_state.items():
+            getattr(self, name)[self.paused] = value
+
+        obs = self._observe()
+        rewards = self._rewards()
+        reward = self._reward(rewards)
+        terminated = running & (self.crashed[:, 0]
+                                | (self.config["offroad_terminal"] & (rewards["on_road_reward"] == 0)))
+        truncated = running & (self.time >= self.config["duration"])
+        info = {"speed": self.speed[:, 0].copy(), "crashed": self.crashed[:, 0].copy(),
+                "position": np.column_stack([self.x[:, 0], self.y[:, 0]]), "rewards": rewards}
+
+        done = terminated | truncated
+        if done.any():
+            final_observation = np.full(self.num_envs, None, dtype=object)
+            final_info = np.full(self.num_envs, None, dtype=object)
+            for scene in np.flatnonzero(done):
+                final_observation[scene] = obs[scene]
+                final_info[scene] = {"speed": info["speed"][scene], "crashed": info["crashed"][scene],
+                                     "position": info["position"][scene],
+                                     "rewards": {name: value[scene] for name, value in rewards.items()}}
+            self._reset_scenes(done)
+            obs = self._observe()
+            info.update({"final_observation": final_observation, "_final_observation": done,
+                         "final_info": final_info, "_final_info": done})
+        return obs, reward, terminated, truncated, info
+
+    def _reset_scenes(self, scenes: np.ndarray) -> None:
+        """
+        Populate some scenes with new random vehicles, as in :py:meth:`HighwayEnv._create_vehicles`.
+
+        Each vehicle is placed behind the previous one, with a random spacing depending on its speed.
+
+        :param scenes: a mask of the scenes to reset
+        """
+        count, vehicles = int(scenes.sum()), self.vehicles_count
+        lanes_density = np.exp(-5 / 40 * self.lanes_count)
+        speed_limit = self.SPEED_LIMIT
+
+        # Ego-vehicle
+        if self.config["initial_lane_id"] is not None:
+            ego_lane = np.full(count, self.config["initial_lane_id"])
+        else:
+            ego_lane = self.np_random.integers(self.lanes_count, size=count)
+        ego_speed = np.full(count, 25.)
+        ego_offset = self.config["ego_spacing"] * (12 + ego_speed) * lanes_density
+        ego_x = 3 * ego_offset + ego_offset * self.np_random.uniform(0.9, 1.1, size=count)
+
+        # Other vehicles
+        lane = self.np_random.integers(self.lanes_count, size=(count, vehicles - 1))
+        speed = self.np_random.uniform(0.7 * speed_limit, 0.8 * speed_limit, size=(count, vehicles - 1))
+        offset = (12 + speed) * lanes_density / self.config["vehicles_density"]
+        x = ego_x[:, np.newaxis] + np.cumsum(offset * self.np_random.uniform(0.9, 1.1, size=offset.shape), axis=1)
+
+        self.lane[scenes] = self.target_lane[scenes] = np.column_stack([ego_lane, lane])
+        self.x[scenes] = np.column_stack([ego_x, x])
+        self.y[scenes] = self.lane[scenes] * AbstractLane.DEFAULT_WIDTH
+        self.heading[scenes] = 0
+        self.speed[scenes] = self.target_speed[scenes] = np.column_stack([ego_speed, speed])
+        self.delta[scenes] = self.np_random.uniform(*IDMVehicle.DELTA_RANGE, size=(count, vehicles))
+        self.timer[scenes] = ((self.x[scenes] + self.y[scenes]) * np.pi) % IDMVehicle.LANE_CHANGE_DELAY
+        self.target_speed[scenes, 0] = 0  # The ego-vehicle has no target speed, which matters for MOBIL
+        self.crashed[scenes] = False
+        self.ego_action[scenes] = 0
+        self.time[scenes] = 0
+
+    def _simulate(self, actions: np.ndarray) -> None:
+        """Perform several steps of simulation of all scenes, with constant actions of the ego-vehicles."""
+        frames = int(self.config["simulation_frequency"] // self.config["policy_frequency"])
+        dt = 1 / self.config["simulation_frequency"]
+        for frame in range(frames):
+            if self.steps % frames == 0:
+                actions = np.clip(actions, -1, 1)
+                self.ego_action[:, 0] = utils.lmap(actions[:, 0], [-1, 1], self.acceleration_range)
+                self.ego_action[:, 1] = utils.lmap(actions[:, 1], [-1, 1], self.steering_range)
+            acceleration, steering = self._act()
+            self._step(acceleration, steering, dt)
+            self._handle_collisions()
+            self.steps += 1
+
+    def _act(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decide the actions of all vehicles, see :py:meth:`IDMVehicle.act`.
+
+        :return: the accelerations and steering angles of all vehicles
+        """
+        self._update_neighbours()
+        self._change_lane_policy()
+        steering = np.clip(self._steering_control(self.target_lane),
+                           -IDMVehicle.MAX_STEERING_ANGLE, IDMVehicle.MAX_STEERING_ANGLE)
+        front, has_front, _, _ = self._neighbours(self.lane)
+        acceleration = self._acceleration(np.arange(self.vehicles_count)[np.newaxis], front, has_front)
+        changing = self.lane != self.target_lane
+        if changing.any():
+            front, has_front, _, _ = self._neighbours(self.target_lane)
+            target_acceleration = self._acceleration(np.arange(self.vehicles_count)[np.newaxis], front, has_front)
+            acceleration = np.where(changing, np.minimum(acceleration, target_acceleration), acceleration)
+        acceleration = np.clip(acceleration, -IDMVehicle.ACC_MAX, IDMVehicle.ACC_MAX)
+
+        # The ego-vehicle follows its actions
+        acceleration[:, 0], steering[:, 0] = self.ego_action[:, 0], self.ego_action[:, 1]
+        return acceleration, steering
+
+    def _update_neighbours(self) -> None:
+        """
+        Find the preceding and following vehicles of each vehicle on every lane, see
+        :py:meth:`highway_env.road.road.Road.neighbour_vehicles`.
+
+        Vehicles are sorted by longitudinal position, and the nearest vehicles on each lane are found with cumulative
+        minimums and maximums along that order, rather than by comparing all pairs of vehicles.
+        """
+        lane_centers = np.arange(self.lanes_count) * AbstractLane.DEFAULT_WIDTH
+        order = np.argsort(self.x, axis=1, kind="stable")
+        rank = np.empty_like(order)
+        rank[self._rows, order] = np.arange(self.vehicles_count)
+        x, y = self.x[self._rows, order], self.y[self._rows, order]
+        on_lane = (np.abs(y[:, :, np.newaxis] - lane_centers) <= AbstractLane.DEFAULT_WIDTH / 2 + 1) \
+            & (-Vehicle.LENGTH <= x)[:, :, np.newaxis]
+        # Nearest rank on each lane, starting from each rank onwards (or backwards), padded for the first and last ranks
+        ranks = np.arange(self.vehicles_count)[np.newaxis, :, np.newaxis]
+        next_rank = np.minimum.accumulate(np.where(on_lane, ranks, self.vehicles_count)[:, ::-1], axis=1)[:, ::-1]
+        previous_rank = np.maximum.accumulate(np.where(on_lane, ranks, -1), axis=1)
+        next_rank = np.concatenate([next_rank, np.full_like(next_rank[:, :1], self.vehicles_count)], axis=1)
+        previous_rank = np.concatenate([np.full_like(previous_rank[:, :1], -1), previous_rank], axis=1)
+        # The neighbours of a vehicle are the nearest vehicles strictly after and before its rank
+        front_rank = next_rank[self._rows, rank + 1]
+        rear_rank = previous_rank[self._rows, rank]
+        self._has_front, self._has_rear = front_rank < self.vehicles_count, rear_rank >= 0
+        padded_order = np.concatenate([order, order[:, :1]], axis=1)
+        self._front = padded_order[self._rows[..., np.newaxis], front_rank]
+        self._rear = padded_order[self._rows[..., np.newaxis], rear_rank]
+
+    def _neighbours(self, lanes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the preceding and following vehicles of each vehicle on a given lane.
+
+        :param lanes: the lane on which each vehicle looks for neighbours, of shape (scenes, vehicles)
+        :return: the indexes of the preceding vehicles and whether they exist, and the same for following vehicles
+        """
+        lanes = np.clip(lanes, 0, self.lanes_count - 1)
+        index = (self._rows, np.arange(self.vehicles_count)[np.newaxis], lanes)
+        return self._front[index], self._has_front[index], self._rear[index], self._has_rear[index]
+
+    def _acceleration(self, ego: np.ndarray, front: np.ndarray, has_front: np.ndarray,
+                      delta: np.ndarray = None) -> np.ndarray:
+        """
+        Compute accelerations with the Intelligent Driver Model, see :py:meth:`IDMVehicle.acceleration`.
+
+        :param ego: the indexes of the vehicles whose accelerations are computed, of shape (scenes, vehicles)
+        :param front: the indexes of their preceding vehicles
+        :param has_front: whether they have a preceding vehicle
+        :param delta: the velocity exponent of the model, by default that of the ego vehicles
+        :return: the acceleration commands [m/s2]
+        """
+        def take(values: np.ndarray, index: np.ndarray) -> np.ndarray:
+            return values[self._rows, index]
+        speed, heading = take(self.speed, ego), take(self.heading, ego)
+        delta = take(self.delta, ego) if delta is None else delta
+        target_speed = np.clip(take(self.target_speed, ego), 0, self.SPEED_LIMIT)
+        acceleration = IDMVehicle.COMFORT_ACC_MAX * (
+            1 - np.power(np.maximum(speed, 0) / np.abs(_not_zero(target_speed)), delta))
+
+        gap = take(self.x, front) - take(self.x, ego)
+        dv = speed - take(self.speed, front) * np.cos(take(self.heading, front) - heading)
+        ab = -IDMVehicle.COMFORT_ACC_MAX * IDMVehicle.COMFORT_ACC_MIN
+        desired_gap = IDMVehicle.DISTANCE_WANTED + speed * IDMVehicle.TIME_WANTED + speed * dv / (2 * np.sqrt(ab))
+        return acceleration - np.where(has_front,
+                                       IDMVehicle.COMFORT_ACC_MAX * np.power(desired_gap / _not_zero(gap), 2), 0)
+
+    def _change_lane_policy(self) -> None:
+        """Decide when to change lane with the MOBIL model, see :py:meth:`IDMVehicle.change_lane_policy`."""
+        deciding = self._is_idm & ~self.crashed & (self.lane == self.target_lane) \
+            & (IDMVehicle.LANE_CHANGE_DELAY < self.timer)
+        self._abort_lane_changes()
+        if not deciding.any():
+            return
+        self.timer[deciding] = 0
+        deciding &= np.abs(self.speed) >= 1
+        vehicles = np.arange(self.vehicles_count)[np.newaxis]
+        old_front, has_old_front, old_rear, has_old_rear = self._neighbours(self.lane)
+        self_a = self._acceleration(vehicles, old_front, has_old_front)
+        old_rear_a = np.where(has_old_rear, self._acceleration(old_rear, vehicles, True, self.delta), 0)
+        old_rear_pred_a = np.where(has_old_rear, self._acceleration(old_rear, old_front, has_old_front, self.delta), 0)
+        for side in [-1, 1]:
+            lane = self.lane + side
+            candidates = deciding & (0 <= lane) & (lane < self.lanes_count)
+            if not candidates.any():
+                continue
+            new_front, has_new_front, new_rear, has_new_rear = self._neighbours(lane)
+            # Is the maneuver unsafe for the new following vehicle?
+            new_rear_a = np.where(has_new_rear,
+                                  self._acceleration(new_rear, new_front, has_new_front, self.delta), 0)
+            new_rear_pred_a = np.where(has_new_rear, self._acceleration(new_rear, vehicles, True, self.delta), 0)
+            safe = new_rear_pred_a >= -IDMVehicle.LANE_CHANGE_MAX_BRAKING_IMPOSED
+            # Is there an acceleration advantage for me and/or my followers to change lane?
+            self_pred_a = self._acceleration(vehicles, new_front, has_new_front)
+            jerk = self_pred_a - self_a + IDMVehicle.POLITENESS * (new_rear_pred_a - new_rear_a
+                                                                   + old_rear_pred_a - old_rear_a)
+            change = candidates & safe & (jerk >= IDMVehicle.LANE_CHANGE_MIN_ACC_GAIN)
+            self.target_lane[change] = lane[change]
+
+    def _abort_lane_changes(self) -> None:
+        """
+        Abort the lane changes into a lane that another vehicle just ahead is also changing into, see
+        :py:meth:`IDMVehicle.change_lane_policy`.
+
+        Only the vehicles changing lane are compared to the other vehicles of their scene.
+        """
+        scene, vehicle = np.nonzero(self._is_idm & ~self.crashed & (self.lane != self.target_lane))
+        if not scene.size:
+            return
+        pairs = np.arange(scene.size)
+        target = self.target_lane[scene, vehicle][:, np.newaxis]
+        others = (self.target_lane[scene] == target) & (self.lane[scene] != target) & self._is_idm
+        others[pairs, vehicle] = False
+        gap = self.x[scene] - self.x[scene, vehicle][:, np.newaxis]
+        speed, heading = self.speed[scene, vehicle][:, np.newaxis], self.heading[scene, vehicle][:, np.newaxis]
+        dv = speed - self.speed[scene] * np.cos(self.heading[scene] - heading)
+        ab = -IDMVehicle.COMFORT_ACC_MAX * IDMVehicle.COMFORT_ACC_MIN
+        desired_gap = IDMVehicle.DISTANCE_WANTED + speed * IDMVehicle.TIME_WANTED + speed * dv / (2 * np.sqrt(ab))
+        abort = (others & (0 < gap) & (gap < desired_gap)).any(axis=1)
+        self.target_lane[scene[abort], vehicle[abort]] = self.lane[scene[abort], vehicle[abort]]
+
+    def _steering_control(self, target_lane: np.ndarray) -> np.ndarray:
+        """
+        Steer the vehicles to follow the center of their target lanes, see
+        :py:meth:`highway_env.vehicle.controller.ControlledVehicle.steering_control`.
+
+        :param target_lane: the lanes to follow
+        :return: the steering wheel angle commands [rad]
+        """
+        lateral = self.y - target_lane * AbstractLane.DEFAULT_WIDTH
+        speed = _not_zero(self.speed)
+        # Lateral position control
+        lateral_speed_command = - IDMVehicle.KP_LATERAL * lateral
+        # Lateral speed to heading
+        heading_command = np.arcsin(np.clip(lateral_speed_command / speed, -1, 1))
+        heading_ref = np.clip(heading_command, -np.pi/4, np.pi/4)
+        # Heading control
+        heading_rate_command = IDMVehicle.KP_HEADING * utils.wrap_to_pi(heading_ref - self.heading)
+        # Heading rate to steering angle
+        slip_angle = np.arcsin(np.clip(Vehicle.LENGTH / 2 / speed * heading_rate_command, -1, 1))
+        steering_angle = np.arctan(2 * np.tan(slip_angle))
+        return np.clip(steering_angle, -IDMVehicle.MAX_STEERING_ANGLE, IDMVehicle.MAX_STEERING_ANGLE)
+
+    def _step(self, acceleration: np.ndarray, steering: np.ndarray, dt: float) -> None:
+        """
+        Integrate the kinematics of all vehicles, see :py:meth:`Vehicle.step`.
+
+        :param acceleration: the acceleration commands [m/s2]
+        :param steering: the steering angle commands [rad]
+        :param dt: timestep of integration of the model [s]
+        """
+        # Clip actions, the ego-vehicle action being stored
+        steering = np.where(self.crashed, 0, steering)
+        acceleration = np.where(self.crashed, -self.speed, acceleration)
+        acceleration = np.where(self.speed > Vehicle.MAX_SPEED,
+                                np.minimum(acceleration, Vehicle.MAX_SPEED - self.speed), acceleration)
+        acceleration = np.where(self.speed < Vehicle.MIN_SPEED,
+                                np.maximum(acceleration, Vehicle.MIN_SPEED - self.speed), acceleration)
+        self.ego_action[:, 0], self.ego_action[:, 1] = acceleration[:, 0], steering[:, 0]
+
+        self.timer[:, 1:] += dt
+        beta = np.arctan(1 / 2 * np.tan(steering))
+        self.x += self.speed * np.cos(self.heading + beta) * dt
+        self.y += self.speed * np.sin(self.heading + beta) * dt
+        self.heading += self.speed * np.sin(beta) / (Vehicle.LENGTH / 2) * dt
+        self.speed += acceleration * dt
+        self.lane = np.clip(np.floor(self.y / AbstractLane.DEFAULT_WIDTH + 0.5), 0, self.lanes_count - 1).astype(int)
+
+    def _handle_collisions(self) -> None:
+        """Check for collisions between the ego-vehicles and other vehicles, with the separating axis theorem."""
+        center = np.stack([self.x[:, 1:] - self.x[:, :1], self.y[:, 1:] - self.y[:, :1]], axis=-1)
+        close = np.linalg.norm(center, axis=-1) <= np.sqrt(Vehicle.LENGTH ** 2 + Vehicle.WIDTH ** 2)
+        if not close.any():
+            return
+        directions = np.stack([np.cos(self.heading), np.sin(self.heading)], axis=-1)
+        normals = np.stack([-directions[..., 1], directions[..., 0]], axis=-1)
+        ego_axes = np.broadcast_to(np.stack([directions[:, :1], normals[:, :1]], axis=2), center.shape[:2] + (2, 2))
+        other_axes = np.stack([directions[:, 1:], normals[:, 1:]], axis=2)
+        separated = np.zeros(close.shape, dtype=bool)
+        for axes in [ego_axes, other_axes]:
+            for k in range(2):
+                axis = axes[:, :, k]
+                extent = Vehicle.LENGTH / 2 * (np.abs(np.sum(directions[:, :1] * axis, axis=-1))
+                                               + np.abs(np.sum(directions[:, 1:] * axis, axis=-1))) \
+                    + Vehicle.WIDTH / 2 * (np.abs(np.sum(normals[:, :1] * axis, axis=-1))
+                                           + np.abs(np.sum(normals[:, 1:] * axis, axis=-1)))
+                separated |= np.abs(np.sum(center * axis, axis=-1)) > extent
+        colliding = close & ~separated
+        self.crashed[:, 1:] |= colliding
+        self.crashed[:, 0] |= colliding.any(axis=1)
+
+    def _observe(self) -> np.ndarray:
+        """
+        Observe the kinematics of the vehicles nearest to each ego-vehicle, see
+        :py:class:`highway_env.envs.common.observation.KinematicObservation`.
+
+        :return: the batch of observations
+        """
+        vx, vy = self.speed * np.cos(self.heading), self.speed * np.sin(self.heading)
+        features = {"presence": np.ones(self.x.shape), "x": self.x, "y": self.y, "vx": vx, "vy": vy,
+                    "heading": self.heading, "cos_h": np.cos(self.heading), "sin_h": np.sin(self.heading)}
+        rows = np.stack([features[feature] for feature in self.features], axis=-1)
+        if not self.absolute:
+            relative = [column for column, feature in enumerate(self.features) if feature in ["x", "y", "vx", "vy"]]
+            rows[:, 1:, relative] -= rows[:, :1, relative]
+
+        # Nearby vehicles (in front of the ego-vehicle, unless it sees behind), sorted by distance along its lane
+        dx = self.x[:, 1:] - self.x[:, :1]
+        distance = np.hypot(dx, self.y[:, 1:] - self.y[:, :1])
+        perceived = distance < HighwayEnv.PERCEPTION_DISTANCE
+        if not self.see_behind:
+            perceived &= -2 * Vehicle.LENGTH < dx
+        key = np.where(perceived, np.abs(dx), np.inf)
+        nearest = np.argsort(key, axis=1, kind="stable")[:, :self.observed_count - 1]
+        observed = np.isfinite(np.take_along_axis(key, nearest, axis=1))
+        others = np.take_along_axis(rows[:, 1:], nearest[..., np.newaxis], axis=1)
+        obs = np.concatenate([rows[:, :1], others], axis=1)
+
+        # Normalize and clip
+        if self.normalize:
+            for feature, f_range in self.features_range.items():
+                if feature in self.features:
+                    column = self.features.index(feature)
+                    obs[..., column] = utils.lmap(obs[..., column], f_range, [-1, 1])
+                    if self.clip:
+                        obs[..., column] = np.clip(obs[..., column], -1, 1)
+        # Fill missing rows
+        obs[:, 1:][~observed] = 0
+        batch = np.zeros((self.num_envs, self.observed_count, len(self.features)), dtype=np.float32)
+        batch[:, :obs.shape[1]] = obs
+        return batch
+
+    def _rewards(self) -> Dict[str, np.ndarray]:
+        """The reward terms of each scene, see :py:meth:`HighwayEnv._rewards`."""
+        forward_speed = self.speed[:, 0] * np.cos(self.heading[:, 0])
+        scaled_speed = utils.lmap(forward_speed, self.config["reward_speed_range"], [0, 1])
+        lateral = self.y[:, 0] - self.lane[:, 0] * AbstractLane.DEFAULT_WIDTH
+        on_road = (np.abs(lateral) <= AbstractLane.DEFAULT_WIDTH / 2) & (-Vehicle.LENGTH <= self.x[:, 0])
+        return {
+            "collision_reward": self.crashed[:, 0].astype(float),
+            "right_lane_reward": self.lane[:, 0] / max(self.lanes_count - 1, 1),
+            "high_speed_reward": np.clip(scaled_speed, 0, 1),
+            "on_road_reward": on_road.astype(float)
+        }
+
+    def _reward(self, rewards: Dict[str, np.ndarray]) -> np.ndarray:
+        """The reward of each scene, see :py:meth:`HighwayEnv._reward`."""
+        reward = sum(self.config.get(name, 0) * reward for name, reward in rewards.items())
+        if self.config["normalize_reward"]:
+            reward = utils.lmap(reward,
+                                [self.config["collision_reward"],
+                                 self.config["high_speed_reward"] + self.config["right_lane_reward"]],
+                                [0, 1])
+        return reward * rewards['on_road_reward']
+
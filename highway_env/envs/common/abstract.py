@@ -1,6 +1,8 @@
 import copy
 import os
-from typing import List, Tuple, Optional, Callable, TypeVar, Generic, Union, Dict, Text
+import weakref
+from contextlib import nullcontext
+from typing import List, Tuple, Optional, Callable, TypeVar, Generic, Union, Dict, Text, Iterable
 import gymnasium as gym
 from gymnasium import Wrapper
 from gymnasium.wrappers import RecordVideo
@@ -11,13 +13,21 @@ from highway_env import utils
 from highway_env.envs.common.action import action_factory, Action, DiscreteMetaAction, ActionType
 from highway_env.envs.common.observation import observation_factory, ObservationType
 from highway_env.envs.common.finite_mdp import finite_mdp
-from highway_env.envs.common.graphics import EnvViewer
+from highway_env.envs.common.perception import PerceptionCache
+from highway_env.envs.common.profiler import StepProfiler
+from highway_env.envs.common.scenario_store import ScenarioStore
+from highway_env.envs.common.trace import TraceRecorder
+from highway_env.envs.common.scene_pool import ScenePool
+from highway_env.envs.common.snapshot import EnvSnapshot, clone_object, shallow_copy
 from highway_env.vehicle.behavior import IDMVehicle, LinearVehicle
 from highway_env.vehicle.controller import MDPVehicle
 from highway_env.vehicle.kinematics import Vehicle
+from highway_env.vehicle.objects import RoadObject
 
 Observation = TypeVar("Observation")
 
+NO_PROFILING = nullcontext()
+
 
 class AbstractEnv(gym.Env):
 
@@ -38,6 +48,15 @@ class AbstractEnv(gym.Env):
     PERCEPTION_DISTANCE = 5.0 * Vehicle.MAX_SPEED
     """The maximum distance of any vehicle present in the observation [m]"""
 
+    STEERING_TOLERANCE = 1e-2
+    """The steering angle above which a vehicle is simulated with fine frames, in adaptive sub-stepping [rad]"""
+
+    INTERACTION_WIDTH = 3.0
+    """The lateral distance below which vehicles may interact, in adaptive sub-stepping [m]"""
+
+    SNAPSHOT_ATTRIBUTES: List[str] = ["time", "steps", "done", "controlled_vehicles"]
+    """The environment attributes captured by :py:meth:`get_state`, in addition to the road and its objects"""
+
     def __init__(self, config: dict = None, render_mode: Optional[str] = None) -> None:
         super().__init__()
 
@@ -48,6 +67,14 @@ class AbstractEnv(gym.Env):
         # Scene
         self.road = None
         self.controlled_vehicles = []
+        self.perception = PerceptionCache(self)
+        self._variants = weakref.WeakSet()  # Copy-on-write variants sharing road objects with this environment
+        self._owners = []  # Environments whose road objects are shared with this copy-on-write variant
+        self._owned = set()  # Ids of the road objects of this variant that are not shared
+        self.scene_pool = None  # Initial scenes generated ahead of time, see config["warm_reset_pool"]
+        self.scenario_store = None  # Initial scenes stored on disk, see config["scenario_store"]
+        self.profiler = None  # Timing of the phases of each step, see config["profiling"]
+        self.trace_recorder = None  # Kinematics of every frame recorded on disk, see config["trace"]
 
         # Spaces
         self.action_type = None
@@ -106,7 +133,16 @@ class AbstractEnv(gym.Env):
             "render_agent": True,
             "offscreen_rendering": os.environ.get("OFFSCREEN_RENDERING", "0") == "1",
             "manual_control": False,
-            "real_time_rendering": False
+            "real_time_rendering": False,
+            "rendering_backend": "pygame",  # "numpy" renders rgb_array images without pygame, see NumpyViewer
+            "adaptive_substeps": False,  # Merge simulation frames while no vehicles interact
+            "interaction_radius": 40,  # [m] Longitudinal distance below which vehicles are simulated with fine frames
+            "max_substeps": 5,  # Maximum number of simulation frames merged into a single integration step
+            "lod_distance": None,  # [m] Distance to the controlled vehicles beyond which traffic is simplified, if any
+            "lod_period": 5,  # Number of simulation frames between two updates of the simplified traffic
+            "profiling": False,  # Time the phases of each step, see env.profiler
+            "profiling_info": False,  # Report the durations of the phases of each step in its info, when profiling
+            "trace": None  # Directory where the kinematics of every frame are recorded, see TraceRecorder
         }
 
     def configure(self, config: dict) -> None:
@@ -178,7 +214,7 @@ class AbstractEnv(gym.Env):
             "action": action,
         }
         try:
-            info["rewards"] = self._rewards(action)
+            info["rewards"] = self.perception.get("rewards", lambda: self._rewards(action))
         except NotImplementedError:
             pass
         return info
@@ -192,19 +228,32 @@ class AbstractEnv(gym.Env):
         Reset the environment to it's initial configuration
 
         :param seed: The seed that is used to initialize the environment's PRNG
-        :param options: Allows the environment configuration to specified through `options["config"]`
+        :param options: Allows the environment configuration to specified through `options["config"]`, and the
+                        initial scene to be loaded from the scenario store through `options["scenario_id"]`
         :return: the observation of the reset state
         """
+        self._before_mutation()
         super().reset(seed=seed, options=options)
         if options and "config" in options:
             self.configure(options["config"])
         self.update_metadata()
+        if not self.config["profiling"]:
+            self.profiler = None
+        elif self.profiler is None:
+            self.profiler = StepProfiler()
         self.define_spaces()  # First, to set the controlled vehicle class depending on action space
         self.time = self.steps = 0
         self.done = False
-        self._reset()
+        if options and options.get("scenario_id") is not None:
+            self._load_scenario(options["scenario_id"])
+        elif self.config.get("warm_reset_pool"):
+            self._warm_reset(reseed=seed is not None)
+        else:
+            self._reset()
         self.define_spaces()  # Second, to link the obs and actions to the vehicles once the scene is created
-        obs = self.observation_type.observe()
+        self.perception.clear()
+        self._start_trace(seed)
+        obs = self.perception.observe(self.observation_type)
         info = self._info(obs, action=self.action_space.sample())
         if self.render_mode == 'human':
             self.render()
@@ -218,6 +267,44 @@ class AbstractEnv(gym.Env):
         """
         raise NotImplementedError()
 
+    def _warm_reset(self, reseed: bool) -> None:
+        """
+        Reset the scene by restoring a scene generated ahead of time, instead of creating it.
+
+        :param reseed: whether the environment has just been seeded
+        """
+        if self.scene_pool is None:
+            self.scene_pool = ScenePool(self.config["warm_reset_pool"])
+        self.scene_pool.restore(self, reseed=reseed)
+
+    def _load_scenario(self, scenario_id: int) -> None:
+        """
+        Reset the scene by loading a scenario from the scenario store.
+
+        :param scenario_id: the index of the scenario in the store
+        """
+        path = self.config.get("scenario_store")
+        if not path:
+            raise ValueError("A scenario_id was given, but no scenario_store is configured")
+        if self.scenario_store is None or self.scenario_store.path != path:
+            self.scenario_store = ScenarioStore(path)
+        self.scenario_store.load(self, int(scenario_id))
+
+    def _start_trace(self, seed: Optional[int]) -> None:
+        """
+        Start recording the episode in the trace, if one is configured.
+
+        :param seed: the seed of the reset, if any
+        """
+        path = self.config["trace"]
+        if self.trace_recorder is not None and self.trace_recorder.path != path:
+            self.trace_recorder.close()
+            self.trace_recorder = None
+        if path:
+            if self.trace_recorder is None:
+                self.trace_recorder = TraceRecorder(path)
+            self.trace_recorder.start_episode(self, seed=seed)
+
     def step(self, action: Action) -> Tuple[Observation, float, bool, bool, dict]:
         """
         Perform an action and step the environment dynamics.
@@ -231,40 +318,113 @@ class AbstractEnv(gym.Env):
         if self.road is None or self.vehicle is None:
             raise NotImplementedError("The road and vehicle must be initialized in the environment implementation")
 
+        if self.profiler:
+            self.profiler.start_step()
         self.time += 1 / self.config["policy_frequency"]
         self._simulate(action)
 
-        obs = self.observation_type.observe()
-        reward = self._reward(action)
-        terminated = self._is_terminated()
-        truncated = self._is_truncated()
-        info = self._info(obs, action)
+        with self._phase("observe"):
+            obs = self.perception.observe(self.observation_type)
+        with self._phase("reward"):
+            reward = self._reward(action)
+            terminated = self._is_terminated()
+            truncated = self._is_truncated()
+        with self._phase("info"):
+            info = self._info(obs, action)
         if self.render_mode == 'human':
             self.render()
+        if self.profiler and self.config["profiling_info"]:
+            info["profile"] = dict(self.profiler.last_step)
 
         return obs, reward, terminated, truncated, info
 
+    def simulate_step(self, action: Action) -> Tuple[float, bool, bool]:
+        """
+        Perform an action and step the environment dynamics, without observing the resulting state.
+
+        This is a cheaper step for the intermediate decisions of a sequence of actions, e.g. the low-level actions of a
+        hierarchical policy, whose observation and info are only needed at the end of the sequence. They can then be
+        computed with :py:meth:`observe_step`.
+
+        :param action: the action performed by the ego-vehicle
+        :return: a tuple (reward, terminated, truncated)
+        """
+        if self.road is None or self.vehicle is None:
+            raise NotImplementedError("The road and vehicle must be initialized in the environment implementation")
+
+        if self.profiler:
+            self.profiler.start_step()
+        self.time += 1 / self.config["policy_frequency"]
+        self._simulate(action)
+
+        with self._phase("reward"):
+            reward = self._reward(action)
+            terminated = self._is_terminated()
+            truncated = self._is_truncated()
+        if self.render_mode == 'human':
+            self.render()
+        return reward, terminated, truncated
+
+    def observe_step(self, action: Action) -> Tuple[Observation, dict]:
+        """
+        Observe the environment after a step performed with :py:meth:`simulate_step`.
+
+        :param action: the last action performed by the ego-vehicle
+        :return: a tuple (observation, info), as returned by :py:meth:`step`
+        """
+        with self._phase("observe"):
+            obs = self.perception.observe(self.observation_type)
+        with self._phase("info"):
+            info = self._info(obs, action)
+        if self.profiler and self.config["profiling_info"]:
+            info["profile"] = dict(self.profiler.last_step)
+        return obs, info
+
     def _simulate(self, action: Optional[Action] = None) -> None:
-        """Perform several steps of simulation with constant action."""
+        """
+        Perform several steps of simulation with constant action.
+
+        With adaptive sub-stepping, consecutive frames are merged into a single integration step while no vehicles
+        interact. The steps count still advances by one per frame, so that the simulated time is unchanged.
+        """
+        self._before_mutation()
+        self._schedule_level_of_detail()
         frames = int(self.config["simulation_frequency"] // self.config["policy_frequency"])
-        for frame in range(frames):
+        frame = 0
+        while frame < frames:
             # Forward action to the vehicle
             if action is not None \
                     and not self.config["manual_control"] \
                     and self.steps % int(self.config["simulation_frequency"] // self.config["policy_frequency"]) == 0:
-                self.action_type.act(action)
-
-            self.road.act()
-            self.road.step(1 / self.config["simulation_frequency"])
-            self.steps += 1
+                with self._phase("action"):
+                    self.action_type.act(action)
+
+            with self._phase("road.act"):
+                self.road.act()
+            substeps = self._substeps(frames - frame) if self.config["adaptive_substeps"] else 1
+            with self._phase("road.step"):
+                self.road.step(substeps / self.config["simulation_frequency"])
+            self.steps += substeps
+            frame += substeps
+            self.perception.clear()
 
             # Automatically render intermediate simulation steps if a viewer has been launched
             # Ignored if the rendering is done offscreen
-            if frame < frames - 1:  # Last frame will be rendered through env.render() as usual
+            if frame < frames:  # Last frame will be rendered through env.render() as usual
+                if self.trace_recorder:
+                    self.trace_recorder.record_frame(self)
                 self._automatic_rendering()
 
+        self._after_simulation()
+        self.perception.clear()
+        if self.trace_recorder:  # The last frame is recorded as observed by the agent
+            self.trace_recorder.record_frame(self)
         self.enable_auto_render = False
 
+    def _after_simulation(self) -> None:
+        """Update the scene at the end of the simulation of a step, before it is observed."""
+        pass
+
     def render(self) -> Optional[np.ndarray]:
         """
         Render the environment.
@@ -279,18 +439,24 @@ class AbstractEnv(gym.Env):
                 f'e.g. gym.make("{self.spec.id}", render_mode="rgb_array")'
             )
             return
-        if self.viewer is None:
-            self.viewer = EnvViewer(self)
+        with self._phase("render"):
+            if self.viewer is None:
+                if self.config["rendering_backend"] == "numpy" and self.render_mode == "rgb_array":
+                    from highway_env.envs.common.rasterizer import NumpyViewer
+                    self.viewer = NumpyViewer(self)
+                else:
+                    from highway_env.envs.common.graphics import EnvViewer  # Imports pygame, only when rendering
+                    self.viewer = EnvViewer(self)
 
-        self.enable_auto_render = True
+            self.enable_auto_render = True
 
-        self.viewer.display()
+            self.viewer.display()
 
-        if not self.viewer.offscreen:
-            self.viewer.handle_events()
-        if self.render_mode == 'rgb_array':
-            image = self.viewer.get_image()
-            return image
+            if not self.viewer.offscreen:
+                self.viewer.handle_events()
+            if self.render_mode == 'rgb_array':
+                image = self.viewer.get_image()
+                return image
 
     def close(self) -> None:
         """
@@ -302,6 +468,12 @@ class AbstractEnv(gym.Env):
         if self.viewer is not None:
             self.viewer.close()
         self.viewer = None
+        if self.scene_pool is not None:
+            self.scene_pool.close()
+            self.scene_pool = None
+        if self.trace_recorder is not None:
+            self.trace_recorder.close()
+            self.trace_recorder = None
 
     def get_available_actions(self) -> List[int]:
         return self.action_type.get_available_actions()
@@ -310,6 +482,52 @@ class AbstractEnv(gym.Env):
         self._record_video_wrapper = wrapper
         self.update_metadata()
 
+    def _phase(self, name: str):
+        """A context manager timing a phase of the step with the profiler, which does nothing when not profiling."""
+        return self.profiler.phase(name) if self.profiler else NO_PROFILING
+
+    def _schedule_level_of_detail(self) -> None:
+        """
+        Configure the level of detail of the road traffic around the controlled vehicles.
+
+        The distance is never shorter than the perception distance, so that observed vehicles use the full models.
+        """
+        distance = self.config["lod_distance"]
+        if distance is not None:
+            distance = max(distance, self.PERCEPTION_DISTANCE)
+        self.road.set_level_of_detail(self.controlled_vehicles, distance, self.config["lod_period"])
+
+    def _substeps(self, remaining: int) -> int:
+        """
+        Number of simulation frames that can be merged into the next integration step.
+
+        Fine frames are used while intermediate frames are rendered, while a vehicle is changing lane or steering, and
+        while another vehicle or obstacle is within the interaction radius ahead or behind a vehicle, in a lateral band
+        narrower than a lane so that vehicles driving side by side in parallel lanes do not interact.
+
+        :param remaining: the number of frames remaining until the next action
+        :return: the number of frames to merge
+        """
+        substeps = min(remaining, self.config["max_substeps"])
+        if substeps <= 1 or (self.viewer is not None and self.enable_auto_render):
+            return 1
+        vehicles = self.road.vehicles
+        for vehicle in vehicles:
+            if getattr(vehicle, "target_lane_index", vehicle.lane_index) != vehicle.lane_index \
+                    or abs(vehicle.action["steering"]) > self.STEERING_TOLERANCE:
+                return 1
+        others = vehicles + [o for o in self.road.objects if o.collidable]
+        if len(others) < 2:
+            return substeps
+        positions = np.array([v.position for v in others])
+        directions = np.array([v.direction for v in vehicles])
+        relative = positions[None, :] - positions[:len(vehicles), None]
+        longitudinal = np.abs(np.einsum("ijk,ik->ij", relative, directions))
+        lateral = np.abs(relative[..., 1] * directions[:, None, 0] - relative[..., 0] * directions[:, None, 1])
+        interacting = (longitudinal < self.config["interaction_radius"]) & (lateral < self.INTERACTION_WIDTH)
+        interacting[np.arange(len(vehicles)), np.arange(len(vehicles))] = False
+        return 1 if interacting.any() else substeps
+
     def _automatic_rendering(self) -> None:
         """
         Automatically render the intermediate frames while an action is still ongoing.
@@ -324,6 +542,127 @@ class AbstractEnv(gym.Env):
             else:
                 self.render()
 
+    def get_state(self) -> EnvSnapshot:
+        """
+        Capture the dynamic state of the environment.
+
+        Contrary to a deep copy of the environment, the road network and the observation and action types are not
+        copied: only the kinematics and internal states of the road objects, the simulation time and the state of
+        the random number generator are captured.
+
+        :return: a snapshot of the environment state, which can be restored with :py:meth:`set_state`
+        """
+        self._before_mutation()
+        return EnvSnapshot(self)
+
+    def set_state(self, state: EnvSnapshot) -> None:
+        """
+        Restore the dynamic state of the environment.
+
+        :param state: a snapshot obtained with :py:meth:`get_state`
+        """
+        self._before_mutation()
+        state.restore(self)
+
+    def variant(self) -> 'AbstractEnv':
+        """
+        Create a copy-on-write variant of the environment.
+
+        The variant shares the road network and the road objects of the environment, except for the controlled
+        vehicles which are cloned. Other road objects are only cloned when they are modified with :py:meth:`own`,
+        or when either environment is simulated, reset or restored. This is much cheaper than a deep copy when only
+        a few vehicles differ between the copies.
+
+        :return: a variant of the environment
+        """
+        variant = copy.copy(self)
+        variant.config = copy.deepcopy(self.config)
+        variant.viewer = None
+        variant._record_video_wrapper = None
+        variant.enable_auto_render = False
+        variant.scene_pool = None
+        variant.profiler = None
+        variant.trace_recorder = None
+        variant.perception = PerceptionCache(variant)
+        variant._np_random = copy.deepcopy(self._np_random)
+        for key in self.SNAPSHOT_ATTRIBUTES:
+            setattr(variant, key, shallow_copy(getattr(self, key)))
+
+        variant.road = copy.copy(self.road)
+        variant.road.vehicles = list(self.road.vehicles)
+        variant.road.objects = list(self.road.objects)
+        variant.road.distant_vehicles = list(self.road.distant_vehicles)
+        variant.road.np_random = variant.np_random if self.road.np_random is self.np_random \
+            else copy.deepcopy(self.road.np_random)
+
+        variant._variants = weakref.WeakSet()
+        variant._owners = [self] + self._owners
+        variant._owned = set()
+        for owner in variant._owners:
+            owner._variants.add(variant)
+        variant.own(variant.controlled_vehicles)
+        variant.define_spaces()
+        return variant
+
+    def own(self, entities: Iterable[RoadObject]) -> List[RoadObject]:
+        """
+        Clone road objects shared with other environments, before modifying them.
+
+        :param entities: road objects of this environment
+        :return: the corresponding road objects, that can be modified
+        """
+        entities = list(entities)
+        clones = {id(entity): clone_object(entity, self.road) for entity in entities
+                  if self._owners and id(entity) not in self._owned}
+        if not clones:
+            return entities
+        self._owned.update(id(clone) for clone in clones.values())
+        self.road.vehicles = [clones.get(id(v), v) for v in self.road.vehicles]
+        self.road.objects = [clones.get(id(o), o) for o in self.road.objects]
+        self.road.distant_vehicles = [clones.get(id(v), v) for v in self.road.distant_vehicles]
+        self.road.lod_focus = [clones.get(id(v), v) for v in self.road.lod_focus]
+        for key in self.SNAPSHOT_ATTRIBUTES:
+            value = getattr(self, key)
+            if isinstance(value, list):
+                setattr(self, key, [clones.get(id(item), item) for item in value])
+            elif isinstance(value, RoadObject):
+                setattr(self, key, clones.get(id(value), value))
+        return [clones.get(id(entity), entity) for entity in entities]
+
+    def _materialize(self) -> None:
+        """Clone all the road objects that this variant still shares, so that it can be simulated independently."""
+        if not self._owners:
+            return
+        self.own(self.road.vehicles + self.road.objects)
+        for owner in self._owners:
+            owner._variants.discard(self)
+        self._owners = []
+        self._owned = set()
+        self.perception.clear()
+
+    def _before_mutation(self) -> None:
+        """Stop sharing road objects with copy-on-write variants, before they are modified in place."""
+        for variant in list(self._variants):
+            variant._materialize()
+        self._materialize()
+
+    def _replace_vehicles(self, replace: Callable[[Vehicle], Optional[Vehicle]]) -> None:
+        """
+        Replace some vehicles of a copy-on-write variant.
+
+        :param replace: a function returning the replacement of a vehicle, or None to keep it
+        """
+        replacements = {}
+        for v in self.road.vehicles:
+            new_vehicle = replace(v)
+            if new_vehicle is not None and new_vehicle is not v:
+                if isinstance(new_vehicle, RoadObject):
+                    new_vehicle = clone_object(new_vehicle, self.road)
+                    self._owned.add(id(new_vehicle))
+                replacements[id(v)] = new_vehicle
+        self.road.vehicles = [replacements.get(id(v), v) for v in self.road.vehicles]
+        self.road.distant_vehicles = [replacements.get(id(v), v) for v in self.road.distant_vehicles]
+
     def simplify(self) -> 'AbstractEnv':
         """
         Return a simplified copy of the environment where distant vehicles have been removed from the road.
@@ -332,7 +671,7 @@ class AbstractEnv(gym.Env):
 
         :return: a simplified environment state
         """
-        state_copy = copy.deepcopy(self)
+        state_copy = self.variant()
         state_copy.road.vehicles = [state_copy.vehicle] + state_copy.road.close_vehicles_to(
             state_copy.vehicle, self.PERCEPTION_DISTANCE)
 
@@ -348,51 +687,44 @@ class AbstractEnv(gym.Env):
         """
         vehicle_class = utils.class_from_path(vehicle_class_path)
 
-        env_copy = copy.deepcopy(self)
-        vehicles = env_copy.road.vehicles
-        for i, v in enumerate(vehicles):
-            if v is not env_copy.vehicle:
-                vehicles[i] = vehicle_class.create_from(v)
+        env_copy = self.variant()
+        env_copy._replace_vehicles(lambda v: vehicle_class.create_from(v) if v is not env_copy.vehicle else None)
         return env_copy
 
     def set_preferred_lane(self, preferred_lane: int = None) -> 'AbstractEnv':
-        env_copy = copy.deepcopy(self)
+        env_copy = self.variant()
         if preferred_lane:
-            for v in env_copy.road.vehicles:
-                if isinstance(v, IDMVehicle):
-                    v.route = [(lane[0], lane[1], preferred_lane) for lane in v.route]
-                    # Vehicle with lane preference are also less cautious
-                    v.LANE_CHANGE_MAX_BRAKING_IMPOSED = 1000
+            for v in env_copy.own(v for v in env_copy.road.vehicles if isinstance(v, IDMVehicle)):
+                v.route = [(lane[0], lane[1], preferred_lane) for lane in v.route]
+                # Vehicle with lane preference are also less cautious
+                v.LANE_CHANGE_MAX_BRAKING_IMPOSED = 1000
         return env_copy
 
     def set_route_at_intersection(self, _to: str) -> 'AbstractEnv':
-        env_copy = copy.deepcopy(self)
-        for v in env_copy.road.vehicles:
-            if isinstance(v, IDMVehicle):
-                v.set_route_at_intersection(_to)
+        env_copy = self.variant()
+        for v in env_copy.own(v for v in env_copy.road.vehicles if isinstance(v, IDMVehicle)):
+            v.set_route_at_intersection(_to)
         return env_copy
 
     def set_vehicle_field(self, args: Tuple[str, object]) -> 'AbstractEnv':
         field, value = args
-        env_copy = copy.deepcopy(self)
-        for v in env_copy.road.vehicles:
-            if v is not self.vehicle:
-                setattr(v, field, value)
+        env_copy = self.variant()
+        controlled = [id(v) for v in env_copy.controlled_vehicles]
+        for v in env_copy.own(v for v in env_copy.road.vehicles if id(v) not in controlled):
+            setattr(v, field, value)
         return env_copy
 
     def call_vehicle_method(self, args: Tuple[str, Tuple[object]]) -> 'AbstractEnv':
         method, method_args = args
-        env_copy = copy.deepcopy(self)
-        for i, v in enumerate(env_copy.road.vehicles):
-            if hasattr(v, method):
-                env_copy.road.vehicles[i] = getattr(v, method)(*method_args)
+        env_copy = self.variant()
+        env_copy.own(v for v in env_copy.road.vehicles if hasattr(v, method))
+        env_copy._replace_vehicles(lambda v: getattr(v, method)(*method_args) if hasattr(v, method) else None)
         return env_copy
 
     def randomize_behavior(self) -> 'AbstractEnv':
-        env_copy = copy.deepcopy(self)
-        for v in env_copy.road.vehicles:
-            if isinstance(v, IDMVehicle):
-                v.randomize_behavior()
+        env_copy = self.variant()
+        for v in env_copy.own(v for v in env_copy.road.vehicles if isinstance(v, IDMVehicle)):
+            v.randomize_behavior()
         return env_copy
 
     def to_finite_mdp(self):
@@ -404,7 +736,14 @@ class AbstractEnv(gym.Env):
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
-            if k not in ['viewer', '_record_video_wrapper']:
+            if k == 'perception':
+                setattr(result, k, PerceptionCache(result))
+            elif k == '_variants':
+                setattr(result, k, weakref.WeakSet())
+            elif k in ['_owners', '_owned']:
+                setattr(result, k, type(v)())
+            elif k not in ['viewer', '_record_video_wrapper', 'scene_pool', 'scenario_store', 'profiler',
+                           'trace_recorder']:
                 setattr(result, k, copy.deepcopy(v, memo))
             else:
                 setattr(result, k, None)
@@ -1,25 +1,122 @@
 from collections import OrderedDict
 from itertools import product
-from typing import List, Dict, TYPE_CHECKING, Optional, Union, Tuple
+from typing import Any, Callable, List, Dict, TYPE_CHECKING, Optional, Sequence, Union, Tuple
 from gymnasium import spaces
 import numpy as np
-import pandas as pd
 
 from highway_env import utils
 from highway_env.envs.common.finite_mdp import compute_ttc_grid
-from highway_env.envs.common.graphics import EnvViewer
 from highway_env.road.lane import AbstractLane
 from highway_env.utils import distance_to_circle, Vector
 from highway_env.vehicle.controller import MDPVehicle
 from highway_env.vehicle.kinematics import Vehicle
+from highway_env.vehicle.objects import RoadObject
 
 if TYPE_CHECKING:
+    import pandas as pd
     from highway_env.envs.common.abstract import AbstractEnv
 
+FeatureExtractor = Callable[[Sequence[RoadObject], Dict[str, Any]], np.ndarray]
+
+FEATURE_EXTRACTORS: Dict[str, FeatureExtractor] = {}
+"""The registered extractors of kinematic features, by feature name."""
+
+
+def register_feature(name: str) -> Callable[[FeatureExtractor], FeatureExtractor]:
+    """
+    Register an extractor of a kinematic feature, which can then be listed in the features of a
+    :py:class:`KinematicObservation`.
+
+    An extractor computes the feature of a sequence of road objects at once, and returns an array of shape (N,).
+    It is also given a context dict, containing the environment (``"env"``) and whether the intentions of vehicles
+    are observed (``"observe_intentions"``), in which intermediate quantities can be memoized and shared between
+    the features of the same objects.
+
+    :param name: the feature name
+    :return: a decorator registering an extractor under that name
+    """
+    def decorator(extractor: FeatureExtractor) -> FeatureExtractor:
+        FEATURE_EXTRACTORS[name] = extractor
+        return extractor
+    return decorator
+
+
+def memoize(context: Dict[str, Any], key: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+    """Get a quantity shared by several features from the extraction context, or compute it."""
+    if key not in context:
+        context[key] = compute()
+    return context[key]
+
+
+def _is_vehicle(objects: Sequence[RoadObject], context: Dict[str, Any]) -> np.ndarray:
+    return memoize(context, "is_vehicle", lambda: np.array([isinstance(o, Vehicle) for o in objects], dtype=bool))
+
+
+def _vehicles_quantity(objects: Sequence[RoadObject], context: Dict[str, Any], key: str,
+                       compute: Callable[[Vehicle], np.ndarray], size: int, default: float) -> np.ndarray:
+    """A quantity only defined for vehicles, with a default value for other objects."""
+    def compute_all() -> np.ndarray:
+        values = np.full((len(objects), size), default, dtype=float)
+        for i in np.flatnonzero(_is_vehicle(objects, context)):
+            values[i] = compute(objects[i])
+        return values
+    return memoize(context, key, compute_all)
+
+
+def _positions(objects: Sequence[RoadObject], context: Dict[str, Any]) -> np.ndarray:
+    return memoize(context, "positions", lambda: np.array([o.position for o in objects], dtype=float).reshape(-1, 2))
+
+
+def _headings(objects: Sequence[RoadObject], context: Dict[str, Any]) -> np.ndarray:
+    return memoize(context, "headings", lambda: np.array([o.heading for o in objects], dtype=float))
+
+
+def _velocities(objects: Sequence[RoadObject], context: Dict[str, Any]) -> np.ndarray:
+    return _vehicles_quantity(objects, context, "velocities", lambda v: v.velocity, 2, 0.)
+
+
+def _destination_directions(objects: Sequence[RoadObject], context: Dict[str, Any]) -> np.ndarray:
+    if not context["observe_intentions"]:
+        return np.zeros((len(objects), 2))
+    return _vehicles_quantity(objects, context, "destination_directions", lambda v: v.destination_direction, 2, 0.)
+
+
+def _lane_offsets(objects: Sequence[RoadObject], context: Dict[str, Any]) -> np.ndarray:
+    return _vehicles_quantity(objects, context, "lane_offsets", context["env"].perception.lane_offset, 3, np.nan)
+
+
+register_feature("presence")(lambda objects, context: np.ones(len(objects)))
+register_feature("x")(lambda objects, context: _positions(objects, context)[:, 0])
+register_feature("y")(lambda objects, context: _positions(objects, context)[:, 1])
+register_feature("vx")(lambda objects, context: _velocities(objects, context)[:, 0])
+register_feature("vy")(lambda objects, context: _velocities(objects, context)[:, 1])
+register_feature("heading")(lambda objects, context: np.where(_is_vehicle(objects, context),
+                                                               _headings(objects, context), np.nan))
+register_feature("cos_h")(lambda objects, context: np.cos(_headings(objects, context)))
+register_feature("sin_h")(lambda objects, context: np.sin(_headings(objects, context)))
+register_feature("cos_d")(lambda objects, context: _destination_directions(objects, context)[:, 0])
+register_feature("sin_d")(lambda objects, context: _destination_directions(objects, context)[:, 1])
+register_feature("long_off")(lambda objects, context: _lane_offsets(objects, context)[:, 0])
+register_feature("lat_off")(lambda objects, context: _lane_offsets(objects, context)[:, 1])
+register_feature("ang_off")(lambda objects, context: _lane_offsets(objects, context)[:, 2])
+
 
 class ObservationType(object):
-    def __init__(self, env: 'AbstractEnv', **kwargs) -> None:
+
+    COMPACT_DTYPES: Dict[str, type] = {"int8": np.int8, "uint8": np.uint8, "float16": np.float16}
+    """Compact representations of observations: fixed-point integers, or half-precision floats."""
+
+    def __init__(self, env: 'AbstractEnv', compact: Optional[str] = None, **kwargs) -> None:
+        """
+        :param env: The environment to observe
+        :param compact: Emit observations in a compact representation, among int8, uint8 and float16. The fixed-point
+                        representations quantize normalized values in [-1, 1], see :py:meth:`dequantize`.
+        """
+        if compact is not None and compact not in self.COMPACT_DTYPES:
+            raise ValueError("Unknown compact observation representation {}, expected one of {}"
+                             .format(compact, list(self.COMPACT_DTYPES)))
         self.env = env
+        self.compact = compact
         self.__observer_vehicle = None
 
     def space(self) -> spaces.Space:
@@ -30,6 +127,86 @@ class ObservationType(object):
         """Get an observation of the environment state."""
         raise NotImplementedError()
 
+    @property
+    def quantization_scale(self) -> float:
+        """The scale of a quantized observation: ``value = quantization_scale * q + quantization_offset``."""
+        return {"int8": 1 / 127, "uint8": 2 / 255}.get(self.compact, 1.)
+
+    @property
+    def quantization_offset(self) -> float:
+        """The offset of a quantized observation: ``value = quantization_scale * q + quantization_offset``."""
+        return -1. if self.compact == "uint8" else 0.
+
+    def box_space(self, shape: Tuple[int, ...], low: float = -np.inf, high: float = np.inf) -> spaces.Box:
+        """
+        A box observation space, in the compact representation if enabled.
+
+        :param shape: the shape of observations
+        :param low: the lower bound of observations values, before quantization
+        :param high: the upper bound of observations values, before quantization
+        :return: the observation space
+        """
+        if self.compact in ["int8", "uint8"]:
+            low, high = [np.rint((np.clip(bound, -1, 1) - self.quantization_offset) / self.quantization_scale)
+                         for bound in [low, high]]
+        dtype = self.COMPACT_DTYPES.get(self.compact, np.float32)
+        return spaces.Box(shape=shape, low=low, high=high, dtype=dtype)
+
+    def quantize(self, obs: np.ndarray) -> np.ndarray:
+        """
+        Convert an observation to the representation of the observation space.
+
+        Fixed-point representations saturate values outside of [-1, 1].
+
+        :param obs: the observation, with normalized values
+        :return: the observation in the compact representation if enabled, else as float32
+        """
+        if self.compact in ["int8", "uint8"]:
+            obs = np.rint((np.clip(np.nan_to_num(obs), -1, 1) - self.quantization_offset) / self.quantization_scale)
+        return obs.astype(self.COMPACT_DTYPES.get(self.compact, np.float32))
+
+    def dequantize(self, obs: np.ndarray) -> np.ndarray:
+        """
+        Recover the normalized values of a compact observation.
+
+        :param obs: an observation in the compact representation
+        :return: the observation values, as float32
+        """
+        return (np.asarray(obs, dtype=np.float32) * np.float32(self.quantization_scale)
+                + np.float32(self.quantization_offset))
+
+    def check_compact_range(self, normalized: bool) -> None:
+        """
+        Check that fixed-point representations are only used for normalized observations.
+
+        :param normalized: whether observations values are normalized in [-1, 1]
+        """
+        if self.compact in ["int8", "uint8"] and not normalized:
+            raise ValueError("The {} observation representation requires normalized and clipped observations"
+                             .format(self.compact))
+
+    def dict_entry_space(self, shape: Tuple[int, ...]) -> spaces.Box:
+        """
+        The space of an entry of a dict observation: float64 values, unless a compact representation is enabled.
+
+        :param shape: the shape of the entry
+        :return: the space of the entry
+        """
+        if self.compact:
+            return self.box_space(shape)
+        return spaces.Box(-np.inf, np.inf, shape=shape, dtype=np.float64)
+
+    def quantize_dict(self, obs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Convert the entries of a dict observation to the compact representation, if enabled.
+
+        :param obs: the dict observation
+        :return: the dict observation, in the representation of :py:meth:`dict_entry_space`
+        """
+        if not self.compact:
+            return obs
+        return OrderedDict((key, self.quantize(np.asarray(value))) for key, value in obs.items())
+
     @property
     def observer_vehicle(self):
         """
@@ -69,7 +246,9 @@ class GrayscaleObservation(ObservationType):
                  scaling: Optional[float] = None,
                  centering_position: Optional[List[float]] = None,
                  **kwargs) -> None:
-        super().__init__(env)
+        super().__init__(env, **kwargs)
+        if self.compact:
+            raise ValueError("Grayscale observations are already compact uint8 images")
         self.observation_shape = observation_shape
         self.shape = (stack_size, ) + self.observation_shape
         self.weights = weights
@@ -84,7 +263,12 @@ class GrayscaleObservation(ObservationType):
             "scaling": scaling or viewer_config["scaling"],
             "centering_position": centering_position or viewer_config["centering_position"]
         })
-        self.viewer = EnvViewer(env, config=viewer_config)
+        if viewer_config["rendering_backend"] == "numpy":
+            from highway_env.envs.common.rasterizer import NumpyViewer
+            self.viewer = NumpyViewer(env, config=viewer_config)
+        else:
+            from highway_env.envs.common.graphics import EnvViewer  # Imports pygame, only for image observations
+            self.viewer = EnvViewer(env, config=viewer_config)
 
     def space(self) -> spaces.Space:
         return spaces.Box(shape=self.shape, low=0, high=255, dtype=np.uint8)
@@ -105,18 +289,18 @@ class GrayscaleObservation(ObservationType):
 
 class TimeToCollisionObservation(ObservationType):
     def __init__(self, env: 'AbstractEnv', horizon: int = 10, **kwargs: dict) -> None:
-        super().__init__(env)
+        super().__init__(env, **kwargs)
         self.horizon = horizon
 
     def space(self) -> spaces.Space:
         try:
-            return spaces.Box(shape=self.observe().shape, low=0, high=1, dtype=np.float32)
+            return self.box_space(self.observe().shape, low=0, high=1)
         except AttributeError:
             return spaces.Space()
 
     def observe(self) -> np.ndarray:
         if not self.env.road:
-            return np.zeros((3, 3, int(self.horizon * self.env.config["policy_frequency"])))
+            return self.quantize(np.zeros((3, 3, int(self.horizon * self.env.config["policy_frequency"]))))
         grid = compute_ttc_grid(self.env, vehicle=self.observer_vehicle,
                                 time_quantization=1/self.env.config["policy_frequency"], horizon=self.horizon)
         padding = np.ones(np.shape(grid))
@@ -132,7 +316,7 @@ class TimeToCollisionObservation(ObservationType):
         v0 = grid.shape[0] + self.observer_vehicle.speed_index - obs_speeds // 2
         vf = grid.shape[0] + self.observer_vehicle.speed_index + obs_speeds // 2
         clamped_grid = padded_grid[v0:vf + 1, :, :]
-        return clamped_grid.astype(np.float32)
+        return self.quantize(clamped_grid)
 
 
 class KinematicObservation(ObservationType):
@@ -165,8 +349,14 @@ class KinematicObservation(ObservationType):
         :param see_behind: Should the observation contains the vehicles behind
         :param observe_intentions: Observe the destinations of other vehicles
         """
-        super().__init__(env)
+        super().__init__(env, **kwargs)
         self.features = features or self.FEATURES
+        unknown_features = [feature for feature in self.features if feature not in FEATURE_EXTRACTORS]
+        if unknown_features:
+            raise ValueError("Unknown kinematic features {}, see register_feature()".format(unknown_features))
+        self.extractors = [FEATURE_EXTRACTORS[feature] for feature in self.features]
+        self.relative_features = [column for column, feature in enumerate(self.features)
+                                  if feature in ['x', 'y', 'vx', 'vy']]
         self.vehicles_count = vehicles_count
         self.features_range = features_range
         self.absolute = absolute
@@ -176,25 +366,34 @@ class KinematicObservation(ObservationType):
         self.see_behind = see_behind
         self.observe_intentions = observe_intentions
         self.include_obstacles = include_obstacles
+        self.check_compact_range(self.normalize and self.clip)
 
     def space(self) -> spaces.Space:
-        return spaces.Box(shape=(self.vehicles_count, len(self.features)), low=-np.inf, high=np.inf, dtype=np.float32)
+        return self.box_space((self.vehicles_count, len(self.features)))
 
-    def normalize_obs(self, df: pd.DataFrame) -> pd.DataFrame:
+    def default_features_range(self) -> None:
         """
-        Normalize the observation values.
+        Set the default range of features values, if none was configured.
 
         For now, assume that the road is straight along the x axis.
-        :param Dataframe df: observation data
         """
         if not self.features_range:
-            side_lanes = self.env.road.network.all_side_lanes(self.observer_vehicle.lane_index)
+            side_lanes = self.env.perception.side_lanes(self.observer_vehicle.lane_index)
             self.features_range = {
                 "x": [-5.0 * Vehicle.MAX_SPEED, 5.0 * Vehicle.MAX_SPEED],
                 "y": [-AbstractLane.DEFAULT_WIDTH * len(side_lanes), AbstractLane.DEFAULT_WIDTH * len(side_lanes)],
                 "vx": [-2*Vehicle.MAX_SPEED, 2*Vehicle.MAX_SPEED],
                 "vy": [-2*Vehicle.MAX_SPEED, 2*Vehicle.MAX_SPEED]
             }
+
+    def normalize_obs(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
+        """
+        Normalize the observation values.
+
+        For now, assume that the road is straight along the x axis.
+        :param Dataframe df: observation data
+        """
+        self.default_features_range()
         for feature, f_range in self.features_range.items():
             if feature in df:
                 df[feature] = utils.lmap(df[feature], [f_range[0], f_range[1]], [-1, 1])
@@ -202,42 +401,64 @@ class KinematicObservation(ObservationType):
                     df[feature] = np.clip(df[feature], -1, 1)
         return df
 
+    def extract_features(self, objects: Sequence[RoadObject], observe_intentions: bool = True) -> np.ndarray:
+        """
+        Compute the configured features of road objects, and only these.
+
+        :param objects: the observed road objects
+        :param observe_intentions: observe the destinations of vehicles
+        :return: the array of features values, of shape (len(objects), len(features))
+        """
+        context = {"env": self.env, "observe_intentions": observe_intentions}
+        rows = np.empty((len(objects), len(self.features)))
+        for column, extractor in enumerate(self.extractors):
+            rows[:, column] = extractor(objects, context)
+        return rows
+
+    def normalize_rows(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Normalize the observation values, in place.
+
+        :param rows: observation data, with one column per observed feature
+        :return: the normalized observation data
+        """
+        self.default_features_range()
+        for feature, f_range in self.features_range.items():
+            if feature in self.features:
+                column = self.features.index(feature)
+                rows[:, column] = utils.lmap(rows[:, column], [f_range[0], f_range[1]], [-1, 1])
+                if self.clip:
+                    rows[:, column] = np.clip(rows[:, column], -1, 1)
+        return rows
+
     def observe(self) -> np.ndarray:
         if not self.env.road:
-            return np.zeros(self.space().shape)
+            return self.quantize(np.zeros(self.space().shape))
 
         # Add ego-vehicle
-        df = pd.DataFrame.from_records([self.observer_vehicle.to_dict()])
+        ego = self.extract_features([self.observer_vehicle])
         # Add nearby traffic
-        close_vehicles = self.env.road.close_objects_to(self.observer_vehicle,
-                                                        self.env.PERCEPTION_DISTANCE,
-                                                        count=self.vehicles_count - 1,
-                                                        see_behind=self.see_behind,
-                                                        sort=self.order == "sorted",
-                                                        vehicles_only=not self.include_obstacles)
-        if close_vehicles:
-            origin = self.observer_vehicle if not self.absolute else None
-            vehicles_df = pd.DataFrame.from_records(
-                [v.to_dict(origin, observe_intentions=self.observe_intentions)
-                 for v in close_vehicles[-self.vehicles_count + 1:]])
-            df = pd.concat([df, vehicles_df], ignore_index=True)
-
-        df = df[self.features]
+        close_vehicles = self.env.perception.close_objects_to(self.observer_vehicle,
+                                                              self.env.PERCEPTION_DISTANCE,
+                                                              count=self.vehicles_count - 1,
+                                                              see_behind=self.see_behind,
+                                                              sort=self.order == "sorted",
+                                                              vehicles_only=not self.include_obstacles)
+        rows = self.extract_features(close_vehicles[-self.vehicles_count + 1:], self.observe_intentions)
+        if not self.absolute:
+            rows[:, self.relative_features] -= ego[:, self.relative_features]
+        rows = np.vstack([ego, rows])
 
         # Normalize and clip
         if self.normalize:
-            df = self.normalize_obs(df)
+            rows = self.normalize_rows(rows)
         # Fill missing rows
-        if df.shape[0] < self.vehicles_count:
-            rows = np.zeros((self.vehicles_count - df.shape[0], len(self.features)))
-            df = pd.concat([df, pd.DataFrame(data=rows, columns=self.features)], ignore_index=True)
-        # Reorder
-        df = df[self.features]
-        obs = df.values.copy()
+        obs = np.zeros((self.vehicles_count, len(self.features)))
+        obs[:min(rows.shape[0], self.vehicles_count)] = rows[:self.vehicles_count]
         if self.order == "shuffled":
             self.env.np_random.shuffle(obs[1:])
         # Flatten
-        return obs.astype(self.space().dtype)
+        return self.quantize(obs)
 
 
 class OccupancyGridObservation(ObservationType):
@@ -269,27 +490,31 @@ class OccupancyGridObservation(ObservationType):
         :param align_to_vehicle_axes: if True, the grid axes are aligned with vehicle axes. Else, they are aligned
                with world axes.
         :param clip: clip the observation in [-1, 1]
+        :param as_image: encode the observation as an image of uint8 pixels
         """
-        super().__init__(env)
+        super().__init__(env, **kwargs)
         self.features = features if features is not None else self.FEATURES
         self.grid_size = np.array(grid_size) if grid_size is not None else np.array(self.GRID_SIZE)
         self.grid_step = np.array(grid_step) if grid_step is not None else np.array(self.GRID_STEP)
         grid_shape = np.asarray(np.floor((self.grid_size[:, 1] - self.grid_size[:, 0]) / self.grid_step),
                                 dtype=np.uint8)
-        self.grid = np.zeros((len(self.features), *grid_shape))
+        self.grid = np.zeros((len(self.features), *grid_shape), dtype=np.float32)
         self.features_range = features_range
         self.absolute = absolute
         self.align_to_vehicle_axes = align_to_vehicle_axes
         self.clip = clip
         self.as_image = as_image
+        if self.as_image and self.compact:
+            raise ValueError("The image encoding of the occupancy grid is already compact")
+        self.check_compact_range(self.clip)
 
     def space(self) -> spaces.Space:
         if self.as_image:
             return spaces.Box(shape=self.grid.shape, low=0, high=255, dtype=np.uint8)
         else:
-            return spaces.Box(shape=self.grid.shape, low=-np.inf, high=np.inf, dtype=np.float32)
+            return self.box_space(self.grid.shape)
 
-    def normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+    def normalize(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
         """
         Normalize the observation values.
 
@@ -308,7 +533,7 @@ class OccupancyGridObservation(ObservationType):
 
     def observe(self) -> np.ndarray:
         if not self.env.road:
-            return np.zeros(self.space().shape)
+            return self.quantize(np.zeros(self.space().shape))
 
         if self.absolute:
             raise NotImplementedError()
@@ -317,6 +542,7 @@ class OccupancyGridObservation(ObservationType):
             self.grid.fill(np.nan)
 
             # Get nearby traffic data
+            import pandas as pd  # Imported on first use, as it is slow to import
             df = pd.DataFrame.from_records(
                 [v.to_dict(self.observer_vehicle) for v in self.env.road.vehicles])
             # Normalize
@@ -345,9 +571,9 @@ class OccupancyGridObservation(ObservationType):
             if self.as_image:
                 obs = ((np.clip(obs, -1, 1) + 1) / 2 * 255).astype(np.uint8)
 
-            obs = np.nan_to_num(obs).astype(self.space().dtype)
-
-            return obs
+            if self.as_image:
+                return np.nan_to_num(obs).astype(self.space().dtype)
+            return self.quantize(np.nan_to_num(obs))
 
     def pos_to_index(self, position: Vector, relative: bool = False) -> Tuple[int, int]:
         """
@@ -425,64 +651,75 @@ class KinematicsGoalObservation(KinematicObservation):
     def __init__(self, env: 'AbstractEnv', scales: List[float], **kwargs: dict) -> None:
         self.scales = np.array(scales)
         super().__init__(env, **kwargs)
+        self.check_compact_range(False)  # Scaled, but neither normalized nor clipped
 
     def space(self) -> spaces.Space:
         try:
             obs = self.observe()
             return spaces.Dict(dict(
-                desired_goal=spaces.Box(-np.inf, np.inf, shape=obs["desired_goal"].shape, dtype=np.float64),
-                achieved_goal=spaces.Box(-np.inf, np.inf, shape=obs["achieved_goal"].shape, dtype=np.float64),
-                observation=spaces.Box(-np.inf, np.inf, shape=obs["observation"].shape, dtype=np.float64),
+                desired_goal=self.dict_entry_space(obs["desired_goal"].shape),
+                achieved_goal=self.dict_entry_space(obs["achieved_goal"].shape),
+                observation=self.dict_entry_space(obs["observation"].shape),
             ))
         except AttributeError:
             return spaces.Space()
 
     def observe(self) -> Dict[str, np.ndarray]:
         if not self.observer_vehicle:
-            return OrderedDict([
+            return self.quantize_dict(OrderedDict([
                 ("observation", np.zeros((len(self.features),))),
                 ("achieved_goal", np.zeros((len(self.features),))),
                 ("desired_goal", np.zeros((len(self.features),)))
-            ])
+            ]))
 
-        obs = np.ravel(pd.DataFrame.from_records([self.observer_vehicle.to_dict()])[self.features])
-        goal = np.ravel(pd.DataFrame.from_records([self.env.goal.to_dict()])[self.features])
+        obs = self.extract_features([self.observer_vehicle])[0]
+        goal = self.extract_features([self.env.goal])[0]
         obs = OrderedDict([
             ("observation", obs / self.scales),
             ("achieved_goal", obs / self.scales),
             ("desired_goal", goal / self.scales)
          ])
-        return obs
+        return self.quantize_dict(obs)
 
 
 class AttributesObservation(ObservationType):
     def __init__(self, env: 'AbstractEnv', attributes: List[str], **kwargs: dict) -> None:
-        self.env = env
+        super().__init__(env, **kwargs)
         self.attributes = attributes
+        self.check_compact_range(False)  # Attributes of the environment, in their own units
 
     def space(self) -> spaces.Space:
         try:
             obs = self.observe()
             return spaces.Dict({
-                attribute: spaces.Box(-np.inf, np.inf, shape=obs[attribute].shape, dtype=np.float64)
+                attribute: self.dict_entry_space(obs[attribute].shape)
                 for attribute in self.attributes
             })
         except AttributeError:
             return spaces.Space()
 
     def observe(self) -> Dict[str, np.ndarray]:
-        return OrderedDict([
+        return self.quantize_dict(OrderedDict([
             (attribute, getattr(self.env, attribute)) for attribute in self.attributes
-        ])
+        ]))
 
 
 class MultiAgentObservation(ObservationType):
     def __init__(self,
                  env: 'AbstractEnv',
                  observation_config: dict,
+                 batched: bool = True,
                  **kwargs) -> None:
-        super().__init__(env)
+        """
+        :param env: The environment to observe
+        :param observation_config: The observation configuration of each agent
+        :param batched: Observe the kinematics of all agents in a single vectorized pass, rather than agent per agent
+        """
+        super().__init__(env, **kwargs)
+        if self.compact:
+            raise ValueError("The compact representation of multi-agent observations is set in observation_config")
         self.observation_config = observation_config
+        self.batched = batched
         self.agents_observation_types = []
         for vehicle in self.env.controlled_vehicles:
             obs_type = observation_factory(self.env, self.observation_config)
@@ -493,15 +730,86 @@ class MultiAgentObservation(ObservationType):
         return spaces.Tuple([obs_type.space() for obs_type in self.agents_observation_types])
 
     def observe(self) -> tuple:
+        if self.batched and self.env.road and len(self.agents_observation_types) > 1 \
+                and all(type(obs_type) is KinematicObservation for obs_type in self.agents_observation_types):
+            return self.observe_kinematics_batch()
         return tuple(obs_type.observe() for obs_type in self.agents_observation_types)
 
+    def observe_kinematics_batch(self) -> tuple:
+        """
+        Observe the kinematics of nearby vehicles for all agents at once.
+
+        The features of every object on the road are extracted once, and the (agents x objects x features) relative
+        features are obtained by broadcasting. The nearest objects of each agent are then selected with a partial
+        sort, which yields the same observations as :py:meth:`KinematicObservation.observe` for every agent.
+
+        :return: the tuple of agents observations
+        """
+        obs_types = self.agents_observation_types
+        config = obs_types[0]
+        road = self.env.road
+        observers = [obs_type.observer_vehicle for obs_type in obs_types]
+        objects = road.vehicles + (road.objects if config.include_obstacles else [])
+        is_vehicle = np.arange(len(objects)) < len(road.vehicles)
+        count = config.vehicles_count - 1
+
+        # Features of the observers and of every object, extracted once
+        egos = config.extract_features(observers)
+        features = config.extract_features(objects, config.observe_intentions)
+
+        # Objects perceived by each agent, and their distances along the agent lane
+        positions = np.array([o.position for o in objects]).reshape(-1, 2)
+        origins = np.array([observer.position for observer in observers])
+        distances = np.linalg.norm(positions[np.newaxis, :, :] - origins[:, np.newaxis, :], axis=-1)
+        perceived = distances < self.env.PERCEPTION_DISTANCE
+        perceived &= np.array([[o is not observer for o in objects] for observer in observers]).reshape(
+            perceived.shape)
+        lane_distances = np.full(perceived.shape, np.inf)
+        for a, observer in enumerate(observers):
+            s_origin = observer.lane.local_coordinates(observer.position)[0]
+            for j in np.flatnonzero(perceived[a]):
+                lane_distances[a, j] = observer.lane.local_coordinates(objects[j].position)[0] - s_origin
+        ahead = -2 * np.array([[observer.LENGTH] for observer in observers]) < lane_distances
+        perceived &= ahead if not config.see_behind else is_vehicle | ahead
+
+        # Relative features of all objects with respect to each agent: (agents x objects x features)
+        relative = np.broadcast_to(features, (len(observers),) + features.shape)
+        if not config.absolute:
+            offsets = np.zeros_like(egos)
+            offsets[:, config.relative_features] = egos[:, config.relative_features]
+            relative = relative - offsets[:, np.newaxis, :]
+
+        observations = []
+        for a, obs_type in enumerate(obs_types):
+            candidates = np.flatnonzero(perceived[a])
+            if config.order == "sorted":
+                keys = np.abs(lane_distances[a, candidates])
+                if 0 < count < candidates.size:
+                    # Keep ties with the farthest selected object, so that the stable sort order is preserved
+                    nearest = keys <= np.partition(keys, count - 1)[count - 1]
+                    candidates, keys = candidates[nearest], keys[nearest]
+                candidates = candidates[np.lexsort((candidates, keys))]
+            if count:
+                candidates = candidates[:count]
+            rows = np.vstack([egos[a:a + 1], relative[a, candidates]])
+            if obs_type.normalize:
+                rows = obs_type.normalize_rows(rows)
+            obs = np.zeros((obs_type.vehicles_count, len(obs_type.features)))
+            obs[:rows.shape[0]] = rows
+            if obs_type.order == "shuffled":
+                self.env.np_random.shuffle(obs[1:])
+            observations.append(obs_type.quantize(obs))
+        return tuple(observations)
+
 
 class TupleObservation(ObservationType):
     def __init__(self,
                  env: 'AbstractEnv',
                  observation_configs: List[dict],
                  **kwargs) -> None:
-        super().__init__(env)
+        super().__init__(env, **kwargs)
+        if self.compact:
+            raise ValueError("The compact representations of tuple observations are set in observation_configs")
         self.observation_types = [observation_factory(self.env, obs_config) for obs_config in observation_configs]
 
     def space(self) -> spaces.Space:
@@ -517,39 +825,35 @@ class ExitObservation(KinematicObservation):
 
     def observe(self) -> np.ndarray:
         if not self.env.road:
-            return np.zeros(self.space().shape)
+            return self.quantize(np.zeros(self.space().shape))
 
         # Add ego-vehicle
-        ego_dict = self.observer_vehicle.to_dict()
-        exit_lane = self.env.road.network.get_lane(("1", "2", -1))
-        ego_dict["x"] = exit_lane.local_coordinates(self.observer_vehicle.position)[0]
-        df = pd.DataFrame.from_records([ego_dict])[self.features]
-
+        ego = self.extract_features([self.observer_vehicle])
         # Add nearby traffic
-        close_vehicles = self.env.road.close_vehicles_to(self.observer_vehicle,
-                                                         self.env.PERCEPTION_DISTANCE,
-                                                         count=self.vehicles_count - 1,
-                                                         see_behind=self.see_behind)
-        if close_vehicles:
-            origin = self.observer_vehicle if not self.absolute else None
-            df = pd.concat([df, pd.DataFrame.from_records(
-                [v.to_dict(origin, observe_intentions=self.observe_intentions)
-                 for v in close_vehicles[-self.vehicles_count + 1:]])[self.features]],
-                           ignore_index=True)
+        close_vehicles = self.env.perception.close_objects_to(self.observer_vehicle,
+                                                              self.env.PERCEPTION_DISTANCE,
+                                                              count=self.vehicles_count - 1,
+                                                              see_behind=self.see_behind,
+                                                              vehicles_only=True)
+        rows = self.extract_features(close_vehicles[-self.vehicles_count + 1:], self.observe_intentions)
+        if not self.absolute:
+            rows[:, self.relative_features] -= ego[:, self.relative_features]
+        # The ego-vehicle longitudinal position is measured along the exit lane
+        if "x" in self.features:
+            exit_lane = self.env.road.network.get_lane(("1", "2", -1))
+            ego[0, self.features.index("x")] = exit_lane.local_coordinates(self.observer_vehicle.position)[0]
+        rows = np.vstack([ego, rows])
+
         # Normalize and clip
         if self.normalize:
-            df = self.normalize_obs(df)
+            rows = self.normalize_rows(rows)
         # Fill missing rows
-        if df.shape[0] < self.vehicles_count:
-            rows = np.zeros((self.vehicles_count - df.shape[0], len(self.features)))
-            df = pd.concat([df, pd.DataFrame(data=rows, columns=self.features)], ignore_index=True)
-        # Reorder
-        df = df[self.features]
-        obs = df.values.copy()
+        obs = np.zeros((self.vehicles_count, len(self.features)))
+        obs[:min(rows.shape[0], self.vehicles_count)] = rows[:self.vehicles_count]
         if self.order == "shuffled":
             self.env.np_random.shuffle(obs[1:])
         # Flatten
-        return obs
+        return self.quantize(obs)
 
 
 class LidarObservation(ObservationType):
@@ -568,16 +872,17 @@ class LidarObservation(ObservationType):
         self.angle = 2 * np.pi / self.cells
         self.grid = np.ones((self.cells, 1)) * float('inf')
         self.origin = None
+        self.check_compact_range(self.normalize)
 
     def space(self) -> spaces.Space:
         high = 1 if self.normalize else self.maximum_range
-        return spaces.Box(shape=(self.cells, 2), low=-high, high=high, dtype=np.float32)
+        return self.box_space((self.cells, 2), low=-high, high=high)
 
     def observe(self) -> np.ndarray:
         obs = self.trace(self.observer_vehicle.position, self.observer_vehicle.velocity).copy()
         if self.normalize:
             obs /= self.maximum_range
-        return obs
+        return self.quantize(obs)
 
     def trace(self, origin: np.ndarray, origin_velocity: np.ndarray) -> np.ndarray:
         self.origin = origin.copy()
@@ -0,0 +1,67 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from highway_env.road.road import LaneIndex
+
+if TYPE_CHECKING:
+    from highway_env.envs.common.abstract import AbstractEnv
+    from highway_env.envs.common.observation import ObservationType
+    from highway_env.vehicle.objects import RoadObject
+
+
+class PerceptionCache(object):
+
+    """
+    A step-scoped cache of perception quantities.
+
+    Within a single environment step, the same quantities (observations, neighbouring vehicles, lane offsets...)
+    are queried by the observation, reward, termination and info functions, and by the wrappers around the
+    environment. They are computed once here and shared by every consumer until the simulation advances, at which
+    point the cache is invalidated.
+    """
+
+    def __init__(self, env: 'AbstractEnv') -> None:
+        self.env = env
+        self._values: Dict[Hashable, Any] = {}
+
+    def clear(self) -> None:
+        """Invalidate all cached quantities, e.g. when the scene has changed."""
+        self._values.clear()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get a cached quantity, or compute and cache it.
+
+        :param key: a key identifying the quantity within the current step
+        :param compute: a function computing the quantity if it is not cached yet
+        :return: the quantity
+        """
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = compute()
+            return value
+
+    def observe(self, observation_type: 'ObservationType') -> Any:
+        """The observation produced by an observation type in the current state."""
+        return self.get(("observe", id(observation_type)), observation_type.observe)
+
+    def lane_offset(self, vehicle: 'RoadObject') -> np.ndarray:
+        """The [longitudinal, lateral, angular] offsets of a vehicle with respect to its lane."""
+        return self.get(("lane_offset", id(vehicle)), lambda: vehicle.lane_offset)
+
+    def on_road(self, vehicle: 'RoadObject') -> bool:
+        """Whether a vehicle is on its current lane."""
+        return self.get(("on_road", id(vehicle)), lambda: vehicle.on_road)
+
+    def side_lanes(self, lane_index: LaneIndex) -> List[LaneIndex]:
+        """All lanes belonging to the same road as a given lane."""
+        return self.get(("side_lanes", lane_index), lambda: self.env.road.network.all_side_lanes(lane_index))
+
+    def close_objects_to(self, vehicle: 'RoadObject', distance: float, count: Optional[int] = None,
+                         see_behind: bool = True, sort: bool = True, vehicles_only: bool = False) -> List['RoadObject']:
+        """The objects close to a vehicle, see :py:meth:`highway_env.road.road.Road.close_objects_to`."""
+        return self.get(("close_objects_to", id(vehicle), distance, count, see_behind, sort, vehicles_only),
+                        lambda: self.env.road.close_objects_to(vehicle, distance, count, see_behind, sort,
+                                                               vehicles_only))
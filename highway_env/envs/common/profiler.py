@@ -0,0 +1,125 @@
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+
+class _Phase(object):
+
+    """A reusable context manager timing one phase of a profiler."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: 'StepProfiler', name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+
+
+class StepProfiler(object):
+
+    """
+    A profiler of the phases of environment steps.
+
+    Each phase (applying the action, the behaviour of vehicles, their dynamics, the observation, reward, info and
+    rendering) is timed with :py:meth:`phase`. The profiler keeps the call count and total wall time of each phase,
+    along with a rolling window of the durations of its last calls from which percentiles and histograms are computed.
+    The durations of the phases during the last step are also summed, to be reported in the step info.
+    """
+
+    PHASES = ["action", "road.act", "road.step", "observe", "reward", "info", "render"]
+    """The phases of a step, in order of execution."""
+
+    def __init__(self, window: int = 1000) -> None:
+        """
+        :param window: the number of recent calls of each phase kept for the percentiles and histograms
+        """
+        self.window = window
+        self._phases: Dict[str, _Phase] = {}
+        self.calls: Dict[str, int] = {}
+        self.totals: Dict[str, float] = {}
+        self.durations: Dict[str, Deque[float]] = {}
+        self.last_step: Dict[str, float] = {}
+
+    def phase(self, name: str) -> _Phase:
+        """
+        A context manager timing a phase.
+
+        :param name: the name of the phase
+        :return: the context manager, recording the duration of its block
+        """
+        try:
+            return self._phases[name]
+        except KeyError:
+            phase = self._phases[name] = _Phase(self, name)
+            return phase
+
+    def record(self, name: str, duration: float) -> None:
+        """
+        Record the duration of a call of a phase.
+
+        :param name: the name of the phase
+        :param duration: its wall time [s]
+        """
+        if name not in self.durations:
+            self.calls[name] = 0
+            self.totals[name] = 0.
+            self.durations[name] = deque(maxlen=self.window)
+        self.calls[name] += 1
+        self.totals[name] += duration
+        self.durations[name].append(duration)
+        self.last_step[name] = self.last_step.get(name, 0.) + duration
+
+    def start_step(self) -> None:
+        """Start a new step, resetting the durations of the last step."""
+        self.last_step = {}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Statistics of each phase recorded so far.
+
+        :return: for each phase, its call count and total time, and the mean, median, 95th percentile and maximum
+                 durations of its recent calls [s]
+        """
+        summary = {}
+        for name in sorted(self.durations, key=lambda n: (self.PHASES + [n]).index(n)):
+            durations = np.array(self.durations[name])
+            summary[name] = {
+                "calls": self.calls[name],
+                "total": self.totals[name],
+                "mean": float(durations.mean()),
+                "p50": float(np.percentile(durations, 50)),
+                "p95": float(np.percentile(durations, 95)),
+                "max": float(durations.max()),
+            }
+        return summary
+
+    def histogram(self, name: str, bins: int = 10, range: Optional[Tuple[float, float]] = None) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogram of the durations of the recent calls of a phase.
+
+        :param name: the name of the phase
+        :param bins: the number of bins
+        :param range: the range of the bins [s], by default that of the durations
+        :return: the counts and bin edges, as returned by numpy.histogram
+        """
+        return np.histogram(np.array(self.durations.get(name, [])), bins=bins, range=range)
+
+    def reset(self) -> None:
+        """Forget all the recorded durations."""
+        self.calls.clear()
+        self.totals.clear()
+        self.durations.clear()
+        self.last_step = {}
+
+    def __repr__(self) -> str:
+        return "\n".join("{:<10} {:>8} calls {:>10.3f} ms/call {:>10.3f} s total".format(
+            name, stats["calls"], 1000 * stats["mean"], stats["total"]) for name, stats in self.summary().items())
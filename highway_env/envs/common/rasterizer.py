@@ -0,0 +1,390 @@
+import itertools
+import json
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from highway_env.road.lane import LineType
+from highway_env.vehicle.behavior import IDMVehicle, LinearVehicle
+from highway_env.vehicle.controller import MDPVehicle
+from highway_env.vehicle.dynamics import BicycleVehicle
+from highway_env.vehicle.kinematics import Vehicle
+from highway_env.vehicle.objects import Landmark, Obstacle
+
+if TYPE_CHECKING:
+    from highway_env.envs.common.abstract import AbstractEnv
+    from highway_env.road.road import RoadNetwork
+    from highway_env.vehicle.objects import RoadObject
+
+Color = Tuple[int, ...]
+
+# The palette of highway_env.road.graphics and highway_env.vehicle.graphics, which import pygame
+GREY = (100, 100, 100)
+WHITE = (255, 255, 255)
+RED = (255, 100, 100)
+GREEN = (50, 200, 0)
+BLUE = (100, 200, 255)
+YELLOW = (200, 200, 0)
+BLACK = (60, 60, 60)
+TRANSPARENT_ALPHA = 30
+EPSILON = 1e-6  # Keeps the pixels on the edges of axis-aligned rectangles despite rounding errors
+
+# The lane markings and vehicle parts of LaneGraphics and VehicleGraphics [m]
+STRIPE_SPACING = 4.33
+STRIPE_LENGTH = 3
+STRIPE_WIDTH = 0.3
+TIRE_LENGTH, TIRE_WIDTH = 1, 0.3
+HEADLIGHT_LENGTH, HEADLIGHT_WIDTH = 0.72, 0.6
+
+
+def vehicle_color(vehicle: Vehicle, transparent: bool = False) -> Color:
+    """The color of a vehicle, as in VehicleGraphics.get_color."""
+    color = YELLOW
+    if getattr(vehicle, "color", None):
+        color = vehicle.color
+    elif vehicle.crashed:
+        color = RED
+    elif isinstance(vehicle, LinearVehicle):
+        color = YELLOW
+    elif isinstance(vehicle, IDMVehicle):
+        color = BLUE
+    elif isinstance(vehicle, MDPVehicle):
+        color = GREEN
+    return tuple(color[:3]) + (TRANSPARENT_ALPHA,) if transparent else color
+
+
+def object_color(object_: 'RoadObject', transparent: bool = False) -> Color:
+    """The color of a road object, as in RoadObjectGraphics.get_color."""
+    color = YELLOW
+    if isinstance(object_, Obstacle):
+        color = RED if object_.crashed else YELLOW
+    elif isinstance(object_, Landmark):
+        color = GREEN if object_.hit else BLUE
+    return color + (TRANSPARENT_ALPHA,) if transparent else color
+
+
+def lighten(color: Color, ratio: float = 0.68) -> Color:
+    return tuple(min(int(c / ratio), 255) for c in color[:3]) + tuple(color[3:])
+
+
+def paint(region: np.ndarray, mask: np.ndarray, color: Color) -> None:
+    """
+    Paint the masked pixels of an image region with a color, blended if it has an alpha channel.
+
+    :param region: a H x W x 3 image region
+    :param mask: the H x W mask of the pixels to paint
+    :param color: a RGB or RGBA color
+    """
+    if len(color) > 3:
+        alpha = color[3] / 255
+        region[mask] = (1 - alpha) * region[mask] + alpha * np.array(color[:3])
+    else:
+        region[mask] = color[:3]
+
+
+def fill_rectangle(image: np.ndarray, center: Sequence[float], direction: Sequence[float], length: float,
+                   width: float, color: Optional[Color], outline: Optional[Color] = None) -> None:
+    """
+    Fill a rotated rectangle in an image.
+
+    The pixels whose center lies in the rectangle are painted, which is decided for the pixels of its bounding box
+    from their coordinates in the frame of the rectangle.
+
+    :param image: a H x W x 3 image
+    :param center: the center of the rectangle [px]
+    :param direction: the unit vector of its length axis
+    :param length: its length [px]
+    :param width: its width [px]
+    :param color: its RGB or RGBA fill color, or None to only draw its outline
+    :param outline: the color of a 1 px border, if any
+    """
+    cos_h, sin_h = direction
+    half_x = (abs(length * cos_h) + abs(width * sin_h)) / 2
+    half_y = (abs(length * sin_h) + abs(width * cos_h)) / 2
+    x0, x1 = max(int(center[0] - half_x), 0), min(int(np.ceil(center[0] + half_x)), image.shape[1])
+    y0, y1 = max(int(center[1] - half_y), 0), min(int(np.ceil(center[1] + half_y)), image.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return
+    dx = np.arange(x0, x1) + 0.5 - center[0]
+    dy = np.arange(y0, y1)[:, np.newaxis] + 0.5 - center[1]
+    longitudinal = np.abs(dx * cos_h + dy * sin_h)
+    lateral = np.abs(dy * cos_h - dx * sin_h)
+    inside = (longitudinal <= length / 2 + EPSILON) & (lateral <= width / 2 + EPSILON)
+    region = image[y0:y1, x0:x1]
+    if color:
+        paint(region, inside, color)
+    if outline:
+        paint(region, inside & ((longitudinal > length / 2 - 1) | (lateral > width / 2 - 1)), outline)
+
+
+class RoadRaster(object):
+
+    """
+    The lane markings of a road network, rasterized at a given scaling.
+
+    The pixels of the markings are computed once for the whole network, in world pixel coordinates, and split into
+    square tiles. Each tile is painted into an image on its first use and kept in a bounded cache, so that rendering
+    the road only copies the tiles overlapping the displayed window. Tiles without markings share a single image.
+    Rasters are cached by network layout and scaling, and shared between viewers and episodes.
+    """
+
+    TILE_SIZE = 256
+    """The side of the tiles [px]."""
+
+    MAX_TILES = 128
+    """The maximum number of tile images kept in the cache of a raster."""
+
+    MAX_RASTERS = 8
+    """The maximum number of rasters kept in the cache, for different networks and scalings."""
+
+    _rasters: 'OrderedDict[Tuple[str, float], RoadRaster]' = OrderedDict()
+    _layouts: 'weakref.WeakKeyDictionary[RoadNetwork, str]' = weakref.WeakKeyDictionary()
+    _unserializable = itertools.count()
+
+    def __init__(self, network: 'RoadNetwork', scaling: float) -> None:
+        """
+        :param network: the road network
+        :param scaling: the number of pixels per meter [px/m]
+        """
+        self.scaling = scaling
+        pixels = self._marking_pixels(network, scaling)
+        tiles = pixels // self.TILE_SIZE
+        keys, inverse = np.unique(tiles, axis=0, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        splits = np.split(pixels[order], np.cumsum(np.bincount(inverse, minlength=len(keys)))[:-1])
+        self._tile_pixels: Dict[Tuple[int, int], np.ndarray] = {
+            (int(key[0]), int(key[1])): split for key, split in zip(keys, splits)}
+        self._tiles: 'OrderedDict[Tuple[int, int], np.ndarray]' = OrderedDict()
+        self._empty_tile = np.full((self.TILE_SIZE, self.TILE_SIZE, 3), GREY, dtype=np.uint8)
+
+    @classmethod
+    def get(cls, network: 'RoadNetwork', scaling: float) -> 'RoadRaster':
+        """
+        The raster of a network at a scaling, from the cache if the same layout was already rasterized.
+
+        :param network: the road network
+        :param scaling: the number of pixels per meter [px/m]
+        :return: the raster
+        """
+        layout = cls._layouts.get(network)
+        if layout is None:
+            try:
+                layout = json.dumps(network.to_config(), sort_keys=True, default=repr)
+            except (AttributeError, NotImplementedError, TypeError):  # Lanes which cannot be serialized
+                layout = "network-{}".format(next(cls._unserializable))
+            cls._layouts[network] = layout
+        key = (layout, scaling)
+        raster = cls._rasters.get(key)
+        if raster is None:
+            raster = cls._rasters[key] = cls(network, scaling)
+            if len(cls._rasters) > cls.MAX_RASTERS:
+                cls._rasters.popitem(last=False)
+        cls._rasters.move_to_end(key)
+        return raster
+
+    @staticmethod
+    def _marking_pixels(network: 'RoadNetwork', scaling: float) -> np.ndarray:
+        """
+        The pixels of the lane markings of a network, as drawn by LaneGraphics.
+
+        :param network: the road network
+        :param scaling: the number of pixels per meter [px/m]
+        :return: the N x 2 array of (x, y) world pixel coordinates of the markings
+        """
+        starts, ends = [], []
+        for lane in network.lanes_list():
+            for side in range(2):
+                if lane.line_types[side] == LineType.STRIPED:
+                    length, minimum = STRIPE_LENGTH, 0.5 * STRIPE_LENGTH
+                elif lane.line_types[side] in [LineType.CONTINUOUS, LineType.CONTINUOUS_LINE]:
+                    length, minimum = STRIPE_SPACING, 0
+                else:
+                    continue
+                longitudinal = np.arange(0, lane.length, STRIPE_SPACING)
+                longitudinal_ends = np.minimum(longitudinal + length, lane.length)
+                for s, s_end in zip(longitudinal, longitudinal_ends):
+                    if s_end - s > minimum:
+                        lateral = (side - 0.5) * lane.width_at(s)
+                        starts.append(lane.position(s, lateral))
+                        ends.append(lane.position(s_end, lateral))
+        if not starts:
+            return np.zeros((0, 2), dtype=np.int64)
+        starts, ends = np.array(starts) * scaling, np.array(ends) * scaling
+
+        # Sample each segment every pixel along its length, and across its width
+        segments = ends - starts
+        lengths = np.maximum(np.hypot(segments[:, 0], segments[:, 1]), 1e-6)
+        counts = np.ceil(lengths).astype(int) + 1
+        index = np.repeat(np.arange(len(counts)), counts)
+        t = (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)) / (counts[index] - 1)
+        points = starts[index] + t[:, np.newaxis] * segments[index]
+        normals = np.stack([-segments[:, 1], segments[:, 0]], axis=1)[index] / lengths[index, np.newaxis]
+        stripe_width = max(int(STRIPE_WIDTH * scaling), 1)
+        offsets = np.arange(stripe_width) - (stripe_width - 1) / 2
+        points = points[:, np.newaxis, :] + offsets[np.newaxis, :, np.newaxis] * normals[:, np.newaxis, :]
+        return np.floor(points.reshape(-1, 2)).astype(np.int64)
+
+    def tile(self, x: int, y: int) -> np.ndarray:
+        """
+        The image of a tile.
+
+        :param x: the column of the tile
+        :param y: the row of the tile
+        :return: its TILE_SIZE x TILE_SIZE x 3 image, which must not be modified
+        """
+        pixels = self._tile_pixels.get((x, y))
+        if pixels is None:
+            return self._empty_tile
+        tile = self._tiles.get((x, y))
+        if tile is None:
+            tile = self._tiles[(x, y)] = self._empty_tile.copy()
+            tile[pixels[:, 1] - y * self.TILE_SIZE, pixels[:, 0] - x * self.TILE_SIZE] = WHITE
+            if len(self._tiles) > self.MAX_TILES:
+                self._tiles.popitem(last=False)
+        self._tiles.move_to_end((x, y))
+        return tile
+
+    def draw(self, image: np.ndarray, x: int, y: int) -> None:
+        """
+        Copy the road into an image.
+
+        :param image: a H x W x 3 image
+        :param x: the world pixel column of the left of the image
+        :param y: the world pixel row of the top of the image
+        """
+        size = self.TILE_SIZE
+        height, width = image.shape[:2]
+        for row in range(y // size, (y + height - 1) // size + 1):
+            top, bottom = max(y, row * size), min(y + height, (row + 1) * size)
+            for column in range(x // size, (x + width - 1) // size + 1):
+                left, right = max(x, column * size), min(x + width, (column + 1) * size)
+                tile = self.tile(column, row)
+                image[top - y:bottom - y, left - x:right - x] = \
+                    tile[top - row * size:bottom - row * size, left - column * size:right - column * size]
+
+
+class NumpyViewer(object):
+
+    """
+    A viewer rendering the road and vehicles into an image with numpy, without pygame.
+
+    It draws the same scene as EnvViewer in offscreen mode: the road markings, road objects and vehicles, with their
+    history and trajectory. Overlays drawn with pygame, such as the agent display, lidar observation and labels, are
+    not rendered. The road is copied from a cached RoadRaster, and the vehicles are filled as rotated rectangles.
+    """
+
+    INITIAL_SCALING = 5.5
+    INITIAL_CENTERING = [0.5, 0.5]
+
+    def __init__(self, env: 'AbstractEnv', config: Optional[dict] = None) -> None:
+        self.env = env
+        self.config = config or env.config
+        self.offscreen = True
+        self.enabled = True
+        self.observer_vehicle = None
+        self.vehicle_trajectory = None
+        self.scaling = self.config.get("scaling", self.INITIAL_SCALING)
+        self.centering_position = self.config.get("centering_position", self.INITIAL_CENTERING)
+        self.image = np.zeros((self.config["screen_height"], self.config["screen_width"], 3), dtype=np.uint8)
+        self.origin = np.zeros(2)
+
+    def set_agent_action_sequence(self, actions) -> None:
+        """Planned trajectories are only displayed by EnvViewer."""
+
+    def handle_events(self) -> None:
+        """There is no window, hence no events to handle."""
+
+    def display(self) -> None:
+        """Render the road, objects and vehicles into the image."""
+        if not self.enabled:
+            return
+        height, width = self.image.shape[:2]
+        self.origin = self.window_position() - np.array(
+            [self.centering_position[0] * width, self.centering_position[1] * height]) / self.scaling
+        corner = np.floor(self.origin * self.scaling).astype(int)
+        road = self.env.road
+        RoadRaster.get(road.network, self.scaling).draw(self.image, int(corner[0]), int(corner[1]))
+
+        for vehicle in self.vehicle_trajectory or []:
+            self.draw_vehicle(vehicle, transparent=True)
+        for object_ in road.objects:
+            self.draw_object(object_)
+        if road.record_history:
+            frequency, duration, simulation = 3, 2, self.env.config["simulation_frequency"]
+            for vehicle in road.vehicles:
+                for state in list(vehicle.history)[:int(simulation * duration):int(simulation / frequency)]:
+                    self.draw_vehicle(state, transparent=True)
+        for vehicle in road.vehicles:
+            self.draw_vehicle(vehicle)
+
+    def get_image(self) -> np.ndarray:
+        """
+        The rendered image as a rgb array.
+
+        Gymnasium's channel convention is H x W x C
+        """
+        return self.image.copy()
+
+    def window_position(self) -> np.ndarray:
+        """the world position of the center of the displayed window."""
+        if self.observer_vehicle:
+            return self.observer_vehicle.position
+        elif self.env.vehicle:
+            return self.env.vehicle.position
+        else:
+            return np.array([0, 0])
+
+    def is_visible(self, position: np.ndarray, margin: int = 50) -> bool:
+        """Is a world position in the image, up to a margin [px]?"""
+        x, y = (position - self.origin) * self.scaling
+        height, width = self.image.shape[:2]
+        return -margin < x < width + margin and -margin < y < height + margin
+
+    def draw_vehicle(self, vehicle: Vehicle, transparent: bool = False) -> None:
+        """
+        Draw a vehicle as in VehicleGraphics.display: its body, headlights, outline and tires.
+
+        :param vehicle: the vehicle
+        :param transparent: whether the vehicle should be drawn slightly transparent
+        """
+        if not self.is_visible(vehicle.position):
+            return
+        s = self.scaling
+        heading = vehicle.heading if abs(vehicle.heading) > 2 * np.pi / 180 else 0
+        direction = np.array([np.cos(heading), np.sin(heading)])
+        normal = np.array([-direction[1], direction[0]])
+        center = (vehicle.position - self.origin) * s
+        color = vehicle_color(vehicle, transparent)
+        length, width = vehicle.LENGTH, vehicle.WIDTH
+
+        fill_rectangle(self.image, center, direction, length * s, width * s, color)
+        headlight = (length - HEADLIGHT_LENGTH) / 2
+        for lateral in [-1.4 * width / 3 + HEADLIGHT_WIDTH / 2, 0.6 * width / 5 + HEADLIGHT_WIDTH / 2]:
+            fill_rectangle(self.image, center + (headlight * direction + lateral * normal) * s, direction,
+                           HEADLIGHT_LENGTH * s, HEADLIGHT_WIDTH * s, lighten(color))
+        fill_rectangle(self.image, center, direction, length * s, width * s, None, outline=BLACK)
+        if type(vehicle) in [Vehicle, BicycleVehicle]:
+            steering = heading + vehicle.action["steering"]
+            for longitudinal, angle in [(-length / 2, heading), (length / 2, steering)]:
+                for lateral in [-width / 2, width / 2]:
+                    fill_rectangle(self.image, center + (longitudinal * direction + lateral * normal) * s,
+                                   [np.cos(angle), np.sin(angle)], TIRE_LENGTH * s, TIRE_WIDTH * s, BLACK)
+
+    def draw_object(self, object_: 'RoadObject', transparent: bool = False) -> None:
+        """
+        Draw a road object as in RoadObjectGraphics.display: a rectangle with an outline.
+
+        :param object_: the road object
+        :param transparent: whether the object should be drawn slightly transparent
+        """
+        if not self.is_visible(object_.position):
+            return
+        heading = object_.heading if abs(object_.heading) > 2 * np.pi / 180 else 0
+        fill_rectangle(self.image, (object_.position - self.origin) * self.scaling,
+                       [np.cos(heading), np.sin(heading)], object_.LENGTH * self.scaling,
+                       object_.WIDTH * self.scaling, object_color(object_, transparent), outline=BLACK)
+
+    def close(self) -> None:
+        """There is no window to close."""
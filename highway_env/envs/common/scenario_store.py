@@ -0,0 +1,214 @@
+import inspect
+import json
+import os
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from highway_env import utils
+from highway_env.envs.common.snapshot import set_rng_state
+
+if TYPE_CHECKING:
+    from highway_env.envs.common.abstract import AbstractEnv
+
+VEHICLE_COLUMNS: Dict[str, Tuple[type, Tuple[int, ...]]] = {
+    "class_id": (np.int16, ()),
+    "controlled": (np.bool_, ()),
+    "position": (np.float64, (2,)),
+    "heading": (np.float64, ()),
+    "speed": (np.float64, ()),
+    "lane_index": (np.int32, ()),
+    "target_lane_index": (np.int32, ()),
+    "target_speed": (np.float64, ()),
+    "enable_lane_change": (np.int8, ()),
+    "timer": (np.float64, ()),
+    "delta": (np.float64, ()),
+    "acceleration_parameters": (np.float64, (3,)),
+    "steering_parameters": (np.float64, (2,)),
+}
+"""The columns of the vehicles table: their dtype and the shape of their rows. Missing values are -1 or NaN."""
+
+SCENARIO_COLUMNS: Dict[str, Tuple[type, Tuple[int, ...]]] = {
+    "offsets": (np.int64, ()),
+    "seed": (np.int64, ()),
+    "rng_state": (np.uint64, (6,)),
+}
+"""The columns of the scenarios table: the offsets of their vehicles, their seed and the state of the PCG64 random
+number generator after the scene creation."""
+
+BEHAVIOUR_ATTRIBUTES = {"delta": "DELTA", "acceleration_parameters": "ACCELERATION_PARAMETERS",
+                        "steering_parameters": "STEERING_PARAMETERS"}
+"""The randomized behaviour parameters, stored when they are set on the vehicle instance."""
+
+UINT64_MASK = (1 << 64) - 1
+
+
+def _encode_rng_state(state: dict) -> List[int]:
+    """Encode the state of a PCG64 generator into 64-bit words."""
+    if state["bit_generator"] != "PCG64":
+        raise ValueError("Only PCG64 random number generators can be stored, not {}".format(state["bit_generator"]))
+    words = []
+    for value in [state["state"]["state"], state["state"]["inc"]]:
+        words.extend([value >> 64, value & UINT64_MASK])
+    return words + [state["has_uint32"], state["uinteger"]]
+
+
+def _decode_rng_state(words: np.ndarray) -> dict:
+    """Decode the state of a PCG64 generator from 64-bit words."""
+    words = [int(word) for word in words]
+    return {"bit_generator": "PCG64",
+            "state": {"state": (words[0] << 64) | words[1], "inc": (words[2] << 64) | words[3]},
+            "has_uint32": words[4], "uinteger": words[5]}
+
+
+class ScenarioStore(object):
+
+    """
+    A store of initial scenes, saved on disk as a columnar table memory-mapped for reading.
+
+    Each scenario is the initial scene produced by a seeded reset of an environment: the classes, kinematics, targets
+    and randomized behaviour parameters of its vehicles, and the state of the random number generator. Loading a
+    scenario rebuilds the road and vehicles from a slice of each column, without generating the scene again, so that
+    the same scenarios can be replayed at a low cost, e.g. to evaluate several models on identical episodes.
+
+    The table is a directory with one ``.npy`` file per column, and a ``metadata.json`` file with the vehicle classes
+    and lane indexes referenced in the columns. Vehicles with a planned route are not supported.
+    """
+
+    METADATA_FILE = "metadata.json"
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a scenario store.
+
+        :param path: the directory of the store
+        """
+        self.path = path
+        with open(os.path.join(path, self.METADATA_FILE)) as f:
+            self.metadata = json.load(f)
+        self.classes = [utils.class_from_path(path) for path in self.metadata["classes"]]
+        self.lane_indexes = [tuple(index) for index in self.metadata["lane_indexes"]]
+        self.columns = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r")
+                        for name in list(VEHICLE_COLUMNS) + list(SCENARIO_COLUMNS)}
+        self._parameters = {}
+
+    @classmethod
+    def record(cls, env: 'AbstractEnv', path: str, seeds: Iterable[int]) -> 'ScenarioStore':
+        """
+        Reset an environment with each seed, and store the resulting initial scenes.
+
+        :param env: the environment
+        :param path: the directory of the store
+        :param seeds: the seed of each scenario
+        :return: the store
+        """
+        env = env.unwrapped
+        classes, lane_indexes = {}, {}
+        rows = {name: [] for name in VEHICLE_COLUMNS}
+        scenarios = {name: [] for name in SCENARIO_COLUMNS}
+        offset = 0
+        for seed in seeds:
+            env.reset(seed=int(seed))
+            for vehicle in env.road.vehicles:
+                if getattr(vehicle, "route", None):
+                    raise ValueError("Vehicles with a planned route cannot be stored")
+                class_path = vehicle.__class__.__module__ + "." + vehicle.__class__.__name__
+                target_lane_index = getattr(vehicle, "target_lane_index", None)
+                row = {
+                    "class_id": classes.setdefault(class_path, len(classes)),
+                    "controlled": any(vehicle is controlled for controlled in env.controlled_vehicles),
+                    "position": vehicle.position,
+                    "heading": vehicle.heading,
+                    "speed": vehicle.speed,
+                    "lane_index": lane_indexes.setdefault(vehicle.lane_index, len(lane_indexes)),
+                    "target_lane_index": -1 if target_lane_index is None
+                    else lane_indexes.setdefault(target_lane_index, len(lane_indexes)),
+                    "target_speed": getattr(vehicle, "target_speed", np.nan),
+                    "enable_lane_change": getattr(vehicle, "enable_lane_change", -1),
+                    "timer": getattr(vehicle, "timer", np.nan),
+                }
+                for column, attribute in BEHAVIOUR_ATTRIBUTES.items():
+                    row[column] = vehicle.__dict__.get(attribute, np.full(VEHICLE_COLUMNS[column][1], np.nan))
+                for name, value in row.items():
+                    rows[name].append(value)
+            scenarios["offsets"].append(offset)
+            scenarios["seed"].append(seed)
+            scenarios["rng_state"].append(_encode_rng_state(env.np_random.bit_generator.state))
+            offset += len(env.road.vehicles)
+        scenarios["offsets"].append(offset)  # The offsets have one more row, the end of the last scenario
+
+        os.makedirs(path, exist_ok=True)
+        for columns, values in [(VEHICLE_COLUMNS, rows), (SCENARIO_COLUMNS, scenarios)]:
+            for name, (dtype, shape) in columns.items():
+                np.save(os.path.join(path, name + ".npy"), np.array(values[name], dtype=dtype).reshape((-1,) + shape))
+        with open(os.path.join(path, cls.METADATA_FILE), "w") as f:
+            json.dump({"env": env.__class__.__name__,
+                       "classes": sorted(classes, key=classes.get),
+                       "lane_indexes": [[str(_from), str(_to), int(_id)]
+                                        for _from, _to, _id in sorted(lane_indexes, key=lane_indexes.get)]}, f)
+        return cls(path)
+
+    def __len__(self) -> int:
+        return len(self.columns["seed"])
+
+    def seed(self, scenario_id: int) -> int:
+        """The seed of the reset that produced a scenario."""
+        return int(self.columns["seed"][scenario_id])
+
+    def _accepted_parameters(self, vehicle_class: type) -> set:
+        """The names of the constructor parameters of a vehicle class, which can be set from the columns."""
+        vehicle_class = getattr(vehicle_class, "func", vehicle_class)  # The class of a partial factory
+        if vehicle_class not in self._parameters:
+            self._parameters[vehicle_class] = set(inspect.signature(vehicle_class.__init__).parameters)
+        return self._parameters[vehicle_class]
+
+    def load(self, env: 'AbstractEnv', scenario_id: int) -> None:
+        """
+        Load a scenario into an environment, as the initial scene of an episode.
+
+        The controlled vehicles are created by the action type of the environment, as in its scene creation, so that
+        they have the per-instance settings of the action configuration (e.g. the target speeds of an MDPVehicle).
+
+        :param env: the environment, of the same kind and configuration as the recorded one
+        :param scenario_id: the index of the scenario
+        """
+        if env.__class__.__name__ != self.metadata["env"]:
+            raise ValueError("The scenarios were recorded in {}, not {}".format(self.metadata["env"],
+                                                                             env.__class__.__name__))
+        if not 0 <= scenario_id < len(self):
+            raise IndexError("Scenario {} is out of range, the store has {} scenarios".format(scenario_id, len(self)))
+        start, end = self.columns["offsets"][scenario_id:scenario_id + 2]
+        rows = {name: np.asarray(column[start:end]) for name, column in self.columns.items() if name in VEHICLE_COLUMNS}
+
+        env._create_road()
+        road = env.road
+        vehicles, controlled_vehicles = [], []
+        controlled_class = env.action_type.vehicle_class
+        for i in range(end - start):
+            vehicle_class = controlled_class if rows["controlled"][i] else self.classes[rows["class_id"][i]]
+            accepted = self._accepted_parameters(vehicle_class)
+            kwargs = {}
+            if "target_lane_index" in accepted and rows["target_lane_index"][i] >= 0:
+                kwargs["target_lane_index"] = self.lane_indexes[rows["target_lane_index"][i]]
+            if "target_speed" in accepted and not np.isnan(rows["target_speed"][i]):
+                kwargs["target_speed"] = float(rows["target_speed"][i])
+            if "enable_lane_change" in accepted and rows["enable_lane_change"][i] >= 0:
+                kwargs["enable_lane_change"] = bool(rows["enable_lane_change"][i])
+            # Created off-road, so that the stored lane is used instead of looking for the closest one
+            vehicle = vehicle_class(None, rows["position"][i], float(rows["heading"][i]), float(rows["speed"][i]),
+                                    **kwargs)
+            vehicle.road = road
+            vehicle.lane_index = self.lane_indexes[rows["lane_index"][i]]
+            vehicle.lane = road.network.get_lane(vehicle.lane_index)
+            if not np.isnan(rows["timer"][i]):
+                vehicle.timer = float(rows["timer"][i])
+            for column, attribute in BEHAVIOUR_ATTRIBUTES.items():
+                value = rows[column][i]
+                if not np.isnan(value).any():
+                    setattr(vehicle, attribute, float(value) if np.ndim(value) == 0 else value.copy())
+            vehicles.append(vehicle)
+            if rows["controlled"][i]:
+                controlled_vehicles.append(vehicle)
+        road.vehicles = vehicles
+        env.controlled_vehicles = controlled_vehicles
+        set_rng_state(env.np_random, _decode_rng_state(self.columns["rng_state"][scenario_id]))
@@ -0,0 +1,116 @@
+import copy
+import queue
+import threading
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from highway_env.envs.common.snapshot import EnvSnapshot
+
+if TYPE_CHECKING:
+    from highway_env.envs.common.abstract import AbstractEnv
+
+
+class ScenePool(object):
+
+    """
+    A pool of initial scenes, generated ahead of time in a background thread.
+
+    Generating a scene (road network and random vehicles) is a significant part of the cost of a reset. Instead, a
+    worker thread keeps a queue of ready scenes for the configuration of the environment, each captured as an
+    :py:class:`EnvSnapshot` of a private generator environment, and a reset only pops the next scene and restores it.
+
+    Scenes are generated from a stream of seeds, itself seeded from the environment random number generator when the
+    pool is (re)started. Since they are popped in the order of generation, the sequence of scenes only depends on the
+    seed of the environment, and not on the timing of the worker thread. It differs from the sequence of scenes of
+    cold resets with the same seed, though.
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        :param size: the number of scenes to keep ready
+        """
+        self.size = size
+        self.key: Optional[str] = None
+        self.generator: Optional['AbstractEnv'] = None
+        self._scenes: Optional[queue.Queue] = None
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def config_key(config: dict) -> str:
+        """The key identifying the scenes generated for a configuration."""
+        return repr(config)
+
+    def start(self, env: 'AbstractEnv') -> None:
+        """
+        (Re)start generating scenes for an environment, discarding the scenes generated so far.
+
+        :param env: the environment, whose configuration and random number generator are used
+        """
+        self.stop()
+        key = self.config_key(env.config)
+        if self.generator is None or key != self.key:
+            config = copy.deepcopy(env.config)
+            config["warm_reset_pool"] = 0
+            config["trace"] = None
+            self.generator = env.__class__(config=config)
+            self.key = key
+        seeds = np.random.default_rng(int(env.np_random.integers(np.iinfo(np.int32).max)))
+        self._scenes = queue.Queue(maxsize=self.size)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._generate, args=(self.generator, seeds, self._scenes, self._stop),
+                                        daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _generate(generator: 'AbstractEnv', seeds: np.random.Generator, scenes: queue.Queue,
+                  stop: threading.Event) -> None:
+        """Generate scenes until stopped, blocking while the queue is full."""
+        while not stop.is_set():
+            try:
+                generator.reset(seed=int(seeds.integers(np.iinfo(np.int32).max)))
+                scene = EnvSnapshot(generator)
+            except Exception as e:  # Raised in the main thread, when the scene is popped
+                scene = e
+            while not stop.is_set():
+                try:
+                    scenes.put(scene, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if isinstance(scene, Exception):
+                return
+
+    def restore(self, env: 'AbstractEnv', reseed: bool = False) -> None:
+        """
+        Pop the next scene and restore it into an environment.
+
+        :param env: the environment to reset
+        :param reseed: whether the environment has just been seeded, in which case the pool is restarted so that the
+                       following scenes are reproducible
+        """
+        if reseed or self._thread is None or self.config_key(env.config) != self.key:
+            self.start(env)
+        scene = self._scenes.get()
+        if isinstance(scene, Exception):
+            self._thread = None
+            raise scene
+        generator_random = scene.road.np_random
+        scene.restore(env)
+        if env.road.np_random is generator_random:
+            env.road.np_random = env.np_random
+
+    def stop(self) -> None:
+        """Stop the worker thread."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        """Stop the worker thread and close the generator environment."""
+        self.stop()
+        if self.generator is not None:
+            self.generator.close()
+            self.generator = None
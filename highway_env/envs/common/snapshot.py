@@ -0,0 +1,147 @@
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from highway_env.road.road import Road
+from highway_env.vehicle.objects import RoadObject
+
+if TYPE_CHECKING:
+    from highway_env.envs.common.abstract import AbstractEnv
+
+KINEMATIC_ATTRIBUTES = ["position", "heading", "speed"]
+"""The attributes of road objects stored in the arrays of a snapshot."""
+
+
+CONTAINER_COPIERS: Dict[type, Optional[Callable[[Any], Any]]] = {
+    np.ndarray: np.ndarray.copy,
+    list: list,
+    dict: dict,
+    deque: lambda value: deque(value, maxlen=value.maxlen),
+}
+"""How to copy each type of mutable container. Other types are resolved and memoized on first use."""
+
+
+def shallow_copy(value: Any) -> Any:
+    """
+    Copy a mutable container one level deep, so that it can be mutated without affecting the original.
+
+    Arrays, lists, dicts and deques are copied, while other values (numbers, tuples, lanes, vehicles...) are shared.
+
+    :param value: a value
+    :return: a copy of the value, or the value itself if it is not a mutable container
+    """
+    value_type = type(value)
+    try:
+        copier = CONTAINER_COPIERS[value_type]
+    except KeyError:
+        copier = CONTAINER_COPIERS[value_type] = next(
+            (CONTAINER_COPIERS[base] for base in value_type.__mro__[1:] if CONTAINER_COPIERS.get(base)), None)
+    return copier(value) if copier else value
+
+
+def copy_attributes(attributes: Dict[str, Any], exclude: List[str] = ()) -> Dict[str, Any]:
+    """
+    Copy a dict of attributes one level deep.
+
+    :param attributes: the attributes of an object, typically its ``__dict__``
+    :param exclude: attributes that are not copied
+    :return: the copied attributes
+    """
+    return {key: shallow_copy(value) for key, value in attributes.items() if key not in exclude}
+
+
+def clone_object(entity: RoadObject, road: Optional[Road]) -> RoadObject:
+    """
+    Clone a road object, without copying the lanes and road it refers to.
+
+    :param entity: a road object
+    :param road: the road of the clone
+    :return: a clone of the object, with one-level copies of its attributes
+    """
+    clone = entity.__class__.__new__(entity.__class__)
+    clone.__dict__.update(copy_attributes(entity.__dict__))
+    clone.road = road
+    return clone
+
+
+def rng_state(np_random: Any) -> Optional[dict]:
+    """Get the state of a random number generator, either a numpy Generator or a RandomState."""
+    if isinstance(np_random, np.random.Generator):
+        return np_random.bit_generator.state
+    elif isinstance(np_random, np.random.RandomState):
+        return np_random.get_state(legacy=False)
+    return None
+
+
+def set_rng_state(np_random: Any, state: Optional[dict]) -> None:
+    """Set the state of a random number generator, either a numpy Generator or a RandomState."""
+    if state is None:
+        return
+    if isinstance(np_random, np.random.Generator):
+        np_random.bit_generator.state = state
+    elif isinstance(np_random, np.random.RandomState):
+        np_random.set_state(state)
+
+
+class EnvSnapshot(object):
+
+    """
+    A snapshot of the dynamic state of an environment.
+
+    Only the mutable state is captured: the kinematics of road objects are stored in arrays, along with one-level
+    copies of their other attributes (targets, timers, routes...), the road and environment attributes listed in
+    :py:attr:`AbstractEnv.SNAPSHOT_ATTRIBUTES`, and the state of the random number generators. The static road
+    network, the lanes and the observation and action types are shared by reference.
+
+    A snapshot can be restored any number of times, which makes it suitable for tree-search planners.
+    """
+
+    def __init__(self, env: 'AbstractEnv') -> None:
+        """
+        Capture the state of an environment.
+
+        :param env: the environment
+        """
+        self.road: Road = env.road
+        self.road_attributes = copy_attributes(self.road.__dict__, exclude=["network", "np_random"]) \
+            if self.road else {}
+        self.entities: List[RoadObject] = (self.road.vehicles + self.road.objects) if self.road else []
+        self.positions = np.array([entity.position for entity in self.entities], dtype=float).reshape(-1, 2)
+        self.headings = np.array([entity.heading for entity in self.entities], dtype=float)
+        self.speeds = np.array([entity.speed for entity in self.entities], dtype=float)
+        self.attributes = [copy_attributes(entity.__dict__, exclude=KINEMATIC_ATTRIBUTES)
+                           for entity in self.entities]
+        self.env_attributes = {key: shallow_copy(getattr(env, key)) for key in env.SNAPSHOT_ATTRIBUTES}
+        self.rng_state = rng_state(env.np_random)
+        self.road_rng_state = rng_state(self.road.np_random) \
+            if self.road and self.road.np_random is not env.np_random else None
+
+    def restore(self, env: 'AbstractEnv') -> None:
+        """
+        Restore the captured state into an environment.
+
+        The road objects are restored in place, so that references held by the observation and action types remain
+        valid. If the snapshot was captured on a different road, e.g. in a previous episode, the road is swapped and
+        the observation and action types are linked to the restored controlled vehicles.
+
+        :param env: the environment, usually the one the snapshot was captured from
+        """
+        for entity, attributes, position, heading, speed in zip(self.entities, self.attributes, self.positions,
+                                                                self.headings, self.speeds):
+            entity.__dict__.clear()
+            entity.__dict__.update(copy_attributes(attributes))
+            entity.position = position.copy()
+            entity.heading = float(heading)
+            entity.speed = float(speed)
+        if self.road:
+            self.road.__dict__.update(copy_attributes(self.road_attributes))
+        for key, value in self.env_attributes.items():
+            setattr(env, key, shallow_copy(value))
+        set_rng_state(env.np_random, self.rng_state)
+        if self.road_rng_state is not None:
+            set_rng_state(self.road.np_random, self.road_rng_state)
+        if env.road is not self.road:
+            env.road = self.road
+            env.define_spaces()
+        env.perception.clear()
@@ -0,0 +1,335 @@
+import json
+import os
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from highway_env import utils
+from highway_env.road.road import Road, RoadNetwork
+from highway_env.vehicle.kinematics import Vehicle
+from highway_env.vehicle.objects import RoadObject
+
+if TYPE_CHECKING:
+    from highway_env.envs.common.abstract import AbstractEnv
+
+ROW_COLUMNS: Dict[str, type] = {
+    "x": np.float32,
+    "y": np.float32,
+    "heading": np.float32,
+    "speed": np.float32,
+    "steering": np.float32,
+    "length": np.float32,
+    "width": np.float32,
+    "object_id": np.int32,
+    "kind": np.int16,
+    "flags": np.uint8,
+}
+"""The columns of the rows table, with one row per vehicle or road object in each frame."""
+
+FRAME_COLUMNS: Dict[str, type] = {
+    "offset": np.int64,
+    "time": np.float32,
+}
+"""The columns of the frames table: the index of their first row, and their simulation time [s]."""
+
+CONTROLLED, CRASHED, HIT, ROAD_OBJECT = 1, 2, 4, 8
+"""The bits of the flags column."""
+
+RENDERING_CONFIG = ["simulation_frequency", "policy_frequency", "screen_width", "screen_height", "centering_position",
+                    "scaling", "show_trajectories", "render_agent", "offscreen_rendering", "real_time_rendering",
+                    "manual_control", "rendering_backend"]
+"""The configuration of the environment stored in the trace, to render it again."""
+
+
+class TraceRecorder(object):
+
+    """
+    A recorder of the kinematics of every vehicle and road object, at every simulation frame.
+
+    The trace is a directory with one binary file per column of float32 kinematics and integer identifiers, to which
+    the rows are appended in chunks, and a ``metadata.json`` file with the episodes, their road networks, the classes
+    and colors of the objects and the rendering configuration of the environment. An existing trace is appended to.
+    Recording is cheap enough to run along headless evaluations, and any episode can then be rendered again from the
+    trace alone with :py:class:`TraceReplay`.
+    """
+
+    METADATA_FILE = "metadata.json"
+
+    def __init__(self, path: str, chunk_size: int = 65536) -> None:
+        """
+        :param path: the directory of the trace
+        :param chunk_size: the number of rows buffered in memory before they are appended to the files
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, self.METADATA_FILE)):
+            with open(os.path.join(path, self.METADATA_FILE)) as f:
+                self.metadata = json.load(f)
+        else:
+            self.metadata = {"env": None, "config": {}, "kinds": [], "networks": [], "episodes": [],
+                             "frames": 0, "rows": 0}
+        self._kinds = {tuple(kind): index for index, kind in enumerate(map(tuple, self.metadata["kinds"]))}
+        self._networks = {json.dumps(network, sort_keys=True): index
+                          for index, network in enumerate(self.metadata["networks"])}
+        self._buffers: Dict[str, List[np.ndarray]] = {name: [] for name in list(ROW_COLUMNS) + list(FRAME_COLUMNS)}
+        self._frames = self.metadata["frames"]
+        self._rows = self.metadata["rows"]
+        self._buffered_rows = 0
+        self._object_ids: Dict[int, tuple] = {}
+
+    def start_episode(self, env: 'AbstractEnv', seed: Optional[int] = None) -> None:
+        """
+        Start recording a new episode, and record its initial frame.
+
+        :param env: the environment, after its reset
+        :param seed: the seed of the reset, if any
+        """
+        env = env.unwrapped
+        episodes = self.metadata["episodes"]
+        buffered_frames = len(self._buffers["offset"])
+        if buffered_frames and episodes and episodes[-1]["frame"] == self._frames + buffered_frames - 1:
+            # The last episode ended on its initial frame, e.g. the reset of the environment constructor: replace it
+            episodes.pop()
+            self._buffered_rows -= len(self._buffers["x"][-1])
+            for name in self._buffers:
+                self._buffers[name].pop()
+        network = json.loads(json.dumps(env.road.network.to_config(),
+                                        default=lambda x: x.tolist() if hasattr(x, "tolist") else repr(x)))
+        network_id = self._networks.setdefault(json.dumps(network, sort_keys=True), len(self._networks))
+        if network_id == len(self.metadata["networks"]):
+            self.metadata["networks"].append(network)
+        self.metadata["env"] = utils.get_class_path(env.__class__)
+        self.metadata["config"] = {key: env.config[key] for key in RENDERING_CONFIG if key in env.config}
+        episodes.append({"frame": self._frames + len(self._buffers["offset"]), "seed": seed,
+                         "network": network_id})
+        self._object_ids = {}
+        self.record_frame(env)
+
+    def record_frame(self, env: 'AbstractEnv') -> None:
+        """
+        Record the current frame of an environment.
+
+        :param env: the environment
+        """
+        road = env.road
+        objects = road.vehicles + road.objects
+        controlled = {id(vehicle) for vehicle in env.controlled_vehicles}
+        rows = {name: np.empty(len(objects), dtype=dtype) for name, dtype in ROW_COLUMNS.items()}
+        for i, o in enumerate(objects):
+            rows["x"][i], rows["y"][i] = o.position
+            rows["heading"][i] = o.heading
+            rows["speed"][i] = o.speed
+            rows["steering"][i] = o.action["steering"] if isinstance(o, Vehicle) else 0
+            rows["length"][i], rows["width"][i] = o.LENGTH, o.WIDTH
+            rows["object_id"][i] = self._object_id(o)
+            rows["kind"][i] = self._kind(o)
+            rows["flags"][i] = (CONTROLLED * (id(o) in controlled) | CRASHED * bool(o.crashed)
+                                | HIT * bool(o.hit) | ROAD_OBJECT * (not isinstance(o, Vehicle)))
+        for name, values in rows.items():
+            self._buffers[name].append(values)
+        self._buffers["offset"].append(np.array([self._rows + self._buffered_rows], dtype=np.int64))
+        self._buffers["time"].append(np.array([env.steps / env.config["simulation_frequency"]], dtype=np.float32))
+        self._buffered_rows += len(objects)
+        if self._buffered_rows >= self.chunk_size:
+            self.flush()
+
+    def _object_id(self, o: RoadObject) -> int:
+        """A identifier of an object, unique within the episode."""
+        entry = self._object_ids.get(id(o))
+        if entry is None or entry[0] is not o:
+            entry = self._object_ids[id(o)] = (o, len(self._object_ids))  # Keep a reference, so that ids are not reused
+        return entry[1]
+
+    def _kind(self, o: RoadObject) -> int:
+        """The index of the class and color of an object."""
+        color = getattr(o, "color", None)
+        kind = (utils.get_class_path(o.__class__), tuple(int(c) for c in color) if color else None)
+        index = self._kinds.get(kind)
+        if index is None:
+            index = self._kinds[kind] = len(self.metadata["kinds"])
+            self.metadata["kinds"].append(list(kind))
+        return index
+
+    def flush(self) -> None:
+        """Append the buffered rows and frames to the files, and write the metadata."""
+        frames = 0
+        for name, dtype in list(ROW_COLUMNS.items()) + list(FRAME_COLUMNS.items()):
+            if self._buffers[name]:
+                values = np.concatenate(self._buffers[name]).astype(dtype, copy=False)
+                with open(os.path.join(self.path, name + ".bin"), "ab") as f:
+                    values.tofile(f)
+                if name == "offset":
+                    frames = len(values)
+            self._buffers[name] = []
+        self._frames += frames
+        self._rows += self._buffered_rows
+        self._buffered_rows = 0
+        self.metadata["frames"], self.metadata["rows"] = self._frames, self._rows
+        metadata_path = os.path.join(self.path, self.METADATA_FILE)
+        with open(metadata_path + ".tmp", "w") as f:
+            json.dump(self.metadata, f)
+        os.replace(metadata_path + ".tmp", metadata_path)  # Written after the data, so that readers see whole frames
+
+    def close(self) -> None:
+        self.flush()
+        self._object_ids = {}
+
+
+class Trace(object):
+
+    """A trace recorded by a TraceRecorder, whose columns are memory-mapped for reading."""
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: the directory of the trace
+        """
+        self.path = path
+        with open(os.path.join(path, TraceRecorder.METADATA_FILE)) as f:
+            self.metadata = json.load(f)
+        self.columns: Dict[str, np.ndarray] = {}
+        for columns, count in [(ROW_COLUMNS, self.metadata["rows"]), (FRAME_COLUMNS, self.metadata["frames"])]:
+            for name, dtype in columns.items():
+                self.columns[name] = np.memmap(os.path.join(path, name + ".bin"), dtype=dtype, mode="r",
+                                               shape=(count,)) if count else np.zeros(0, dtype=dtype)
+        self.episodes = [episode for episode in self.metadata["episodes"] if episode["frame"] < self.metadata["frames"]]
+
+    def __len__(self) -> int:
+        return len(self.episodes)
+
+    def frames(self, episode: int) -> range:
+        """The indexes of the frames of an episode."""
+        end = self.episodes[episode + 1]["frame"] if episode + 1 < len(self) else self.metadata["frames"]
+        return range(self.episodes[episode]["frame"], end)
+
+    def rows(self, frame: int) -> slice:
+        """The slice of the rows of a frame."""
+        offsets = self.columns["offset"]
+        return slice(int(offsets[frame]), int(offsets[frame + 1]) if frame + 1 < len(offsets)
+                     else self.metadata["rows"])
+
+
+class TraceReplay(object):
+
+    """
+    A replay of the episodes of a trace, rendered with the viewers of the environments.
+
+    It stands in for the environment of the viewers: the road network of an episode is rebuilt from the trace, and its
+    vehicles and road objects are set to their recorded state at each frame, without simulating them.
+    """
+
+    def __init__(self, trace: Trace, render_mode: str = "rgb_array", config: Optional[dict] = None) -> None:
+        """
+        :param trace: the trace
+        :param render_mode: "rgb_array" to return the frames as images, or "human" to display them
+        :param config: rendering configuration overriding that of the recorded environment, e.g. the screen size or
+                       rendering backend
+        """
+        self.trace = trace
+        self.render_mode = render_mode
+        self.config = dict(trace.metadata["config"], **(config or {}))
+        self.config.setdefault("rendering_backend", "pygame")
+        self.road: Optional[Road] = None
+        self.controlled_vehicles: List[RoadObject] = []
+        self.observation_type = None
+        self.action_type = None
+        self.viewer = None
+        self.time = 0.
+        self._objects: Dict[int, RoadObject] = {}
+        self._classes = [utils.class_from_path(kind[0]) for kind in trace.metadata["kinds"]]
+
+    @property
+    def vehicle(self) -> Optional[RoadObject]:
+        return self.controlled_vehicles[0] if self.controlled_vehicles else None
+
+    @property
+    def unwrapped(self) -> 'TraceReplay':
+        return self
+
+    def load_episode(self, episode: int) -> None:
+        """Rebuild the road of an episode, without any vehicles."""
+        network = RoadNetwork.from_config(self.trace.metadata["networks"][self.trace.episodes[episode]["network"]])
+        self.road = Road(network=network, vehicles=[], record_history=False)
+        self._objects = {}
+
+    def load_frame(self, frame: int) -> None:
+        """Set the vehicles and road objects of the road to their state in a frame."""
+        rows = self.trace.rows(frame)
+        columns = {name: np.asarray(self.trace.columns[name][rows]) for name in ROW_COLUMNS}
+        self.road.vehicles, self.road.objects, self.controlled_vehicles = [], [], []
+        for i in range(rows.stop - rows.start):
+            o = self._object(int(columns["object_id"][i]), int(columns["kind"][i]), int(columns["flags"][i]))
+            o.position = np.array([columns["x"][i], columns["y"][i]], dtype=np.float64)
+            o.heading, o.speed = float(columns["heading"][i]), float(columns["speed"][i])
+            o.LENGTH, o.WIDTH = float(columns["length"][i]), float(columns["width"][i])
+            o.crashed, o.hit = bool(columns["flags"][i] & CRASHED), bool(columns["flags"][i] & HIT)
+            if isinstance(o, Vehicle):
+                o.action["steering"] = float(columns["steering"][i])
+                self.road.vehicles.append(o)
+            else:
+                self.road.objects.append(o)
+            if columns["flags"][i] & CONTROLLED:
+                self.controlled_vehicles.append(o)
+        self.time = float(self.trace.columns["time"][frame])
+
+    def _object(self, object_id: int, kind: int, flags: int) -> RoadObject:
+        """The object of an identifier in the current episode, created on its first frame."""
+        o = self._objects.get(object_id)
+        if o is None:
+            object_class = self._classes[kind]
+            try:
+                # Created off-road, so that no lane is looked for
+                o = object_class(None, np.zeros(2), 0, 0)
+            except TypeError:  # A class with other constructor parameters, drawn as its base class
+                o = (RoadObject if flags & ROAD_OBJECT else Vehicle)(None, np.zeros(2), 0, 0)
+            o.road = self.road
+            color = self.trace.metadata["kinds"][kind][1]
+            if color:
+                o.color = tuple(color)
+            o = self._objects[object_id] = o
+        return o
+
+    def render(self) -> Optional[np.ndarray]:
+        """Render the current frame with a viewer, as AbstractEnv.render."""
+        if self.viewer is None:
+            if self.config["rendering_backend"] == "numpy" and self.render_mode == "rgb_array":
+                from highway_env.envs.common.rasterizer import NumpyViewer
+                self.viewer = NumpyViewer(self)
+            else:
+                from highway_env.envs.common.graphics import EnvViewer  # Imports pygame, only when rendering
+                self.viewer = EnvViewer(self)
+        self.viewer.display()
+        if not self.viewer.offscreen:
+            self.viewer.handle_events()
+        if self.render_mode == "rgb_array":
+            return self.viewer.get_image()
+
+    def episode(self, episode: int, fps: Optional[float] = None) -> Iterator[Optional[np.ndarray]]:
+        """
+        Render an episode at a fixed frame rate.
+
+        The recorded frames are not evenly spaced in time when consecutive simulation frames were merged by adaptive
+        sub-stepping, so they are resampled on their recorded time: each rendered frame holds the last recorded frame.
+
+        :param episode: the index of the episode in the trace
+        :param fps: the frame rate of the rendered frames, by default the simulation frequency
+        :return: an iterator over the rendered frames, which are None when displayed
+        """
+        self.load_episode(episode)
+        frames = self.trace.frames(episode)
+        times = np.asarray(self.trace.columns["time"][frames.start:frames.stop], dtype=np.float64)
+        period = 1 / (fps or self.config.get("simulation_frequency", 15))
+        count = int(np.round((times[-1] - times[0]) / period)) + 1
+        # Rounded to the nearest frame time, as the times are stored in single precision
+        indexes = np.searchsorted(times, times[0] + (np.arange(count) + 0.5) * period, side="right") - 1
+        image, loaded = None, None
+        for index in indexes:
+            if index != loaded or image is None:
+                self.load_frame(frames[index])
+                image, loaded = self.render(), index
+            yield image
+
+    def close(self) -> None:
+        if self.viewer is not None:
+            self.viewer.close()
+        self.viewer = None
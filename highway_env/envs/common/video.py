@@ -0,0 +1,227 @@
+import json
+import os
+import queue
+import threading
+from typing import Callable, Optional, Tuple
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import error, logger
+from gymnasium.wrappers import RecordVideo
+
+WriterFactory = Callable[[str, float, Tuple[int, int]], object]
+"""A function opening a video file from its path, frame rate and (width, height) size, and returning a writer with
+write_frame(frame) and close() methods."""
+
+
+def moviepy_writer(path: str, fps: float, size: Tuple[int, int]) -> object:
+    """Open a video file with the ffmpeg writer of moviepy, which encodes in an ffmpeg subprocess."""
+    try:
+        from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+    except ImportError as e:
+        raise error.DependencyNotInstalled("moviepy is not installed, run `pip install moviepy`") from e
+    return FFMPEG_VideoWriter(path, size, fps)
+
+
+class VideoEncoder(object):
+
+    """
+    An encoder of video files running in a background thread.
+
+    The frames are handed over to the thread through a bounded queue, without being copied, so they must not be
+    modified afterwards. Writing a frame only blocks when the queue is full, which applies back-pressure on the
+    simulation when the encoding cannot keep up. Several videos can be encoded one after the other, each started with
+    :py:meth:`open` and ended with :py:meth:`end`.
+    """
+
+    def __init__(self, max_queued_frames: int = 64, writer_factory: Optional[WriterFactory] = None) -> None:
+        """
+        :param max_queued_frames: the capacity of the queue of frames waiting to be encoded
+        :param writer_factory: the function opening the video files, by default with moviepy
+        """
+        self.writer_factory = writer_factory or moviepy_writer
+        self.queue = queue.Queue(maxsize=max_queued_frames)
+        self.error: Optional[BaseException] = None
+        self.encoded_frames = 0
+        self._thread = threading.Thread(target=self._run, name="VideoEncoder", daemon=True)
+        self._thread.start()
+
+    def open(self, path: str, fps: float) -> None:
+        """
+        Start a new video.
+
+        :param path: the path of the video file
+        :param fps: its frame rate
+        """
+        self._put(("open", path, fps))
+
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Append a frame to the current video, waiting for room in the queue if it is full.
+
+        :param frame: a H x W x 3 image, which must not be modified afterwards
+        """
+        self._put(("frame", frame))
+
+    def end(self) -> None:
+        """End the current video, which is closed once its frames are encoded."""
+        self._put(("end",))
+
+    def close(self) -> None:
+        """Wait for the queued frames to be encoded, and stop the thread."""
+        if self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join()
+        self._raise()
+
+    def _put(self, item: tuple) -> None:
+        self._raise()
+        if not self._thread.is_alive():
+            raise error.Error("The video encoder is closed")
+        self.queue.put(item)
+
+    def _raise(self) -> None:
+        """Raise the last error of the encoding thread, in the calling thread."""
+        if self.error is not None:
+            e, self.error = self.error, None
+            raise e
+
+    def _run(self) -> None:
+        writer, path, fps = None, None, None
+        while True:
+            item = self.queue.get()
+            try:
+                if item is not None and item[0] == "frame":
+                    if path is not None:
+                        frame = item[1]
+                        if writer is None:
+                            writer = self.writer_factory(path, fps, (frame.shape[1], frame.shape[0]))
+                        writer.write_frame(frame)
+                        self.encoded_frames += 1
+                else:
+                    path = None
+                    if writer is not None:
+                        writer, closed = None, writer
+                        closed.close()
+                    if item is not None and item[0] == "open":
+                        path, fps = item[1:]
+            except Exception as e:
+                # Skip the rest of the video, and report the error when the next frame is written
+                self.error, path = e, None
+                if writer is not None:
+                    writer, failed = None, writer
+                    try:
+                        failed.close()  # Release its file and encoding process, the first error being reported
+                    except Exception:
+                        pass
+            if item is None:
+                return
+
+
+class AsyncVideoRecorder(object):
+
+    """
+    A video recorder handing the frames of one video over to a VideoEncoder.
+
+    It can be used in place of gymnasium's VideoRecorder, which keeps every frame in memory until the end of the video
+    and then encodes them in the calling thread.
+    """
+
+    def __init__(self, env: gym.Env, encoder: VideoEncoder, path: str, metadata: Optional[dict] = None) -> None:
+        """
+        :param env: the environment, rendering rgb_array images
+        :param encoder: the encoder of the videos
+        :param path: the path of the video file
+        :param metadata: contents of the metadata file written next to the video
+        """
+        self.env = env
+        self.encoder = encoder
+        self.path = path
+        self.metadata = dict(metadata or {}, content_type="video/mp4")
+        self.metadata_path = "{}.meta.json".format(os.path.splitext(path)[0])
+        self.frames_per_sec = env.metadata.get("render_fps", 30)
+        self.enabled = True
+        self.broken = False
+        self.render_history = []
+        self.recorded_frames = []  # Unused, kept as it is reset by RecordVideo
+        self.frames_count = 0
+        self._closed = False
+        encoder.open(path, self.frames_per_sec)
+
+    @property
+    def functional(self) -> bool:
+        return self.enabled and not self.broken
+
+    def capture_frame(self) -> None:
+        """Render the environment and queue the frame for encoding."""
+        frame = self.env.render()
+        if isinstance(frame, list):
+            self.render_history += frame
+            frame = frame[-1]
+        if not self.functional or self._closed:
+            return
+        if frame is None:
+            logger.warn("Env returned None on `render()`. Disabling further rendering for video recorder: "
+                        "path={}".format(self.path))
+            self.broken = True
+            return
+        self.encoder.write(frame)
+        self.frames_count += 1
+
+    def close(self) -> None:
+        """End the video, without waiting for it to be encoded."""
+        if self._closed:
+            return
+        self.encoder.end()
+        if not self.frames_count:
+            self.metadata["empty"] = True
+        with open(self.metadata_path, "w") as f:
+            json.dump(self.metadata, f)
+        self._closed = True
+
+
+class AsyncRecordVideo(RecordVideo):
+
+    """
+    A RecordVideo wrapper encoding the videos in a background thread.
+
+    The frames are queued to a single VideoEncoder shared by all the recorded episodes, so that stepping the
+    environment is only blocked while the queue of frames is full. If the environment is a highway-env environment,
+    the wrapper is also used to capture its intermediate simulation frames.
+    """
+
+    def __init__(self, env: gym.Env, video_folder: str, episode_trigger: Callable[[int], bool] = None,
+                 step_trigger: Callable[[int], bool] = None, video_length: int = 0, name_prefix: str = "rl-video",
+                 max_queued_frames: int = 64, writer_factory: Optional[WriterFactory] = None) -> None:
+        """
+        :param env: the environment, rendering rgb_array images
+        :param video_folder: the folder where the videos are stored
+        :param episode_trigger: whether to record an episode, from its index
+        :param step_trigger: whether to start recording at a step, from its index
+        :param video_length: the number of frames of the videos, or 0 to record whole episodes
+        :param name_prefix: the prefix of the video file names
+        :param max_queued_frames: the capacity of the queue of frames waiting to be encoded
+        :param writer_factory: the function opening the video files, by default with moviepy
+        """
+        super().__init__(env, video_folder, episode_trigger=episode_trigger, step_trigger=step_trigger,
+                         video_length=video_length, name_prefix=name_prefix, disable_logger=True)
+        self.encoder = VideoEncoder(max_queued_frames, writer_factory)
+        if hasattr(env.unwrapped, "set_record_video_wrapper"):
+            env.unwrapped.set_record_video_wrapper(self)
+
+    def start_video_recorder(self) -> None:
+        self.close_video_recorder()
+        video_name = "{}-step-{}".format(self.name_prefix, self.step_id)
+        if self.episode_trigger:
+            video_name = "{}-episode-{}".format(self.name_prefix, self.episode_id)
+        self.video_recorder = AsyncVideoRecorder(self.env, self.encoder,
+                                                 os.path.join(self.video_folder, video_name + ".mp4"),
+                                                 metadata={"step_id": self.step_id, "episode_id": self.episode_id})
+        self.video_recorder.capture_frame()
+        self.recorded_frames = 1
+        self.recording = True
+
+    def close(self) -> None:
+        """Close the environment and the current video, and wait for the videos to be encoded."""
+        super().close()
+        self.encoder.close()
@@ -2,7 +2,9 @@ import numpy as np
 from typing import Tuple, Dict, Text
 
 from highway_env import utils
-from highway_env.envs import HighwayEnv, CircularLane, Vehicle
+from highway_env.envs.highway_env import HighwayEnv
+from highway_env.road.lane import CircularLane
+from highway_env.vehicle.kinematics import Vehicle
 from highway_env.envs.common.action import Action
 from highway_env.road.road import Road, RoadNetwork
 from highway_env.vehicle.controller import ControlledVehicle
@@ -90,20 +92,21 @@ class ExitEnv(HighwayEnv):
             self.road.vehicles.append(vehicle)
 
         vehicles_type = utils.class_from_path(self.config["other_vehicles_type"])
-        for _ in range(self.config["vehicles_count"]):
-            lanes = np.arange(self.config["lanes_count"])
-            lane_id = self.road.np_random.choice(lanes, size=1,
-                                                 p=lanes / lanes.sum()).astype(int)[0]
-            lane = self.road.network.get_lane(("0", "1", lane_id))
-            vehicle = vehicles_type.create_random(self.road,
-                                                  lane_from="0",
-                                                  lane_to="1",
-                                                  lane_id=lane_id,
-                                                  speed=lane.speed_limit,
-                                                  spacing=1 / self.config["vehicles_density"],
-                                                  ).plan_route_to("3")
+        lanes = np.arange(self.config["lanes_count"])
+        lane_ids = self.road.np_random.choice(lanes, size=self.config["vehicles_count"],
+                                              p=lanes / lanes.sum()).astype(int)
+        speeds = [self.road.network.get_lane(("0", "1", lane_id)).speed_limit for lane_id in lane_ids]
+        vehicles = vehicles_type.create_random_batch(self.road,
+                                                     self.config["vehicles_count"],
+                                                     lane_from="0",
+                                                     lane_to="1",
+                                                     lane_id=lane_ids,
+                                                     speed=np.array(speeds, dtype=float),
+                                                     spacing=1 / self.config["vehicles_density"])
+        for vehicle in vehicles:
+            vehicle.plan_route_to("3")
             vehicle.enable_lane_change = False
-            self.road.vehicles.append(vehicle)
+        self.road.vehicles.extend(vehicles)
 
     def _reward(self, action: Action) -> float:
         """
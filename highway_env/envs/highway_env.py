@@ -46,7 +46,12 @@ class HighwayEnv(AbstractEnv):
             "lane_change_reward": 0,   # The reward received at each lane change action.
             "reward_speed_range": [20, 30],
             "normalize_reward": True,
-            "offroad_terminal": False
+            "offroad_terminal": False,
+            "warm_reset_pool": 0,  # Number of initial scenes generated ahead of time in a background thread, if any
+            "scenario_store": None,  # Directory of the stored initial scenes, loaded with reset(options={"scenario_id"})
+            "recycle_distance": None  # [m] Distance behind or ahead of the controlled vehicles beyond which vehicles
+                                      # are respawned on the opposite side, if any. The scene is then also moved
+                                      # back along the road, so that it never reaches the end of the lanes.
         })
         return config
 
@@ -76,10 +81,79 @@ class HighwayEnv(AbstractEnv):
             self.controlled_vehicles.append(vehicle)
             self.road.vehicles.append(vehicle)
 
-            for _ in range(others):
-                vehicle = other_vehicles_type.create_random(self.road, spacing=1 / self.config["vehicles_density"])
+            vehicles = other_vehicles_type.create_random_batch(self.road, others,
+                                                               spacing=1 / self.config["vehicles_density"])
+            for vehicle in vehicles:
                 vehicle.randomize_behavior()
-                self.road.vehicles.append(vehicle)
+            self.road.vehicles.extend(vehicles)
+
+    def _after_simulation(self) -> None:
+        if self.config["recycle_distance"]:
+            self._recycle_vehicles()
+            self._shift_vehicles()
+
+    def _recycle_vehicles(self) -> None:
+        """
+        Respawn the vehicles that are too far behind or ahead of the controlled vehicles, on the opposite side.
+
+        A vehicle farther than config["recycle_distance"] from every controlled vehicle is replaced by a new vehicle of
+        the same class, with a random lane, speed and behaviour, at the same distance on the other side of the closest
+        controlled vehicle. The number of vehicles around the controlled vehicles thus stays constant, however long
+        the episode. A vehicle is only respawned in a lane with enough free space, otherwise it is kept for now.
+        """
+        distance = self.config["recycle_distance"]
+        lane_indexes = self.road.network.all_side_lanes(self.vehicle.lane_index)
+        lane = self.road.network.get_lane(lane_indexes[0])
+        controlled = np.array([lane.local_coordinates(v.position)[0] for v in self.controlled_vehicles])
+        longitudinals = [lane.local_coordinates(v.position)[0] for v in self.road.vehicles]
+        recycled = set()
+        for i, vehicle in enumerate(self.road.vehicles):
+            if any(vehicle is v for v in self.controlled_vehicles):
+                continue
+            offsets = longitudinals[i] - controlled
+            closest = np.argmin(np.abs(offsets))
+            if abs(offsets[closest]) <= distance:
+                continue
+            x = controlled[closest] - np.sign(offsets[closest]) * \
+                (distance - self.road.np_random.uniform(0, 2 * Vehicle.LENGTH))
+            speed = self.road.np_random.uniform(0.7 * lane.speed_limit, 0.8 * lane.speed_limit)
+            free_lanes = [index for index in lane_indexes
+                          if all(abs(x - x_other) > vehicle.default_spacing(speed) or other.lane_index != index
+                                 for other, x_other in zip(self.road.vehicles, longitudinals))]
+            if not free_lanes:
+                continue
+            spawn_lane = self.road.network.get_lane(free_lanes[self.road.np_random.choice(len(free_lanes))])
+            new_vehicle = vehicle.__class__(self.road, spawn_lane.position(x, 0), spawn_lane.heading_at(x), speed)
+            if hasattr(new_vehicle, "randomize_behavior"):
+                new_vehicle.randomize_behavior()
+            self.road.vehicles[i] = new_vehicle
+            longitudinals[i] = x
+            recycled.add(id(vehicle))
+        if recycled:
+            self.road.distant_vehicles = [v for v in self.road.distant_vehicles if id(v) not in recycled]
+
+    def _shift_vehicles(self) -> None:
+        """
+        Move all the vehicles and road objects back along the road, together, once the controlled vehicles have driven
+        half of it.
+
+        With recycled traffic, the scene around the controlled vehicles is the same wherever they are on the straight
+        road, so moving it back makes the highway unbounded: episodes of any duration never reach the end of the
+        lanes. The vehicles within the recycling distance behind the controlled vehicles stay on the lanes. Absolute
+        positions (e.g. absolute kinematics observations) jump back when the scene is moved.
+        """
+        lane = self.road.network.get_lane(self.road.network.all_side_lanes(self.vehicle.lane_index)[0])
+        longitudinal = min(lane.local_coordinates(v.position)[0] for v in self.controlled_vehicles)
+        offset = longitudinal - 2 * self.config["recycle_distance"]
+        if longitudinal < lane.length / 2 or offset <= 0:
+            return
+        shift = offset * lane.direction
+        for vehicle in self.road.vehicles:
+            vehicle.position -= shift
+            for past in vehicle.history:
+                past.position -= shift
+        for obj in self.road.objects:
+            obj.position -= shift
 
     def _reward(self, action: Action) -> float:
         """
@@ -87,7 +161,7 @@ class HighwayEnv(AbstractEnv):
         :param action: the last action performed
         :return: the corresponding reward
         """
-        rewards = self._rewards(action)
+        rewards = self.perception.get("rewards", lambda: self._rewards(action))
         reward = sum(self.config.get(name, 0) * reward for name, reward in rewards.items())
         if self.config["normalize_reward"]:
             reward = utils.lmap(reward,
@@ -98,7 +172,7 @@ class HighwayEnv(AbstractEnv):
         return reward
 
     def _rewards(self, action: Action) -> Dict[Text, float]:
-        neighbours = self.road.network.all_side_lanes(self.vehicle.lane_index)
+        neighbours = self.perception.side_lanes(self.vehicle.lane_index)
         lane = self.vehicle.target_lane_index[2] if isinstance(self.vehicle, ControlledVehicle) \
             else self.vehicle.lane_index[2]
         # Use forward speed rather than speed, see https://github.com/eleurent/highway-env/issues/268
@@ -108,13 +182,13 @@ class HighwayEnv(AbstractEnv):
             "collision_reward": float(self.vehicle.crashed),
             "right_lane_reward": lane / max(len(neighbours) - 1, 1),
             "high_speed_reward": np.clip(scaled_speed, 0, 1),
-            "on_road_reward": float(self.vehicle.on_road)
+            "on_road_reward": float(self.perception.on_road(self.vehicle))
         }
 
     def _is_terminated(self) -> bool:
         """The episode is over if the ego vehicle crashed."""
         return (self.vehicle.crashed or
-                self.config["offroad_terminal"] and not self.vehicle.on_road)
+                self.config["offroad_terminal"] and not self.perception.on_road(self.vehicle))
 
     def _is_truncated(self) -> bool:
         """The episode is truncated if the time limit is reached."""
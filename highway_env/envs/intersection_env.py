@@ -123,6 +123,7 @@ class IntersectionEnv(AbstractEnv):
         obs, reward, terminated, truncated, info = super().step(action)
         self._clear_vehicles()
         self._spawn_vehicle(spawn_probability=self.config["spawn_probability"])
+        self.perception.clear()
         return obs, reward, terminated, truncated, info
 
     def _make_road(self) -> None:
@@ -15,6 +15,8 @@ class LaneKeepingEnv(AbstractEnv):
 
     """A lane keeping control task."""
 
+    SNAPSHOT_ATTRIBUTES = AbstractEnv.SNAPSHOT_ATTRIBUTES + ["lane", "lanes", "trajectory", "interval_trajectory"]
+
     def __init__(self, config: dict = None) -> None:
         super().__init__(config)
         self.lane = None
@@ -8,7 +8,6 @@ from highway_env.envs.common.abstract import AbstractEnv
 from highway_env.envs.common.observation import MultiAgentObservation, observation_factory
 from highway_env.road.lane import StraightLane, LineType
 from highway_env.road.road import Road, RoadNetwork
-from highway_env.vehicle.graphics import VehicleGraphics
 from highway_env.vehicle.kinematics import Vehicle
 from highway_env.vehicle.objects import Landmark, Obstacle
 
@@ -70,6 +69,8 @@ class ParkingEnv(AbstractEnv, GoalEnv):
             "normalize": False
         }}
 
+    SNAPSHOT_ATTRIBUTES = AbstractEnv.SNAPSHOT_ATTRIBUTES + ["goal"]
+
     def __init__(self, config: dict = None, render_mode: Optional[str] = None) -> None:
         super().__init__(config, render_mode)
         self.observation_type_parking = None
@@ -116,7 +117,7 @@ class ParkingEnv(AbstractEnv, GoalEnv):
         if isinstance(self.observation_type, MultiAgentObservation):
             success = tuple(self._is_success(agent_obs['achieved_goal'], agent_obs['desired_goal']) for agent_obs in obs)
         else:
-            obs = self.observation_type_parking.observe()
+            obs = self.perception.observe(self.observation_type_parking)
             success = self._is_success(obs['achieved_goal'], obs['desired_goal'])
         info.update({"is_success": success})
         return info
@@ -151,6 +152,7 @@ class ParkingEnv(AbstractEnv, GoalEnv):
         empty_spots = list(self.road.network.lanes_dict().keys())
 
         # Controlled vehicles
+        from highway_env.vehicle.graphics import VehicleGraphics  # Imports pygame, only when creating a scene
         self.controlled_vehicles = []
         for i in range(self.config["controlled_vehicles"]):
             vehicle = self.action_type.vehicle_class(self.road, [i*20, 0], 2*np.pi*self.np_random.uniform(), 0)
@@ -204,7 +206,7 @@ class ParkingEnv(AbstractEnv, GoalEnv):
         return -np.power(np.dot(np.abs(achieved_goal - desired_goal), np.array(self.config["reward_weights"])), p)
 
     def _reward(self, action: np.ndarray) -> float:
-        obs = self.observation_type_parking.observe()
+        obs = self.perception.observe(self.observation_type_parking)
         obs = obs if isinstance(obs, tuple) else (obs,)
         reward = sum(self.compute_reward(agent_obs['achieved_goal'], agent_obs['desired_goal'], {}) for agent_obs in obs)
         reward += self.config['collision_reward'] * sum(v.crashed for v in self.controlled_vehicles)
@@ -216,7 +218,7 @@ class ParkingEnv(AbstractEnv, GoalEnv):
     def _is_terminated(self) -> bool:
         """The episode is over if the ego vehicle crashed or the goal is reached or time is over."""
         crashed = any(vehicle.crashed for vehicle in self.controlled_vehicles)
-        obs = self.observation_type_parking.observe()
+        obs = self.perception.observe(self.observation_type_parking)
         obs = obs if isinstance(obs, tuple) else (obs,)
         success = all(self._is_success(agent_obs['achieved_goal'], agent_obs['desired_goal']) for agent_obs in obs)
         return bool(crashed or success)
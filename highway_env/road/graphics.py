@@ -1,10 +1,11 @@
+from collections import OrderedDict
 from typing import List, Tuple, Union, TYPE_CHECKING
 
 import numpy as np
 import pygame
 
 from highway_env.road.lane import LineType, AbstractLane
-from highway_env.road.road import Road
+from highway_env.road.road import Road, RoadNetwork
 from highway_env.utils import Vector
 from highway_env.vehicle.graphics import VehicleGraphics
 from highway_env.vehicle.objects import Obstacle, Landmark
@@ -34,6 +35,7 @@ class WorldSurface(pygame.Surface):
         self.origin = np.array([0, 0])
         self.scaling = self.INITIAL_SCALING
         self.centering_position = self.INITIAL_CENTERING
+        self.road_layer = None
 
     def pix(self, length: float) -> int:
         """
@@ -222,6 +224,66 @@ class LaneGraphics(object):
         pygame.draw.polygon(draw_surface, color, dots, 0)
 
 
+class RoadLayer(object):
+
+    """
+    The lanes of a road network pre-rendered at a given scaling.
+
+    The road is static, so its rendering is cut into square tiles aligned on the world pixel grid, which are drawn on
+    their first use and kept in a bounded cache. Displaying the road then only blits the tiles overlapping the
+    displayed area, at an offset given by the surface origin.
+    """
+
+    TILE_SIZE = 256
+    """The side of the tiles [px]."""
+
+    MAX_TILES = 64
+    """The maximum number of tiles kept in the cache."""
+
+    def __init__(self, network: RoadNetwork, scaling: float) -> None:
+        """
+        :param network: the road network
+        :param scaling: the number of pixels per meter [px/m]
+        """
+        self.network = network
+        self.scaling = scaling
+        self.tiles: 'OrderedDict[Tuple[int, int], WorldSurface]' = OrderedDict()
+
+    def tile(self, x: int, y: int, surface: pygame.Surface) -> WorldSurface:
+        """
+        Get a tile, drawing it if it is not in the cache.
+
+        :param x: the column of the tile
+        :param y: the row of the tile
+        :param surface: the surface on which the tile will be blitted, whose pixel format is used
+        :return: the tile
+        """
+        tile = self.tiles.get((x, y))
+        if tile is None:
+            tile = self.tiles[(x, y)] = WorldSurface((self.TILE_SIZE, self.TILE_SIZE), 0, surface)
+            tile.scaling = self.scaling
+            tile.origin = np.array([x, y]) * self.TILE_SIZE / self.scaling
+            tile.fill(tile.GREY)
+            for lane in self.network.lanes_list():
+                LaneGraphics.display(lane, tile)
+            if len(self.tiles) > self.MAX_TILES:
+                self.tiles.popitem(last=False)
+        self.tiles.move_to_end((x, y))
+        return tile
+
+    def display(self, surface: WorldSurface) -> None:
+        """
+        Blit the tiles overlapping the displayed area of a surface.
+
+        :param surface: the surface, with the same scaling as the layer
+        """
+        size = self.TILE_SIZE
+        left, top = np.floor(surface.origin * self.scaling).astype(int)
+        for row in range(top // size, (top + surface.get_height() - 1) // size + 1):
+            for column in range(left // size, (left + surface.get_width() - 1) // size + 1):
+                surface.blit(self.tile(column, row, surface), (column * size - left, row * size - top))
+
+
 class RoadGraphics(object):
 
     """A visualization of a road lanes and vehicles."""
@@ -231,14 +293,16 @@ class RoadGraphics(object):
         """
         Display the road lanes on a surface.
 
+        The lanes are drawn once in the road layer of the surface, which is drawn again only when the road network or
+        the surface scaling change.
+
         :param road: the road to be displayed
         :param surface: the pygame surface
         """
-        surface.fill(surface.GREY)
-        for _from in road.network.graph.keys():
-            for _to in road.network.graph[_from].keys():
-                for l in road.network.graph[_from][_to]:
-                    LaneGraphics.display(l, surface)
+        layer = surface.road_layer
+        if layer is None or layer.network is not road.network or layer.scaling != surface.scaling:
+            layer = surface.road_layer = RoadLayer(road.network, surface.scaling)
+        layer.display(surface)
 
     @staticmethod
     def display_traffic(road: Road, surface: WorldSurface, simulation_frequency: int = 15, offscreen: bool = False) \
@@ -1,6 +1,6 @@
 import numpy as np
 import logging
-from typing import List, Tuple, Dict, TYPE_CHECKING, Optional
+from typing import List, Tuple, Dict, TYPE_CHECKING, Optional, Set
 
 from highway_env.road.lane import LineType, StraightLane, AbstractLane, lane_from_config
 from highway_env.vehicle.objects import Landmark
@@ -326,6 +326,12 @@ class Road(object):
         self.objects = road_objects or []
         self.np_random = np_random if np_random else np.random.RandomState()
         self.record_history = record_history
+        self.lod_focus: List['kinematics.Vehicle'] = []
+        self.lod_distance: Optional[float] = None
+        self.lod_period = 1
+        self.distant_vehicles: List['kinematics.Vehicle'] = []
+        self._lod_frames = 0
+        self._lod_elapsed = 0.
 
     def close_objects_to(self, vehicle: 'kinematics.Vehicle', distance: float, count: Optional[int] = None,
                          see_behind: bool = True, sort: bool = True, vehicles_only: bool = False) -> object:
@@ -349,10 +355,31 @@ class Road(object):
                           see_behind: bool = True, sort: bool = True) -> object:
         return self.close_objects_to(vehicle, distance, count, see_behind, sort, vehicles_only=True)
 
+    def set_level_of_detail(self, focus: List['kinematics.Vehicle'], distance: Optional[float], period: int = 1) \
+            -> None:
+        """
+        Configure the level-of-detail scheduling of the vehicles.
+
+        Vehicles farther than a distance from all focus vehicles are simulated with their longitudinal model only,
+        following the center of their lane, and are updated once every few frames. They are promoted back to the full
+        decision and kinematics models as soon as they come within range of a focus vehicle.
+
+        :param focus: the vehicles around which the full models are used, typically the controlled vehicles
+        :param distance: the distance to the focus vehicles beyond which vehicles are distant [m], or None to disable
+        :param period: the number of frames between two updates of the distant vehicles
+        """
+        self.lod_focus = focus
+        self.lod_distance = distance
+        self.lod_period = max(int(period), 1)
+
     def act(self) -> None:
         """Decide the actions of each entity on the road."""
+        if self.lod_distance is not None or self.distant_vehicles:
+            self._update_level_of_detail()
+        distant = {id(vehicle) for vehicle in self.distant_vehicles}
         for vehicle in self.vehicles:
-            vehicle.act()
+            if id(vehicle) not in distant:
+                vehicle.act()
 
     def step(self, dt: float) -> None:
         """
@@ -360,14 +387,118 @@ class Road(object):
 
         :param dt: timestep [s]
         """
-        for vehicle in self.vehicles:
+        distant_ids = {id(vehicle) for vehicle in self.distant_vehicles}
+        vehicles = [vehicle for vehicle in self.vehicles if id(vehicle) not in distant_ids]
+        distant = [vehicle for vehicle in self.vehicles if id(vehicle) in distant_ids]
+        for vehicle in vehicles:
             vehicle.step(dt)
-        for i, vehicle in enumerate(self.vehicles):
-            for other in self.vehicles[i+1:]:
+        if self.lod_distance is not None or distant:
+            self._lod_frames += 1
+            self._lod_elapsed += dt
+            if self._lod_frames % self.lod_period == 0:
+                self._step_distant(distant, self._lod_elapsed)
+                self._lod_elapsed = 0.
+        # Distant vehicles follow their leader with a longitudinal model, and cannot collide with each other
+        for i, vehicle in enumerate(vehicles):
+            for other in vehicles[i+1:] + distant:
                 vehicle.handle_collisions(other, dt)
             for other in self.objects:
                 vehicle.handle_collisions(other, dt)
 
+    def _update_level_of_detail(self) -> None:
+        """Promote the distant vehicles within range of a focus vehicle, and demote the others on update frames."""
+        far = np.zeros(len(self.vehicles), dtype=bool)
+        if self.lod_distance is not None and self.lod_focus and self.vehicles:
+            positions = np.array([vehicle.position for vehicle in self.vehicles])
+            focus = np.array([vehicle.position for vehicle in self.lod_focus])
+            far = (np.linalg.norm(positions[:, None] - focus[None, :], axis=-1) > self.lod_distance).all(axis=1)
+        distant = {id(vehicle) for vehicle in self.distant_vehicles}
+        promoted = [vehicle for vehicle, is_far in zip(self.vehicles, far) if not is_far and id(vehicle) in distant]
+        if promoted and self._lod_elapsed > 0:
+            self._step_distant(promoted, self._lod_elapsed)  # Catch up before switching to the full models
+        if self._lod_frames % self.lod_period == 0:
+            self.distant_vehicles = [vehicle for vehicle, is_far in zip(self.vehicles, far)
+                                     if is_far and (id(vehicle) in distant or self._can_be_distant(vehicle))]
+        else:
+            promoted = {id(vehicle) for vehicle in promoted}
+            self.distant_vehicles = [vehicle for vehicle in self.distant_vehicles if id(vehicle) not in promoted]
+
+    def _can_be_distant(self, vehicle: 'kinematics.Vehicle') -> bool:
+        """Whether a vehicle can be simulated with its longitudinal model only: a behavioural vehicle in its lane."""
+        from highway_env.vehicle.behavior import IDMVehicle
+        return isinstance(vehicle, IDMVehicle) and not vehicle.crashed and vehicle.lane_index is not None \
+            and vehicle.target_lane_index == vehicle.lane_index \
+            and not any(vehicle is focus for focus in self.lod_focus)
+
+    def _step_distant(self, vehicles: List['kinematics.Vehicle'], dt: float) -> None:
+        """
+        Step distant vehicles along the center of their lane, with the acceleration of their longitudinal model.
+
+        :param vehicles: the distant vehicles
+        :param dt: timestep [s]
+        """
+        leaders = self._lane_leaders(vehicles)
+        for vehicle in vehicles:
+            acceleration = vehicle.acceleration(ego_vehicle=vehicle, front_vehicle=leaders.get(id(vehicle)))
+            vehicle.action = {"steering": 0., "acceleration": np.clip(acceleration, -vehicle.ACC_MAX, vehicle.ACC_MAX)}
+            vehicle.clip_actions()
+            lane_index, lane = vehicle.lane_index, vehicle.lane
+            longitudinal = lane.local_coordinates(vehicle.position)[0] + vehicle.speed * dt
+            while longitudinal > lane.length:
+                next_index = self.network.next_lane(lane_index, route=vehicle.route, position=vehicle.position,
+                                                    np_random=self.np_random)
+                if next_index == lane_index:
+                    break
+                longitudinal -= lane.length
+                lane_index, lane = next_index, self.network.get_lane(next_index)
+            vehicle.lane_index = vehicle.target_lane_index = lane_index
+            vehicle.lane = lane
+            vehicle.position = lane.position(longitudinal, 0)
+            vehicle.heading = lane.heading_at(longitudinal)
+            vehicle.speed += vehicle.action["acceleration"] * dt
+            vehicle.timer += dt
+
+    def _lane_leaders(self, vehicles: List['kinematics.Vehicle']) -> Dict[int, 'objects.RoadObject']:
+        """
+        Find the closest vehicle or obstacle ahead of each vehicle, among those in the same lane, or else the closest
+        one in the next lane, so that vehicles advanced past the end of their lane do not drive through it.
+
+        :param vehicles: the vehicles whose leaders must be found
+        :return: the leader of each vehicle having one, keyed by vehicle id
+        """
+        leaders = {}
+        for entities in self._lane_entities({vehicle.lane_index for vehicle in vehicles}).values():
+            for (_, entity), (_, leader) in zip(entities[:-1], entities[1:]):
+                leaders[id(entity)] = leader
+        next_lanes = {}
+        for vehicle in vehicles:
+            if id(vehicle) not in leaders:
+                route = list(vehicle.route) if vehicle.route else None  # Not consumed by the lookup
+                next_index = self.network.next_lane(vehicle.lane_index, route=route, position=vehicle.position)
+                if next_index != vehicle.lane_index:
+                    next_lanes[id(vehicle)] = next_index
+        next_entities = self._lane_entities(set(next_lanes.values()))
+        for vehicle_id, next_index in next_lanes.items():
+            if next_index in next_entities:
+                leaders[vehicle_id] = next_entities[next_index][0][1]
+        return leaders
+
+    def _lane_entities(self, lanes: Set[LaneIndex]) -> Dict[LaneIndex, List[Tuple[float, 'objects.RoadObject']]]:
+        """
+        List the vehicles and obstacles in some lanes.
+
+        :param lanes: the lane indexes
+        :return: the longitudinal coordinates and entities in each lane having some, sorted along the lane
+        """
+        by_lane: Dict[LaneIndex, List[Tuple[float, 'objects.RoadObject']]] = {}
+        for entity in self.vehicles + self.objects:
+            if entity.lane_index in lanes and not isinstance(entity, Landmark):
+                longitudinal = self.network.get_lane(entity.lane_index).local_coordinates(entity.position)[0]
+                by_lane.setdefault(entity.lane_index, []).append((longitudinal, entity))
+        for entities in by_lane.values():
+            entities.sort(key=lambda item: item[0])
+        return by_lane
+
     def neighbour_vehicles(self, vehicle: 'kinematics.Vehicle', lane_index: LaneIndex = None) \
             -> Tuple[Optional['kinematics.Vehicle'], Optional['kinematics.Vehicle']]:
         """
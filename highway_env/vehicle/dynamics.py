@@ -1,7 +1,6 @@
 from typing import Tuple, Callable
 
 import numpy as np
-import matplotlib.pyplot as plt
 
 from highway_env.road.road import Road
 from highway_env.utils import Vector
@@ -242,6 +241,7 @@ def plot(time: np.ndarray, xx: np.ndarray, uu: np.ndarray) -> None:
     pos_x, pos_y = xx[:, 0, 0], xx[:, 1, 0]
     psi_x, psi_y = np.cos(xx[:, 2, 0]), np.sin(xx[:, 2, 0])
     dir_x, dir_y = np.cos(xx[:, 2, 0] + uu[:, 0, 0]), np.sin(xx[:, 2, 0] + uu[:, 0, 0])
+    import matplotlib.pyplot as plt
     _, ax = plt.subplots(1, 1)
     ax.plot(pos_x, pos_y, linewidth=0.5)
     dir_scale = 1/5
@@ -1,4 +1,5 @@
 import itertools
+from collections import OrderedDict
 from typing import List, Tuple, TYPE_CHECKING
 
 import numpy as np
@@ -24,6 +25,14 @@ class VehicleGraphics(object):
     DEFAULT_COLOR = YELLOW
     EGO_COLOR = GREEN
 
+    SPRITE_CACHE_SIZE = 1024
+    """The maximum number of rotated vehicle sprites kept in the cache."""
+
+    SPRITE_ANGLE_RESOLUTION = 1
+    """The resolution of the headings and steering angles of the cached sprites [deg]."""
+
+    _sprites: 'OrderedDict[tuple, Tuple[pygame.SurfaceType, Tuple[float, float]]]' = OrderedDict()
+
     @classmethod
     def display(cls, vehicle: Vehicle, surface: "WorldSurface",
                 transparent: bool = False,
@@ -33,7 +42,8 @@ class VehicleGraphics(object):
         """
         Display a vehicle on a pygame surface.
 
-        The vehicle is represented as a colored rotated rectangle.
+        The vehicle is represented as a colored rotated rectangle. Its rotated sprite is drawn once for each class,
+        color, size, quantized heading and steering, and scaling, and then kept in an LRU cache.
 
         :param vehicle: the vehicle to be drawn
         :param surface: the surface to draw the vehicle on
@@ -44,6 +54,46 @@ class VehicleGraphics(object):
         if not surface.is_visible(vehicle.position):
             return
 
+        v = vehicle
+        h = v.heading if abs(v.heading) > 2 * np.pi / 180 else 0
+        angle = cls.quantize(np.rad2deg(-h))
+        steering = cls.quantize(np.rad2deg(v.action["steering"])) if type(v) in [Vehicle, BicycleVehicle] else None
+        color = cls.get_color(v, transparent)
+        key = (type(v), tuple(color), v.LENGTH, v.WIDTH, angle, steering, surface.scaling, draw_roof, offscreen)
+        sprite = cls._sprites.get(key)
+        if sprite is None:
+            sprite = cls._sprites[key] = cls.rotate(cls.sprite(v, surface, color, steering, draw_roof, offscreen),
+                                                    angle)
+            if len(cls._sprites) > cls.SPRITE_CACHE_SIZE:
+                cls._sprites.popitem(last=False)
+        cls._sprites.move_to_end(key)
+
+        # Centered rotation
+        rotated_image, offset = sprite
+        position = [*surface.pos2pix(v.position[0], v.position[1])]
+        surface.blit(rotated_image, (position[0] + offset[0], position[1] + offset[1]))
+
+        # Label
+        if label:
+            font = pygame.font.Font(None, 15)
+            text = "#{}".format(id(v) % 1000)
+            text = font.render(text, 1, (10, 10, 10), (255, 255, 255))
+            surface.blit(text, position)
+
+    @classmethod
+    def sprite(cls, vehicle: Vehicle, surface: "WorldSurface", color: Tuple[int], steering: float = None,
+               draw_roof: bool = False, offscreen: bool = False) -> pygame.SurfaceType:
+        """
+        Draw the sprite of a vehicle, heading to the right.
+
+        :param vehicle: the vehicle to be drawn
+        :param surface: the surface on which the sprite will be drawn, with its scaling
+        :param color: the color of the vehicle
+        :param steering: the steering angle of the front tires [deg], or None to draw no tires
+        :param draw_roof: whether the roof should be drawn
+        :param offscreen: whether the rendering should be done offscreen or not
+        :return: the sprite
+        """
         v = vehicle
         tire_length, tire_width = 1, 0.3
         headlight_length, headlight_width = 0.72, 0.6
@@ -65,7 +115,6 @@ class VehicleGraphics(object):
                                 surface.pix(length / 2 + (0.6*v.WIDTH) / 5),
                                 surface.pix(headlight_length),
                                 surface.pix(headlight_width))
-        color = cls.get_color(v, transparent)
         pygame.draw.rect(vehicle_surface, color, rect, 0)
         pygame.draw.rect(vehicle_surface, cls.lighten(color), rect_headlight_left, 0)
         pygame.draw.rect(vehicle_surface, cls.lighten(color), rect_headlight_right, 0)
@@ -78,38 +127,40 @@ class VehicleGraphics(object):
         pygame.draw.rect(vehicle_surface, cls.BLACK, rect, 1)
 
         # Tires
-        if type(vehicle) in [Vehicle, BicycleVehicle]:
+        if steering is not None:
             tire_positions = [[surface.pix(tire_length), surface.pix(length / 2 - v.WIDTH / 2)],
                               [surface.pix(tire_length), surface.pix(length / 2 + v.WIDTH / 2)],
                               [surface.pix(length - tire_length), surface.pix(length / 2 - v.WIDTH / 2)],
                               [surface.pix(length - tire_length), surface.pix(length / 2 + v.WIDTH / 2)]]
-            tire_angles = [0, 0, v.action["steering"], v.action["steering"]]
+            tire_angles = [0, 0, steering, steering]
             for tire_position, tire_angle in zip(tire_positions, tire_angles):
                 tire_surface = pygame.Surface((surface.pix(tire_length), surface.pix(tire_length)), pygame.SRCALPHA)
                 rect = (0, surface.pix(tire_length/2-tire_width/2), surface.pix(tire_length), surface.pix(tire_width))
                 pygame.draw.rect(tire_surface, cls.BLACK, rect, 0)
-                cls.blit_rotate(vehicle_surface, tire_surface, tire_position, np.rad2deg(-tire_angle))
+                cls.blit_rotate(vehicle_surface, tire_surface, tire_position, -tire_angle)
 
-        # Centered rotation
-        h = v.heading if abs(v.heading) > 2 * np.pi / 180 else 0
-        position = [*surface.pos2pix(v.position[0], v.position[1])]
         if not offscreen:
             # convert_alpha throws errors in offscreen mode
             # see https://stackoverflow.com/a/19057853
             vehicle_surface = pygame.Surface.convert_alpha(vehicle_surface)
-        cls.blit_rotate(surface, vehicle_surface, position, np.rad2deg(-h))
+        return vehicle_surface
 
-        # Label
-        if label:
-            font = pygame.font.Font(None, 15)
-            text = "#{}".format(id(v) % 1000)
-            text = font.render(text, 1, (10, 10, 10), (255, 255, 255))
-            surface.blit(text, position)
+    @classmethod
+    def quantize(cls, angle: float) -> float:
+        """Round an angle [deg] to the resolution of the cached sprites."""
+        return cls.SPRITE_ANGLE_RESOLUTION * round(angle / cls.SPRITE_ANGLE_RESOLUTION)
 
     @staticmethod
-    def blit_rotate(surf: pygame.SurfaceType, image: pygame.SurfaceType, pos: Vector, angle: float,
-                    origin_pos: Vector = None, show_rect: bool = False) -> None:
-        """Many thanks to https://stackoverflow.com/a/54714144."""
+    def rotate(image: pygame.SurfaceType, angle: float, origin_pos: Vector = None) \
+            -> Tuple[pygame.SurfaceType, Tuple[float, float]]:
+        """
+        Rotate an image around a pivot.
+
+        :param image: the image
+        :param angle: the rotation angle [deg]
+        :param origin_pos: the position of the pivot in the image, by default its center
+        :return: the rotated image, and the offset of its upper left corner from the position of the pivot
+        """
         # calculate the axis aligned bounding box of the rotated image
         w, h = image.get_size()
         box = [pygame.math.Vector2(p) for p in [(0, 0), (w, 0), (w, -h), (0, -h)]]
@@ -124,10 +175,17 @@ class VehicleGraphics(object):
         pivot_rotate = pivot.rotate(angle)
         pivot_move = pivot_rotate - pivot
 
-        # calculate the upper left origin of the rotated image
-        origin = (pos[0] - origin_pos[0] + min_box[0] - pivot_move[0], pos[1] - origin_pos[1] - max_box[1] + pivot_move[1])
+        # calculate the upper left origin of the rotated image, relative to the pivot
+        offset = (-origin_pos[0] + min_box[0] - pivot_move[0], -origin_pos[1] - max_box[1] + pivot_move[1])
         # get a rotated image
-        rotated_image = pygame.transform.rotate(image, angle)
+        return pygame.transform.rotate(image, angle), offset
+
+    @classmethod
+    def blit_rotate(cls, surf: pygame.SurfaceType, image: pygame.SurfaceType, pos: Vector, angle: float,
+                    origin_pos: Vector = None, show_rect: bool = False) -> None:
+        """Many thanks to https://stackoverflow.com/a/54714144."""
+        rotated_image, offset = cls.rotate(image, angle, origin_pos)
+        origin = (pos[0] + offset[0], pos[1] + offset[1])
         # rotate and blit the image
         surf.blit(rotated_image, origin)
         # draw rectangle around the image
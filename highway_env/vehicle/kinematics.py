@@ -45,6 +45,16 @@ class Vehicle(RoadObject):
         self.log = []
         self.history = deque(maxlen=self.HISTORY_SIZE)
 
+    @staticmethod
+    def default_spacing(speed: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        The default distance between a new vehicle and its front vehicle.
+
+        :param speed: the speed of the new vehicle [m/s]
+        :return: the spacing [m]
+        """
+        return 12 + 1.0 * speed
+
     @classmethod
     def create_random(cls, road: Road,
                       speed: float = None,
@@ -76,7 +86,7 @@ class Vehicle(RoadObject):
                 speed = road.np_random.uniform(0.7*lane.speed_limit, 0.8*lane.speed_limit)
             else:
                 speed = road.np_random.uniform(Vehicle.DEFAULT_INITIAL_SPEEDS[0], Vehicle.DEFAULT_INITIAL_SPEEDS[1])
-        default_spacing = 12+1.0*speed
+        default_spacing = cls.default_spacing(speed)
         offset = spacing * default_spacing * np.exp(-5 / 40 * len(road.network.graph[_from][_to]))
         x0 = np.max([lane.local_coordinates(v.position)[0] for v in road.vehicles]) \
             if len(road.vehicles) else 3*offset
@@ -84,6 +94,79 @@ class Vehicle(RoadObject):
         v = cls(road, lane.position(x0, 0), lane.heading_at(x0), speed)
         return v
 
+    @classmethod
+    def create_random_batch(cls, road: Road,
+                            count: int,
+                            speed: Union[None, float, np.ndarray] = None,
+                            lane_from: Optional[str] = None,
+                            lane_to: Optional[str] = None,
+                            lane_id: Union[None, int, np.ndarray] = None,
+                            spacing: float = 1) \
+            -> List["Vehicle"]:
+        """
+        Create several random vehicles on the road, each placed behind the previous one.
+
+        The vehicles follow the same distribution as successive calls to :py:meth:`create_random`, each vehicle being
+        added to the road before creating the next one. However, the lanes, speeds and spacings are drawn for all
+        vehicles at once, and the longitudinal positions are obtained from cumulative offsets, instead of projecting
+        all the vehicles of the road for each new vehicle. The lanes are assumed to share the same longitudinal
+        coordinates, as the parallel lanes of a road do.
+
+        :param road: the road where the vehicles are driving
+        :param count: the number of vehicles to create
+        :param speed: initial speed in [m/s], for all vehicles or for each vehicle. If None, will be chosen randomly
+        :param lane_from: start node of the lane to spawn in
+        :param lane_to: end node of the lane to spawn in
+        :param lane_id: id of the lane to spawn in, for all vehicles or for each vehicle
+        :param spacing: ratio of spacing to the front vehicle, 1 being the default
+        :return: the vehicles with random positions and/or speeds, in order of creation. They are not added to the road.
+        """
+        if count <= 0:
+            return []
+        graph = road.network.graph
+        _from = np.full(count, lane_from, dtype=object) if lane_from \
+            else road.np_random.choice(list(graph.keys()), size=count).astype(object)
+        _to = np.full(count, lane_to, dtype=object) if lane_to else np.empty(count, dtype=object)
+        if not lane_to:
+            for start in dict.fromkeys(_from):
+                mask = _from == start
+                _to[mask] = road.np_random.choice(list(graph[start].keys()), size=mask.sum())
+        if lane_id is not None:
+            _id = np.broadcast_to(np.asarray(lane_id, dtype=int), (count,))
+        else:
+            _id = np.empty(count, dtype=int)
+            for edge in dict.fromkeys(zip(_from, _to)):
+                mask = (_from == edge[0]) & (_to == edge[1])
+                _id[mask] = road.np_random.choice(len(graph[edge[0]][edge[1]]), size=mask.sum())
+        lane_indexes = list(zip(_from, _to, _id.tolist()))
+        lanes = {index: road.network.get_lane(index) for index in dict.fromkeys(lane_indexes)}
+        vehicle_lanes = [lanes[index] for index in lane_indexes]
+
+        if speed is None:
+            limits = np.array([lane.speed_limit if lane.speed_limit is not None else np.nan for lane in vehicle_lanes])
+            speed = road.np_random.uniform(np.where(np.isnan(limits), Vehicle.DEFAULT_INITIAL_SPEEDS[0], 0.7*limits),
+                                           np.where(np.isnan(limits), Vehicle.DEFAULT_INITIAL_SPEEDS[1], 0.8*limits))
+        speed = np.broadcast_to(np.asarray(speed, dtype=float), (count,))
+        lanes_count = np.array([len(graph[start][end]) for start, end, _ in lane_indexes])
+        default_spacing = cls.default_spacing(speed)
+        offset = spacing * default_spacing * np.exp(-5 / 40 * lanes_count)
+
+        # Each vehicle is placed behind the furthest vehicle x_{k-1} of the road: x_k = max(x0_k, x_{k-1}) + gap_k,
+        # where x0_k is the furthest position of the vehicles already on the road, which unrolls to
+        # x_k = S_k + max_{j <= k}(x0_j - S_{j-1}) with S the cumulative gaps.
+        x0 = np.full(count, -np.inf)
+        if len(road.vehicles):
+            furthest = {index: np.max([lane.local_coordinates(v.position)[0] for v in road.vehicles])
+                        for index, lane in lanes.items()}
+            x0[:] = [furthest[index] for index in lane_indexes]
+        else:
+            x0[0] = 3*offset[0]
+        gaps = offset * road.np_random.uniform(0.9, 1.1, size=count)
+        cumulative_gaps = np.cumsum(gaps)
+        x = cumulative_gaps + np.maximum.accumulate(x0 - (cumulative_gaps - gaps))
+        return [cls(road, lane.position(x_k, 0), lane.heading_at(x_k), speed_k)
+                for lane, x_k, speed_k in zip(vehicle_lanes, x.tolist(), speed.tolist())]
+
     @classmethod
     def create_from(cls, vehicle: "Vehicle") -> "Vehicle":
         """
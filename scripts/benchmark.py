@@ -0,0 +1,271 @@
+"""
+Performance benchmark of the environments, with regression gates against a stored baseline.
+
+Each benchmark case measures the wall time of an operation (a step, a reset, a copy of the state...) averaged over
+several calls, and repeated to keep the median. The results are written as JSON, and can be saved as a baseline and
+compared against it: a case is flagged as a regression when it is slower than its baseline time by more than a
+threshold, or when it fails to run, in which case the script exits with a non-zero status.
+
+Usage:
+    python scripts/benchmark.py --save-baseline benchmark_baseline.json
+    python scripts/benchmark.py --baseline benchmark_baseline.json --threshold 0.2 --output results.json
+    python scripts/benchmark.py --filter "highway-v0" --quick
+"""
+import argparse
+import contextlib
+import copy
+import json
+import platform
+import re
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import gymnasium as gym
+import numpy as np
+
+import highway_env
+
+highway_env.register_highway_envs()
+
+VEHICLES_COUNTS = [20, 50, 100, 200]
+"""The numbers of vehicles of the traffic scaling cases."""
+
+OBSERVATIONS = {
+    "Kinematics": {"type": "Kinematics"},
+    "OccupancyGrid": {"type": "OccupancyGrid"},
+    "Lidar": {"type": "LidarObservation"},
+    "TTC": {"type": "TimeToCollision"},
+    "Grayscale": {"type": "GrayscaleObservation", "observation_shape": (128, 64), "stack_size": 4,
+                  "weights": [0.2989, 0.5870, 0.1140]},
+}
+"""The observation types of the observation cases."""
+
+RENDERING_BACKENDS = ["pygame", "numpy"]
+"""The rendering backends of the rendering cases."""
+
+ACTIONS = {
+    "DiscreteMetaAction": {"type": "DiscreteMetaAction"},
+    "DiscreteAction": {"type": "DiscreteAction"},
+    "ContinuousAction": {"type": "ContinuousAction"},
+}
+"""The action types of the action cases."""
+
+FYP_ACTION_TYPES = ["high-level", "continuous", "low-level-speed-up-1"]
+"""The action types of the FYP wrapper cases."""
+
+HEADLESS_WORKER = "\n".join([
+    "import gymnasium as gym",
+    "import highway_env",
+    "highway_env.register_highway_envs()",
+    "env = gym.make('highway-v0')",
+    "env.reset(seed=0)",
+    "env.step(env.action_space.sample())",
+])
+"""A worker process creating and stepping an environment without rendering, to time the startup from a cold
+interpreter."""
+
+Case = Tuple[str, Callable[[], Callable[[], None]]]
+"""A benchmark case: its name, and a setup function returning the operation to time."""
+
+
+def registered_envs() -> List[str]:
+    """The ids of the registered highway-env environments."""
+    return sorted(env_id for env_id, spec in gym.registry.items()
+                  if isinstance(spec.entry_point, str) and spec.entry_point.startswith("highway_env."))
+
+
+def step_operation(env: gym.Env, seed: int = 0) -> Callable[[], None]:
+    """An operation performing a random step of an environment, resetting it at the end of episodes."""
+    env.reset(seed=seed)
+    env.action_space.seed(seed)
+
+    def step():
+        _, _, terminated, truncated, _ = env.step(env.action_space.sample())
+        if terminated or truncated:
+            env.reset()
+    return step
+
+
+def make_env(env_id: str, config: Optional[dict] = None) -> gym.Env:
+    env = gym.make(env_id)
+    if config:
+        env.unwrapped.configure(config)
+    return env
+
+
+def cases() -> Iterator[Case]:
+    """All the benchmark cases."""
+    yield "startup/headless-worker", \
+        lambda: lambda: subprocess.run([sys.executable, "-c", HEADLESS_WORKER], check=True, capture_output=True)
+
+    for env_id in registered_envs():
+        yield "step/{}".format(env_id), lambda env_id=env_id: step_operation(make_env(env_id))
+        yield "reset/{}".format(env_id), lambda env_id=env_id: make_env(env_id).reset
+
+    for count in VEHICLES_COUNTS:
+        yield "step/highway-v0/vehicles={}".format(count), \
+            lambda count=count: step_operation(make_env("highway-v0", {"vehicles_count": count}))
+        yield "reset/highway-v0/vehicles={}".format(count), \
+            lambda count=count: make_env("highway-v0", {"vehicles_count": count}).reset
+
+    for name, observation in OBSERVATIONS.items():
+        yield "observation/{}".format(name), \
+            lambda observation=observation: step_operation(make_env("highway-v0", {"observation": observation}))
+
+    for backend in RENDERING_BACKENDS:
+        def render_setup(backend=backend):
+            env = gym.make("highway-v0", render_mode="rgb_array",
+                           config={"offscreen_rendering": True, "rendering_backend": backend})
+            env.reset(seed=0)
+            return env.render
+        yield "render/{}".format(backend), render_setup
+
+    for name, action in ACTIONS.items():
+        yield "action/{}".format(name), \
+            lambda action=action: step_operation(make_env("highway-v0", {"action": action}))
+
+    def deepcopy_setup():
+        env = make_env("highway-v0")
+        env.reset(seed=0)
+        return lambda: copy.deepcopy(env.unwrapped)
+    yield "copy/deepcopy", deepcopy_setup
+
+    def snapshot_setup():
+        env = make_env("highway-v0")
+        env.reset(seed=0)
+        return lambda: env.unwrapped.set_state(env.unwrapped.get_state())
+    yield "copy/snapshot", snapshot_setup
+
+    def variant_setup():
+        env = make_env("highway-v0")
+        env.reset(seed=0)
+        return env.unwrapped.variant
+    yield "copy/variant", variant_setup
+
+    def randomize_setup():
+        env = make_env("highway-v0")
+        env.reset(seed=0)
+        return env.unwrapped.randomize_behavior
+    yield "copy/randomize_behavior", randomize_setup
+
+    for action_type in FYP_ACTION_TYPES:
+        def fyp_setup(action_type=action_type):
+            from FYP.agent_components.config_env import ConfigEnv
+            return step_operation(ConfigEnv().create(action_type=action_type))
+        yield "fyp/{}".format(action_type), fyp_setup
+
+
+def measure(operation: Callable[[], None], calls: int, repeats: int) -> Dict[str, float]:
+    """
+    Time an operation.
+
+    :param operation: the operation
+    :param calls: the number of calls averaged in each repetition
+    :param repeats: the number of repetitions
+    :return: the median, minimum and maximum over repetitions of the mean time per call [s]
+    """
+    operation()  # Warm up
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            operation()
+        times.append((time.perf_counter() - start) / calls)
+    return {"median": float(np.median(times)), "min": float(np.min(times)), "max": float(np.max(times)),
+            "calls": calls, "repeats": repeats}
+
+
+def run(pattern: Optional[str], calls: int, repeats: int) -> Dict[str, Dict[str, float]]:
+    """
+    Run the benchmark cases whose names match a pattern.
+
+    :param pattern: a regular expression searched in the case names, or None for all cases
+    :param calls: the number of calls averaged in each repetition
+    :param repeats: the number of repetitions
+    :return: the results of each case, or the error that prevented it from running
+    """
+    results = {}
+    for name, setup in cases():
+        if pattern and not re.search(pattern, name):
+            continue
+        try:
+            results[name] = measure(setup(), calls, repeats)
+        except Exception as e:  # e.g. a missing optional dependency
+            results[name] = {"error": "{}: {}".format(type(e).__name__, e)}
+        print("{:<45} {}".format(name, "{:10.3f} ms".format(1000 * results[name]["median"])
+                                 if "median" in results[name] else results[name]["error"]), file=sys.stderr)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) \
+        -> Dict[str, Dict[str, float]]:
+    """
+    Compare results against a baseline.
+
+    :param results: the results of the cases
+    :param baseline: the baseline results of the cases
+    :param threshold: the relative slowdown above which a case is a regression
+    :return: the regressions, with their baseline and current times and their ratio, or the error of the cases that
+             no longer run
+    """
+    regressions = {}
+    for name, result in results.items():
+        reference = baseline.get(name, {})
+        if "median" not in reference:
+            continue
+        if "error" in result:
+            regressions[name] = {"baseline": reference["median"], "error": result["error"]}
+            continue
+        ratio = result["median"] / reference["median"]
+        if ratio > 1 + threshold:
+            regressions[name] = {"baseline": reference["median"], "current": result["median"], "ratio": ratio}
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", help="regular expression selecting the cases to run")
+    parser.add_argument("--calls", type=int, default=20, help="number of calls averaged in each repetition")
+    parser.add_argument("--repeats", type=int, default=3, help="number of repetitions, of which the median is kept")
+    parser.add_argument("--quick", action="store_true", help="a single repetition of a few calls")
+    parser.add_argument("--output", help="JSON file where the results are written, instead of the standard output")
+    parser.add_argument("--baseline", help="JSON file of baseline results to compare against")
+    parser.add_argument("--save-baseline", help="JSON file where the results are saved as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown above which a case is flagged as a regression")
+    args = parser.parse_args(argv)
+    calls, repeats = (3, 1) if args.quick else (args.calls, args.repeats)
+
+    report = {
+        "metadata": {"python": platform.python_version(), "platform": platform.platform(),
+                     "highway_env": getattr(highway_env, "__version__", None), "time": time.time()},
+    }
+    with contextlib.redirect_stdout(sys.stderr):  # Keep the standard output for the JSON report
+        report["results"] = run(args.filter, calls, repeats)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        report["regressions"] = compare(report["results"], baseline, args.threshold)
+        for name, regression in report["regressions"].items():
+            if "error" in regression:
+                print("REGRESSION {:<45} {:10.3f} ms -> {}".format(
+                    name, 1000 * regression["baseline"], regression["error"]), file=sys.stderr)
+            else:
+                print("REGRESSION {:<45} {:10.3f} ms -> {:10.3f} ms (x{:.2f})".format(
+                    name, 1000 * regression["baseline"], 1000 * regression["current"], regression["ratio"]),
+                    file=sys.stderr)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Render the episodes of a trace recorded with the "trace" configuration of the environments.
+
+The episodes are rendered again from the recorded kinematics alone, without simulating them, either with the pygame
+viewer or with the NumPy rasterizer. They are displayed in a window, or encoded as videos in an output folder.
+
+Usage:
+    python scripts/replay_trace.py eval_logs/traces/
+    python scripts/replay_trace.py eval_logs/traces/ --episodes 0 3 --backend numpy --output video_recordings/
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from highway_env.envs.common.trace import Trace, TraceReplay
+from highway_env.envs.common.video import VideoEncoder
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace", help="directory of the trace")
+    parser.add_argument("--episodes", type=int, nargs="*", help="indexes of the episodes to render, by default all")
+    parser.add_argument("--backend", choices=["pygame", "numpy"],
+                        help="rendering backend of the videos, by default that of the recorded environment")
+    parser.add_argument("--output", help="folder where the videos are written, instead of displaying the episodes")
+    parser.add_argument("--fps", type=float, help="frame rate of the replay, by default the simulation frequency")
+    args = parser.parse_args(argv)
+
+    trace = Trace(args.trace)
+    config = {"rendering_backend": args.backend} if args.backend else {}
+    if not args.output:
+        config.update(offscreen_rendering=False, real_time_rendering=True, rendering_backend="pygame")
+    replay = TraceReplay(trace, render_mode="rgb_array" if args.output else "human", config=config)
+    encoder = VideoEncoder() if args.output else None
+    fps = args.fps or replay.config.get("simulation_frequency", 15)
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    try:
+        for episode in (args.episodes if args.episodes is not None else range(len(trace))):
+            if encoder:
+                encoder.open(os.path.join(args.output, "trace-episode-{}.mp4".format(episode)), fps)
+            for frame in replay.episode(episode, fps):
+                if encoder:
+                    encoder.write(frame)
+            if encoder:
+                encoder.end()
+            print("Episode {}: {} frames".format(episode, len(trace.frames(episode))), file=sys.stderr)
+    finally:
+        replay.close()
+        if encoder:
+            encoder.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
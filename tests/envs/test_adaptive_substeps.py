@@ -0,0 +1,45 @@
+import gymnasium as gym
+import pytest
+import highway_env
+from highway_env.vehicle.behavior import IDMVehicle
+
+highway_env.register_highway_envs()
+
+
+def count_integration_steps(env, actions):
+    road = env.unwrapped.road
+    durations = []
+    road_step = road.step
+    road.step = lambda dt: durations.append(dt) or road_step(dt)
+    for action in actions:
+        env.step(action)
+    return durations
+
+
+def test_simulated_time():
+    for adaptive in [False, True]:
+        env = gym.make("highway-v0", config={"adaptive_substeps": adaptive, "vehicles_count": 3,
+                                             "vehicles_density": 0.2})
+        env.reset(seed=0)
+        durations = count_integration_steps(env, [1] * 5)
+        assert env.unwrapped.time == 5
+        assert env.unwrapped.steps == 5 * env.unwrapped.config["simulation_frequency"]
+        assert sum(durations) == pytest.approx(5)
+        if adaptive:
+            assert len(durations) < 5 * env.unwrapped.config["simulation_frequency"]
+            assert max(durations) <= env.unwrapped.config["max_substeps"] / \
+                env.unwrapped.config["simulation_frequency"]
+
+
+def test_fine_steps_near_conflicts():
+    env = gym.make("highway-v0", config={"adaptive_substeps": True, "vehicles_count": 0})
+    env.reset(seed=0)
+    ego = env.unwrapped.vehicle
+    env.unwrapped.road.vehicles.append(IDMVehicle(env.unwrapped.road, ego.position + [20, 0], speed=ego.speed))
+    durations = count_integration_steps(env, [1])
+    assert len(durations) == env.unwrapped.config["simulation_frequency"]
+
+    # Lane change
+    env.reset(seed=0)
+    durations = count_integration_steps(env, [0])
+    assert len(durations) == env.unwrapped.config["simulation_frequency"]
@@ -0,0 +1,125 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+
+import highway_env
+from highway_env.envs.batched_highway_env import BatchedHighwayEnv
+from highway_env.road.lane import StraightLane
+from highway_env.vehicle.kinematics import Vehicle
+
+highway_env.register_highway_envs()
+
+
+def test_spaces():
+    env = BatchedHighwayEnv(num_envs=8)
+    obs, info = env.reset(seed=0)
+    assert obs.shape == (8, 5, 5) and obs.dtype == np.float32
+    assert env.observation_space.contains(obs)
+    for _ in range(3):
+        obs, reward, terminated, truncated, info = env.step(env.action_space.sample())
+        assert env.observation_space.contains(obs)
+        assert reward.shape == terminated.shape == truncated.shape == (8,)
+        assert np.all((0 <= reward) & (reward <= 1))
+    env.close()
+
+
+def test_seeding():
+    first, second = BatchedHighwayEnv(num_envs=4), BatchedHighwayEnv(num_envs=4)
+    actions = np.random.default_rng(0).uniform(-1, 1, size=(5, 4, 2))
+    for env in [first, second]:
+        env.obs, _ = env.reset(seed=42)
+        env.trajectory = [env.step(action)[0] for action in actions]
+    assert np.array_equal(first.obs, second.obs)
+    assert np.array_equal(first.trajectory, second.trajectory)
+
+
+@pytest.mark.parametrize("action", [[0.5, 0.0], [-0.3, 0.2]])
+def test_ego_kinematics(action):
+    env = BatchedHighwayEnv(num_envs=1, config={"vehicles_count": 0, "initial_lane_id": 1})
+    env.reset(seed=0)
+    vehicle = Vehicle(road=None, position=[env.x[0, 0], env.y[0, 0]], heading=0, speed=env.speed[0, 0])
+    vehicle.lane = StraightLane([0, 4], [1000, 4])
+    vehicle.act({"acceleration": np.interp(action[0], [-1, 1], [-5, 5]),
+                 "steering": np.interp(action[1], [-1, 1], [-np.pi / 4, np.pi / 4])})
+    env.step(np.array([action]))
+    for _ in range(15):
+        vehicle.step(1 / 15)
+    assert np.allclose([env.x[0, 0], env.y[0, 0]], vehicle.position)
+    assert np.isclose(env.heading[0, 0], vehicle.heading)
+    assert np.isclose(env.speed[0, 0], vehicle.speed)
+
+
+def test_crash_autoreset():
+    env = BatchedHighwayEnv(num_envs=2)
+    env.reset(seed=0)
+    # Put the vehicle just ahead of the first ego-vehicle onto its path
+    env.x[0, 1], env.y[0, 1] = env.x[0, 0] + 3, env.y[0, 0]
+    env.speed[0, 1] = env.target_speed[0, 1] = 0
+    obs, reward, terminated, truncated, info = env.step(np.zeros((2, 2)))
+    assert terminated.tolist() == [True, False]
+    assert info["_final_observation"].tolist() == [True, False]
+    assert info["final_info"][0]["crashed"]
+    assert not env.crashed[0].any()
+    assert env.observation_space.contains(obs)
+
+
+def test_paused_scene():
+    env = BatchedHighwayEnv(num_envs=2)
+    env.reset(seed=0)
+    state = {name: getattr(env, name)[1].copy() for name in env.STATE}
+    env.paused[1] = True
+    obs, reward, terminated, truncated, info = env.step(np.ones((2, 2)))
+    assert all(np.array_equal(getattr(env, name)[1], value) for name, value in state.items())
+    assert env.time[1] == 0 and env.time[0] > 0
+
+
+@pytest.mark.parametrize("seed", [0, 1, 4])
+def test_traffic_as_highway_env(seed):
+    """The vectorized IDM and MOBIL models follow the vehicles of HighwayEnv, from the same scene."""
+    config = {"action": {"type": "ContinuousAction"}, "vehicles_count": 30}
+    env = gym.make("highway-v0", config=config).unwrapped
+    env.reset(seed=seed)
+    vehicles = env.road.vehicles
+    batched = BatchedHighwayEnv(num_envs=1, config=dict(config, vehicles_count=len(vehicles) - 1))
+    batched.reset(seed=0)
+    batched.x[0], batched.y[0] = np.array([v.position for v in vehicles]).T
+    batched.heading[0] = [v.heading for v in vehicles]
+    batched.speed[0] = [v.speed for v in vehicles]
+    batched.lane[0] = [v.lane_index[2] for v in vehicles]
+    batched.target_lane[0] = [vehicles[0].lane_index[2]] + [v.target_lane_index[2] for v in vehicles[1:]]
+    batched.target_speed[0, 1:] = [v.target_speed for v in vehicles[1:]]
+    batched.delta[0, 1:] = [v.DELTA for v in vehicles[1:]]
+    batched.timer[0, 1:] = [v.timer for v in vehicles[1:]]
+
+    lane_changes = 0
+    for _ in range(10):
+        lanes = batched.lane[0].copy()
+        env.step(np.zeros(2))
+        batched.step(np.zeros((1, 2)))
+        assert np.allclose(batched.x[0], [v.position[0] for v in vehicles])
+        assert np.allclose(batched.y[0], [v.position[1] for v in vehicles])
+        assert batched.lane[0].tolist() == [v.lane_index[2] for v in vehicles]
+        assert batched.target_lane[0, 1:].tolist() == [v.target_lane_index[2] for v in vehicles[1:]]
+        lane_changes += np.count_nonzero(batched.lane[0] != lanes)
+    assert lane_changes > 0
+
+
+@pytest.mark.parametrize("config", [{"observation": {"type": "Kinematics", "order": "shuffled"}},
+                                    {"observation": {"type": "Kinematics", "compact": "int8"}},
+                                    {"observation": {"type": "Kinematics", "unknown_option": 1}},
+                                    {"action": {"type": "ContinuousAction", "dynamical": True}},
+                                    {"action": {"type": "ContinuousAction", "speed_range": [0, 20]}}])
+def test_unsupported_config(config):
+    with pytest.raises(ValueError):
+        BatchedHighwayEnv(num_envs=1, config=config)
+
+
+def test_observation_options():
+    config = {"vehicles_count": 10, "observation": {"type": "Kinematics", "normalize": False, "absolute": True,
+                                                    "see_behind": True}}
+    env = BatchedHighwayEnv(num_envs=1, config=config)
+    env.reset(seed=0)
+    env.x[0, 1], env.y[0, 1] = env.x[0, 0] - 10, env.y[0, 0]  # A vehicle behind the ego-vehicle
+    obs = env._observe()
+    assert np.isclose(obs[0, 0, 1], env.x[0, 0])
+    assert np.isclose(obs[0, 1, 1], env.x[0, 1])  # The nearest vehicle, behind, in absolute coordinates
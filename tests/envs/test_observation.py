@@ -0,0 +1,133 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+
+import highway_env
+from highway_env.envs.common.observation import FEATURE_EXTRACTORS, register_feature
+
+highway_env.register_highway_envs()
+
+
+@pytest.mark.parametrize("see_behind, order", [(False, "sorted"), (True, "sorted"), (True, "shuffled")])
+def test_batched_multi_agent_observation(see_behind, order):
+    env = gym.make("intersection-multi-agent-v0")
+    env.unwrapped.configure({
+        "controlled_vehicles": 4,
+        "observation": {
+            "type": "MultiAgentObservation",
+            "observation_config": {
+                "type": "Kinematics",
+                "vehicles_count": 6,
+                "features": ["presence", "x", "y", "vx", "vy", "cos_h", "sin_h", "long_off", "lat_off"],
+                "see_behind": see_behind,
+                "order": order,
+            }
+        }
+    })
+    env.reset(seed=0)
+    for _ in range(3):
+        env.step(env.action_space.sample())
+        observation_type = env.unwrapped.observation_type
+        batched = observation_type.observe_kinematics_batch()
+        expected = tuple(obs_type.observe() for obs_type in observation_type.agents_observation_types)
+        assert len(batched) == len(expected) == 4
+        for obs, expected_obs in zip(batched, expected):
+            assert obs.dtype == expected_obs.dtype
+            if order == "sorted":
+                np.testing.assert_allclose(obs, expected_obs, atol=1e-6)
+            else:
+                np.testing.assert_allclose(obs[0], expected_obs[0], atol=1e-6)
+                assert np.isclose(obs[1:].sum(), expected_obs[1:].sum(), atol=1e-4)
+    env.close()
+
+
+@pytest.mark.parametrize("observation_config", [
+    {"type": "Kinematics"},
+    {"type": "OccupancyGrid", "features": ["presence", "vx", "vy", "on_road"]},
+    {"type": "LidarObservation"},
+    {"type": "TimeToCollision"},
+])
+@pytest.mark.parametrize("compact", ["int8", "uint8", "float16"])
+def test_compact_observation(observation_config, compact):
+    env = gym.make("highway-v0")
+    env.unwrapped.configure({"observation": observation_config})
+    obs, _ = env.reset(seed=0)
+    env.unwrapped.configure({"observation": dict(observation_config, compact=compact)})
+    compact_obs, _ = env.reset(seed=0)
+    observation_type = env.unwrapped.observation_type
+
+    assert compact_obs.dtype == np.dtype(compact)
+    assert env.observation_space.contains(compact_obs)
+    np.testing.assert_allclose(observation_type.dequantize(compact_obs), obs,
+                               atol=observation_type.quantization_scale / 2 + 1e-3)
+    env.close()
+
+
+def test_compact_observation_requires_normalization():
+    env = gym.make("highway-v0")
+    env.unwrapped.configure({"observation": {"type": "Kinematics", "normalize": False, "compact": "int8"}})
+    with pytest.raises(ValueError):
+        env.reset()
+    env.close()
+
+
+def test_compact_goal_observation():
+    env = gym.make("parking-v0")
+    obs, _ = env.reset(seed=0)
+    env.unwrapped.configure({"observation": dict(env.unwrapped.config["observation"], compact="float16")})
+    compact_obs, _ = env.reset(seed=0)
+    assert env.observation_space.contains(compact_obs)
+    for key, value in compact_obs.items():
+        assert value.dtype == np.float16
+        np.testing.assert_allclose(value, obs[key], rtol=1e-3, atol=1e-3)
+    env.close()
+
+
+@pytest.mark.parametrize("env_id, observation_config", [
+    ("highway-v0", {"type": "GrayscaleObservation", "observation_shape": (84, 84), "stack_size": 4,
+                    "weights": [0.2989, 0.5870, 0.1140], "compact": "uint8"}),
+    ("parking-v0", {"type": "KinematicsGoal", "features": ["x", "y"], "scales": [100, 100], "compact": "int8"}),
+    ("highway-v0", {"type": "AttributesObservation", "attributes": ["time"], "compact": "int8"}),
+    ("highway-v0", {"type": "MultiAgentObservation", "observation_config": {"type": "Kinematics"},
+                    "compact": "float16"}),
+    ("highway-v0", {"type": "TupleObservation", "observation_configs": [{"type": "Kinematics"}],
+                    "compact": "float16"}),
+])
+def test_unsupported_compact_observation(env_id, observation_config):
+    env = gym.make(env_id)
+    env.unwrapped.configure({"observation": observation_config})
+    with pytest.raises(ValueError):
+        env.reset()
+    env.close()
+
+
+def test_kinematics_only_computes_requested_features():
+    env = gym.make("highway-v0")
+    env.reset(seed=0)
+    perception = env.unwrapped.perception
+    calls = []
+    lane_offset = perception.lane_offset
+    perception.lane_offset = lambda vehicle: calls.append(vehicle) or lane_offset(vehicle)
+
+    env.unwrapped.observation_type.observe()
+    assert not calls
+    env.unwrapped.configure({"observation": {"type": "Kinematics", "features": ["presence", "x", "lat_off"]}})
+    env.reset(seed=0)
+    perception.lane_offset = lambda vehicle: calls.append(vehicle) or lane_offset(vehicle)
+    obs = env.unwrapped.observation_type.observe()
+    assert calls
+    assert obs.shape == (5, 3)
+    env.close()
+
+
+def test_register_feature():
+    register_feature("speed")(lambda objects, context: np.array([o.speed for o in objects]))
+    try:
+        env = gym.make("highway-v0")
+        env.unwrapped.configure({"observation": {"type": "Kinematics", "features": ["presence", "speed"],
+                                                 "normalize": False}})
+        obs, _ = env.reset(seed=0)
+        assert obs[0, 1] == pytest.approx(env.unwrapped.vehicle.speed)
+        env.close()
+    finally:
+        del FEATURE_EXTRACTORS["speed"]
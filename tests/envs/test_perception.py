@@ -0,0 +1,33 @@
+import gymnasium as gym
+import numpy as np
+import highway_env
+
+highway_env.register_highway_envs()
+
+
+def test_perception_cache_is_step_scoped():
+    env = gym.make("highway-v0")
+    obs, _ = env.reset(seed=0)
+    perception = env.unwrapped.perception
+    assert perception.observe(env.unwrapped.observation_type) is obs
+
+    offset = perception.lane_offset(env.unwrapped.vehicle)
+    assert perception.lane_offset(env.unwrapped.vehicle) is offset
+
+    obs, _, _, _, _ = env.step(env.action_space.sample())
+    assert perception.observe(env.unwrapped.observation_type) is obs
+    assert np.allclose(perception.lane_offset(env.unwrapped.vehicle), env.unwrapped.vehicle.lane_offset)
+    env.close()
+
+
+def test_parking_observes_once_per_step():
+    env = gym.make("parking-v0")
+    env.reset(seed=0)
+    observation_type = env.unwrapped.observation_type_parking
+    calls = []
+    observe = observation_type.observe
+    observation_type.observe = lambda: calls.append(1) or observe()
+
+    env.step(env.action_space.sample())
+    env.close()
+    assert len(calls) == 1
@@ -0,0 +1,25 @@
+import gymnasium as gym
+import highway_env
+
+highway_env.register_highway_envs()
+
+
+def test_profiler():
+    env = gym.make("highway-v0", config={"profiling": True, "profiling_info": True, "vehicles_count": 10})
+    env.reset(seed=0)
+    profiler = env.unwrapped.profiler
+    for _ in range(3):
+        _, _, _, _, info = env.step(1)
+    frames = env.unwrapped.config["simulation_frequency"] // env.unwrapped.config["policy_frequency"]
+    summary = profiler.summary()
+    assert list(summary) == ["action", "road.act", "road.step", "observe", "reward", "info"]
+    assert summary["action"]["calls"] == 3 and summary["road.act"]["calls"] == 3 * frames
+    assert 0 < summary["road.step"]["p50"] <= summary["road.step"]["max"]
+    assert sum(profiler.histogram("road.act")[0]) == 3 * frames
+    assert set(info["profile"]) == set(summary)
+    assert info["profile"]["road.act"] < summary["road.act"]["total"]
+
+    # Disabled
+    env.reset(options={"config": {"profiling": False}})
+    _, _, _, _, info = env.step(1)
+    assert env.unwrapped.profiler is None and "profile" not in info
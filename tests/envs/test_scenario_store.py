@@ -0,0 +1,50 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+import highway_env
+from highway_env.envs.common.scenario_store import ScenarioStore
+
+highway_env.register_highway_envs()
+
+
+@pytest.mark.parametrize("action_type", ["DiscreteMetaAction", "ContinuousAction"])
+def test_replay_is_identical(tmp_path, action_type):
+    config = {"action": {"type": action_type}, "vehicles_count": 20}
+    seeds = [3, 4]
+    store = ScenarioStore.record(gym.make("highway-v0", config=config), str(tmp_path), seeds=seeds)
+    assert len(store) == 2 and store.seed(1) == 4
+
+    env = gym.make("highway-v0", config=dict(config, scenario_store=str(tmp_path)))
+    cold_env = gym.make("highway-v0", config=config)
+    env.action_space.seed(0)
+    for scenario_id, seed in enumerate(seeds):
+        obs, _ = env.reset(options={"scenario_id": scenario_id})
+        cold_obs, _ = cold_env.reset(seed=seed)
+        assert np.array_equal(obs, cold_obs)
+        for _ in range(5):
+            action = env.action_space.sample()
+            obs, reward, _, _, _ = env.step(action)
+            cold_obs, cold_reward, _, _, _ = cold_env.step(action)
+            assert np.array_equal(obs, cold_obs) and reward == cold_reward
+
+
+def test_scenario_without_store():
+    env = gym.make("highway-v0")
+    with pytest.raises(ValueError):
+        env.reset(options={"scenario_id": 0})
+
+
+def test_replay_keeps_action_config(tmp_path):
+    config = {"action": {"type": "DiscreteMetaAction", "target_speeds": [10, 15, 20]}, "vehicles_count": 20}
+    ScenarioStore.record(gym.make("highway-v0", config=config), str(tmp_path), seeds=[5])
+
+    env = gym.make("highway-v0", config=dict(config, scenario_store=str(tmp_path)))
+    cold_env = gym.make("highway-v0", config=config)
+    obs, _ = env.reset(options={"scenario_id": 0})
+    cold_obs, _ = cold_env.reset(seed=5)
+    assert np.array_equal(env.unwrapped.vehicle.target_speeds, [10, 15, 20])
+    assert env.unwrapped.vehicle.speed_index == cold_env.unwrapped.vehicle.speed_index
+    for action in [3, 3, 4, 0, 1]:
+        obs, reward, _, _, _ = env.step(action)
+        cold_obs, cold_reward, _, _, _ = cold_env.step(action)
+        assert np.array_equal(obs, cold_obs) and reward == cold_reward
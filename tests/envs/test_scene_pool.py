@@ -0,0 +1,41 @@
+import gymnasium as gym
+import numpy as np
+import highway_env
+
+highway_env.register_highway_envs()
+
+
+def rollout(seed, resets=3):
+    env = gym.make("highway-v0", config={"warm_reset_pool": 2})
+    env.reset(seed=seed)
+    observations = []
+    for _ in range(resets):
+        obs, _ = env.reset()
+        next_obs, _, _, _, _ = env.step(1)
+        observations.extend([obs, next_obs])
+    env.close()
+    return observations
+
+
+def test_warm_reset_reproducible():
+    first, second = rollout(seed=0), rollout(seed=0)
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+    assert not np.array_equal(first[0], rollout(seed=1)[0])
+
+
+def test_warm_reset_scene():
+    env = gym.make("highway-v0", config={"warm_reset_pool": 2, "vehicles_count": 10})
+    env.reset(seed=0)
+    unwrapped = env.unwrapped
+    generator = unwrapped.scene_pool.generator
+    assert unwrapped.road.np_random is unwrapped.np_random
+    assert unwrapped.vehicle in unwrapped.road.vehicles
+    assert unwrapped.observation_type.observer_vehicle is unwrapped.vehicle
+    assert len(unwrapped.road.vehicles) == 11
+
+    # Scenes are generated again when the configuration changes
+    env.reset(options={"config": {"vehicles_count": 5}})
+    assert len(unwrapped.road.vehicles) == 6
+    assert unwrapped.scene_pool.generator is not generator
+    env.close()
+    assert unwrapped.scene_pool is None
@@ -0,0 +1,115 @@
+import copy
+
+import gymnasium as gym
+import numpy as np
+import pytest
+
+import highway_env
+
+highway_env.register_highway_envs()
+
+
+def rollout(env, actions):
+    transitions = [env.step(action)[:3] for action in actions]
+    positions = np.array([v.position for v in env.unwrapped.road.vehicles])
+    return transitions, positions
+
+
+@pytest.mark.parametrize("env_spec", ["highway-v0", "intersection-v0", "parking-v0"])
+def test_snapshot_restore(env_spec):
+    env = gym.make(env_spec)
+    env.reset(seed=0)
+    env.action_space.seed(0)
+    actions = [env.action_space.sample() for _ in range(5)]
+    network = env.unwrapped.road.network
+
+    state = env.unwrapped.get_state()
+    transitions, positions = rollout(env, actions)
+    for _ in range(2):
+        env.unwrapped.set_state(state)
+        assert env.unwrapped.road.network is network
+        replay, replay_positions = rollout(env, actions)
+        assert replay_positions.shape == positions.shape
+        np.testing.assert_allclose(replay_positions, positions)
+        for (obs, reward, terminated), (replay_obs, replay_reward, replay_terminated) in zip(transitions, replay):
+            if isinstance(obs, dict):
+                for key in obs:
+                    np.testing.assert_allclose(obs[key], replay_obs[key])
+            else:
+                np.testing.assert_allclose(obs, replay_obs)
+            assert reward == pytest.approx(replay_reward)
+            assert terminated == replay_terminated
+    env.close()
+
+
+def test_snapshot_restore_previous_episode():
+    env = gym.make("highway-v0")
+    env.reset(seed=0)
+    state = env.unwrapped.get_state()
+    obs = env.unwrapped.observation_type.observe()
+    env.reset(seed=1)
+    env.unwrapped.set_state(state)
+    np.testing.assert_allclose(env.unwrapped.observation_type.observe(), obs)
+    assert env.unwrapped.vehicle in env.unwrapped.road.vehicles
+    env.close()
+
+
+@pytest.mark.parametrize("env_spec", ["highway-v0", "intersection-v0"])
+def test_variant_matches_deepcopy(env_spec):
+    env = gym.make(env_spec)
+    env.reset(seed=0)
+    env.action_space.seed(0)
+    for _ in range(2):
+        env.step(env.action_space.sample())
+    variant, env_copy = env.unwrapped.variant(), copy.deepcopy(env.unwrapped)
+    assert variant.road.network is env.unwrapped.road.network
+    for _ in range(3):
+        action = env.action_space.sample()
+        variant.step(action)
+        env_copy.step(action)
+    np.testing.assert_allclose([v.position for v in variant.road.vehicles],
+                               [v.position for v in env_copy.road.vehicles])
+    env.close()
+
+
+def test_variants_copy_on_write():
+    env = gym.make("highway-v0")
+    env.reset(seed=0)
+    original = env.unwrapped.road.vehicles
+    positions = np.array([v.position for v in original])
+
+    variant = env.unwrapped.set_vehicle_field(("target_speed", 0))
+    assert variant.vehicle is not env.unwrapped.vehicle
+    assert all(v.target_speed == 0 for v in variant.road.vehicles[1:])
+    assert all(v.target_speed > 0 for v in original[1:])
+    unchanged = env.unwrapped.randomize_behavior().change_vehicles("highway_env.vehicle.behavior.LinearVehicle")
+    shared = env.unwrapped.simplify()
+    assert any(v in original for v in shared.road.vehicles[1:])
+
+    # Simulating a variant or its owner clones the objects they share
+    variant.step(variant.action_space.sample())
+    np.testing.assert_allclose([v.position for v in original], positions)
+    shared_positions = np.array([v.position for v in shared.road.vehicles])
+    env.step(env.action_space.sample())
+    assert not any(v in original for v in shared.road.vehicles)
+    np.testing.assert_allclose([v.position for v in shared.road.vehicles], shared_positions)
+    assert all(type(v).__name__ == "LinearVehicle" for v in unchanged.road.vehicles[1:])
+    env.close()
+
+
+def test_variant_level_of_detail():
+    env = gym.make("highway-v0", config={"lod_distance": 50, "lod_period": 4, "vehicles_count": 30})
+    env.reset(seed=0)
+    env.step(env.action_space.sample())
+    variant, env_copy = env.unwrapped.variant(), copy.deepcopy(env.unwrapped)
+    assert variant.road.distant_vehicles and variant.road._lod_elapsed > 0
+    variant.own(variant.road.vehicles)
+    assert all(v in variant.road.vehicles for v in variant.road.distant_vehicles)
+    assert not any(v in env.unwrapped.road.vehicles for v in variant.road.distant_vehicles)
+    for _ in range(2):
+        action = env.action_space.sample()
+        variant.step(action)
+        env_copy.step(action)
+    np.testing.assert_allclose([v.position for v in variant.road.vehicles],
+                               [v.position for v in env_copy.road.vehicles])
+    env.close()
@@ -36,5 +36,22 @@ def test_running_time(repeat=1):
         assert real_time_ratio > 0.5  # let's not be too ambitious for now
 
 
+def test_variants_share_vehicles():
+    # Variants only clone the vehicles that they modify, their speed is measured by the copy/* cases of the benchmark
+    env = gym.make("highway-v0")
+    env.reset(seed=0)
+    original = env.unwrapped.road.vehicles
+    variant = env.unwrapped.variant()
+    assert variant.vehicle is not env.unwrapped.vehicle
+    assert all(v is o for v, o in zip(variant.road.vehicles[1:], original[1:]))
+
+    deltas = [v.DELTA for v in original[1:]]
+    randomized = env.unwrapped.randomize_behavior()
+    assert not any(v in original for v in randomized.road.vehicles)
+    assert [v.DELTA for v in original[1:]] == deltas
+    env.close()
+
+
 if __name__ == "__main__":
     test_running_time()
+    test_variants_share_vehicles()
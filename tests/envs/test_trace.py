@@ -0,0 +1,114 @@
+import gymnasium as gym
+import numpy as np
+import highway_env
+from highway_env.envs.common.trace import CONTROLLED, Trace, TraceRecorder, TraceReplay
+
+highway_env.register_highway_envs()
+
+
+def run_episodes(env, seeds):
+    """Run short episodes, and return the positions of the vehicles and the image at the end of each step."""
+    positions, images = [], []
+    for seed in seeds:
+        env.reset(seed=seed)
+        positions.append([])
+        for _ in range(3):
+            env.step(1)
+            positions[-1].append(np.array([v.position for v in env.unwrapped.road.vehicles]))
+            images.append(env.render())
+    return positions, images
+
+
+def test_record_and_replay(tmp_path):
+    config = {"vehicles_count": 10, "rendering_backend": "numpy", "trace": str(tmp_path)}
+    env = gym.make("highway-v0", render_mode="rgb_array", config=config)
+    positions, images = run_episodes(env, seeds=[0, 1])
+    env.close()
+
+    trace = Trace(str(tmp_path))
+    frequency = env.unwrapped.config["simulation_frequency"] // env.unwrapped.config["policy_frequency"]
+    assert len(trace) == 2
+    for episode in range(2):
+        frames = trace.frames(episode)
+        assert len(frames) == 1 + 3 * frequency  # The initial frame, then every simulation frame
+        for step in range(3):
+            rows = trace.rows(frames[(step + 1) * frequency])
+            recorded = np.stack([trace.columns["x"][rows], trace.columns["y"][rows]], axis=1)
+            assert np.array_equal(recorded, positions[episode][step].astype(np.float32))
+            assert trace.columns["flags"][rows][0] & CONTROLLED
+
+    replay = TraceReplay(trace)
+    replayed = [image for episode in range(2) for i, image in enumerate(replay.episode(episode))
+                if i and i % frequency == 0]
+    replay.close()
+    assert len(replayed) == len(images)
+    for image, expected in zip(replayed, images):
+        assert image.shape == expected.shape
+        assert np.mean(np.any(image != expected, axis=-1)) < 0.01
+
+
+
+def test_replay_adaptive_substeps(tmp_path):
+    config = {"vehicles_count": 1, "rendering_backend": "numpy", "adaptive_substeps": True, "trace": str(tmp_path)}
+    env = gym.make("highway-fast-v0", render_mode="rgb_array", config=config)
+    _, images = run_episodes(env, seeds=[0])
+    env.close()
+
+    trace = Trace(str(tmp_path))
+    frequency = env.unwrapped.config["simulation_frequency"] // env.unwrapped.config["policy_frequency"]
+    times = np.asarray(trace.columns["time"][trace.frames(0).start:trace.frames(0).stop])
+    assert len(times) < 1 + 3 * frequency  # Merged frames
+    # The replay holds the recorded frames on their time, so that it plays at the simulation frequency
+    replay = TraceReplay(trace)
+    replayed = list(replay.episode(0))
+    replay.close()
+    assert len(replayed) == 1 + 3 * frequency
+    for step, expected in enumerate(images):
+        assert np.mean(np.any(replayed[(step + 1) * frequency] != expected, axis=-1)) < 0.01
+
+
+def test_record_recycled_traffic(tmp_path):
+    config = {"vehicles_count": 10, "recycle_distance": 40, "trace": str(tmp_path)}
+    env = gym.make("highway-v0", config=config)
+    env.reset(seed=0)
+    positions = []
+    for _ in range(6):
+        env.step(1)
+        positions.append(np.array([v.position for v in env.unwrapped.road.vehicles]))
+    env.close()
+
+    # The last frame of each step is the scene observed by the agent, after the traffic was recycled
+    trace = Trace(str(tmp_path))
+    frequency = env.unwrapped.config["simulation_frequency"] // env.unwrapped.config["policy_frequency"]
+    for step, expected in enumerate(positions):
+        rows = trace.rows(trace.frames(0)[(step + 1) * frequency])
+        recorded = np.stack([trace.columns["x"][rows], trace.columns["y"][rows]], axis=1)
+        assert np.array_equal(recorded, expected.astype(np.float32))
+
+
+def test_append_to_trace(tmp_path):
+    env = gym.make("highway-v0", config={"vehicles_count": 5, "trace": str(tmp_path)})
+    run_episodes(env, seeds=[0])
+    env.close()
+    env = gym.make("highway-v0", config={"vehicles_count": 5, "trace": str(tmp_path)})
+    run_episodes(env, seeds=[1, 2])
+    env.close()
+
+    trace = Trace(str(tmp_path))
+    assert len(trace) == 3
+    assert [episode["seed"] for episode in trace.episodes] == [0, 1, 2]
+    assert len(trace.metadata["networks"]) == 1
+    assert trace.rows(len(trace.columns["offset"]) - 1).stop == len(trace.columns["x"])
+
+
+def test_chunked_flush(tmp_path):
+    env = gym.make("highway-v0", config={"vehicles_count": 5})
+    env.reset(seed=0)
+    recorder = TraceRecorder(str(tmp_path), chunk_size=10)
+    recorder.start_episode(env, seed=0)
+    for _ in range(4):
+        recorder.record_frame(env.unwrapped)
+    # The frames are appended as soon as the buffer holds a chunk of rows, the last one is still buffered
+    assert Trace(str(tmp_path)).metadata["frames"] == 4
+    recorder.close()
+    assert len(Trace(str(tmp_path)).frames(0)) == 5
@@ -0,0 +1,66 @@
+import gymnasium as gym
+import numpy as np
+import highway_env
+from highway_env.vehicle.objects import Landmark
+
+highway_env.register_highway_envs()
+
+
+def test_recycled_vehicles_stay_close():
+    distance = 100
+    env = gym.make("highway-v0", config={"recycle_distance": distance, "vehicles_count": 10, "duration": 1000,
+                                         "simulation_frequency": 5})
+    env.reset(seed=0)
+    unwrapped = env.unwrapped
+    unwrapped.vehicle.collidable = False
+    initial = {id(v) for v in unwrapped.road.vehicles}
+    for _ in range(40):
+        env.step(3)
+    assert len(unwrapped.road.vehicles) == 11
+    assert initial - {id(v) for v in unwrapped.road.vehicles}
+    offsets = np.array([v.position[0] - unwrapped.vehicle.position[0] for v in unwrapped.road.vehicles])
+    assert np.all(np.abs(offsets) <= distance + 30 / unwrapped.config["policy_frequency"])
+
+
+def test_unbounded_highway():
+    distance = 100
+    env = gym.make("highway-v0", config={"recycle_distance": distance, "vehicles_count": 10, "duration": 1000,
+                                         "simulation_frequency": 2, "policy_frequency": 1})
+    env.reset(seed=0)
+    unwrapped = env.unwrapped
+    unwrapped.vehicle.collidable = False
+    lane = unwrapped.road.network.get_lane(unwrapped.vehicle.lane_index)
+    travelled, previous = 0, unwrapped.vehicle.position[0]
+    for _ in range(400):
+        _, _, terminated, truncated, _ = env.step(3)
+        assert not terminated and not truncated
+        travelled += max(unwrapped.vehicle.position[0] - previous, 0)
+        previous = unwrapped.vehicle.position[0]
+    # The ego-vehicle has driven further than the length of the road, and the traffic is still on the lanes around it
+    assert travelled > lane.length
+    assert unwrapped.vehicle.on_road and len(unwrapped.road.vehicles) == 11
+    for vehicle in unwrapped.road.vehicles:
+        assert lane.on_lane(np.array([vehicle.position[0], lane.start[1]]))
+        assert abs(vehicle.position[0] - unwrapped.vehicle.position[0]) <= distance + 30
+
+
+def test_shift_road_objects():
+    distance = 300
+    env = gym.make("highway-v0", config={"recycle_distance": distance, "vehicles_count": 30, "duration": 1000,
+                                         "simulation_frequency": 2, "policy_frequency": 1, "lod_distance": 0})
+    env.reset(seed=0)
+    unwrapped = env.unwrapped
+    unwrapped.vehicle.collidable = False
+    landmark = Landmark(unwrapped.road, unwrapped.vehicle.position + [0, -20])
+    unwrapped.road.objects.append(landmark)
+    shifts = 0
+    for _ in range(200):
+        x, landmark_x = unwrapped.vehicle.position[0], landmark.position[0]
+        env.step(3)
+        if landmark.position[0] != landmark_x:
+            # The road objects are moved back with the vehicles
+            assert unwrapped.vehicle.position[0] < x
+            shifts += 1
+        # The recycled vehicles are no longer simulated as distant vehicles
+        assert all(any(v is other for other in unwrapped.road.vehicles) for v in unwrapped.road.distant_vehicles)
+    assert shifts > 0
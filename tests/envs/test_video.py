@@ -0,0 +1,94 @@
+import os
+import time
+
+import gymnasium as gym
+import numpy as np
+import pytest
+import highway_env
+from highway_env.envs.common.video import AsyncRecordVideo, VideoEncoder
+
+highway_env.register_highway_envs()
+
+
+class ListWriter(object):
+    """A video writer keeping the frames in memory."""
+
+    videos = {}
+
+    def __init__(self, path, fps, size, delay=0.):
+        self.frames = self.videos[path] = []
+        self.size, self.delay, self.closed = size, delay, False
+
+    def write_frame(self, frame):
+        assert frame.shape[1::-1] == self.size
+        time.sleep(self.delay)
+        self.frames.append(frame)
+
+    def close(self):
+        self.closed = True
+
+
+def test_record_several_episodes(tmp_path):
+    ListWriter.videos.clear()
+    env = gym.make("highway-v0", render_mode="rgb_array",
+                   config={"duration": 3, "rendering_backend": "numpy", "vehicles_count": 5})
+    env = AsyncRecordVideo(env, str(tmp_path), episode_trigger=lambda e: True, writer_factory=ListWriter)
+    steps = []
+    for episode in range(2):
+        env.reset(seed=episode)
+        done = truncated = False
+        steps.append(0)
+        while not (done or truncated):
+            _, _, done, truncated, _ = env.step(1)
+            steps[-1] += 1
+    env.close()
+
+    paths = [os.path.join(str(tmp_path), "rl-video-episode-{}.mp4".format(e)) for e in range(2)]
+    assert sorted(ListWriter.videos) == paths
+    for path, count in zip(paths, steps):
+        # The intermediate simulation frames are recorded as well
+        assert len(ListWriter.videos[path]) > count
+        assert os.path.exists(path.replace(".mp4", ".meta.json"))
+    assert env.encoder.encoded_frames == sum(len(frames) for frames in ListWriter.videos.values())
+
+
+def test_back_pressure():
+    encoder = VideoEncoder(max_queued_frames=2, writer_factory=lambda *args: ListWriter(*args, delay=0.01))
+    encoder.open("video.mp4", 15)
+    frames = [np.zeros((4, 6, 3), dtype=np.uint8) for _ in range(10)]
+    start = time.perf_counter()
+    for frame in frames:
+        encoder.write(frame)
+        assert encoder.queue.qsize() <= 2
+    assert time.perf_counter() - start > 0.05  # Waited for the encoding
+    encoder.end()
+    encoder.close()
+    assert all(a is b for a, b in zip(ListWriter.videos["video.mp4"], frames))  # Not copied
+
+
+def test_encoding_error():
+    def failing_writer(*args):
+        raise IOError("disk full")
+    encoder = VideoEncoder(writer_factory=failing_writer)
+    encoder.open("video.mp4", 15)
+    encoder.write(np.zeros((4, 6, 3), dtype=np.uint8))
+    with pytest.raises(IOError):
+        encoder.close()
+    assert not encoder._thread.is_alive()
+
+
+def test_failed_writer_closed():
+    class FailingWriter(ListWriter):
+        def write_frame(self, frame):
+            raise IOError("disk full")
+
+        def close(self):
+            super().close()
+            raise IOError("broken pipe")
+    writers = []
+    encoder = VideoEncoder(writer_factory=lambda *args: writers.append(FailingWriter(*args)) or writers[-1])
+    encoder.open("video.mp4", 15)
+    encoder.write(np.zeros((4, 6, 3), dtype=np.uint8))
+    with pytest.raises(IOError, match="disk full"):
+        encoder.close()
+    assert writers[0].closed
@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+
+import gymnasium as gym
+import numpy as np
+import pytest
+import highway_env
+from highway_env.envs.common.rasterizer import NumpyViewer, RoadRaster, fill_rectangle
+
+highway_env.register_highway_envs()
+envs = ["highway-v0", "merge-v0", "roundabout-v0", "parking-v0"]
+
+
+@pytest.mark.parametrize("env_spec", envs)
+def test_render_numpy(env_spec):
+    env = gym.make(env_spec, render_mode="rgb_array", config={"rendering_backend": "numpy"})
+    env.reset(seed=0)
+    img = env.render()
+    assert isinstance(env.unwrapped.viewer, NumpyViewer)
+    assert img.dtype == np.uint8
+    assert img.shape == (env.unwrapped.config["screen_height"], env.unwrapped.config["screen_width"], 3)
+
+    # The ego-vehicle is drawn in green at the center of the window
+    viewer = env.unwrapped.viewer
+    x, y = ((env.unwrapped.vehicle.position - viewer.origin) * viewer.scaling).astype(int)
+    assert tuple(img[y, x]) == (50, 200, 0)
+    env.close()
+
+
+def test_render_like_pygame():
+    images = []
+    for backend in ["pygame", "numpy"]:
+        env = gym.make("highway-v0", render_mode="rgb_array",
+                       config={"offscreen_rendering": True, "rendering_backend": backend})
+        env.reset(seed=0)
+        images.append(env.render().astype(int))
+        env.close()
+    assert np.mean(np.any(images[0] != images[1], axis=-1)) < 0.1
+
+
+def test_obs_grayscale_numpy():
+    env = gym.make("highway-v0", config={
+        "rendering_backend": "numpy",
+        "observation": {
+            "type": "GrayscaleObservation",
+            "observation_shape": (128, 64),
+            "stack_size": 4,
+            "weights": [0.2989, 0.5870, 0.1140],
+        }
+    })
+    obs, _ = env.reset(seed=0)
+    assert obs.shape == (4, 128, 64)
+    assert isinstance(env.unwrapped.observation_type.viewer, NumpyViewer)
+    assert obs[-1].max() > 250  # Lane markings
+
+
+def test_fill_rectangle():
+    image = np.zeros((20, 20, 3), dtype=np.uint8)
+    fill_rectangle(image, (10, 10), (1, 0), 8, 4, (255, 0, 0), outline=(0, 0, 255))
+    painted = image.any(axis=-1)
+    assert painted.sum() == 8 * 4
+    assert (image[9:11, 7:13] == (255, 0, 0)).all() and (image[8, 6:14] == (0, 0, 255)).all()
+
+    # Rotated by 90°
+    image[:] = 0
+    fill_rectangle(image, (10, 10), (0, 1), 8, 4, (255, 0, 0))
+    assert np.array_equal(image.any(axis=-1), painted.T)
+
+
+def test_road_raster_cache():
+    env = gym.make("highway-v0")
+    env.reset(seed=0)
+    raster = RoadRaster.get(env.unwrapped.road.network, 5.5)
+    env.reset(seed=1)  # A new network with the same layout
+    assert RoadRaster.get(env.unwrapped.road.network, 5.5) is raster
+    assert RoadRaster.get(env.unwrapped.road.network, 2) is not raster
+
+
+def test_numpy_rendering_without_pygame():
+    code = "\n".join([
+        "import sys",
+        "import gymnasium as gym",
+        "import highway_env",
+        "highway_env.register_highway_envs()",
+        "env = gym.make('highway-v0', render_mode='rgb_array', config={'rendering_backend': 'numpy'})",
+        "env.reset(seed=0)",
+        "env.step(1)",
+        "env.render()",
+        "print('pygame' in sys.modules)",
+    ])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, env=env)
+    assert output.stdout.strip() == "False"
@@ -34,3 +34,40 @@ def test_obs_grayscale(env_spec, stack_size=4):
     env.close()
     assert isinstance(obs, np.ndarray)
     assert obs.shape == (stack_size, env.config["screen_width"], env.config["screen_height"])
+
+
+def test_road_layer_cache():
+    env = gym.make("highway-v0", render_mode="rgb_array", config={"offscreen_rendering": True})
+    env.reset(seed=0)
+    env.render()
+    surface = env.unwrapped.viewer.sim_surface
+    layer = surface.road_layer
+    tiles = dict(layer.tiles)
+    assert tiles
+    env.step(1)
+    env.render()
+    assert surface.road_layer is layer
+    assert all(layer.tiles[key] is tile for key, tile in tiles.items() if key in layer.tiles)
+
+    # The tiles are drawn again when zooming
+    surface.scaling *= 1.3
+    env.render()
+    assert surface.road_layer is not layer and surface.road_layer.scaling == surface.scaling
+    env.close()
+
+
+def test_vehicle_sprite_cache():
+    from highway_env.vehicle.graphics import VehicleGraphics
+    env = gym.make("highway-v0", render_mode="rgb_array", config={"offscreen_rendering": True})
+    env.reset(seed=0)
+    VehicleGraphics._sprites.clear()
+    env.render()
+    sprites = dict(VehicleGraphics._sprites)
+    visible = [v for v in env.unwrapped.road.vehicles if env.unwrapped.viewer.sim_surface.is_visible(v.position)]
+    assert 0 < len(sprites) <= len(visible)  # Vehicles with the same color and heading share a sprite
+
+    # The same sprites are blitted again
+    env.render()
+    assert VehicleGraphics._sprites.keys() == sprites.keys()
+    assert all(VehicleGraphics._sprites[key] is sprite for key, sprite in sprites.items())
+    env.close()
@@ -3,7 +3,9 @@ import pytest
 
 from highway_env.road.lane import StraightLane, CircularLane, PolyLane
 from highway_env.road.road import Road, RoadNetwork
+from highway_env.vehicle.behavior import IDMVehicle
 from highway_env.vehicle.controller import ControlledVehicle
+from highway_env.vehicle.objects import Obstacle
 
 
 @pytest.fixture
@@ -40,6 +42,53 @@ def test_network(net):
     assert lane_changes >= 3
 
 
+def test_level_of_detail():
+    net = RoadNetwork.straight_road_network(lanes=2, length=2000)
+    road = Road(network=net)
+    ego = ControlledVehicle(road, [0, 0], speed=20)
+    follower = IDMVehicle(road, [500, 4], speed=25, target_speed=25)
+    leader = IDMVehicle(road, [530, 4], speed=15, target_speed=15)
+    road.vehicles = [ego, follower, leader]
+    road.set_level_of_detail([ego], distance=100, period=3)
+    timer = follower.timer
+
+    dt = 1/15
+    for _ in range(30):
+        road.act()
+        road.step(dt)
+    assert road.distant_vehicles == [follower, leader]
+    assert follower.lane_index == ("0", "1", 1) and follower.position[1] == 4 and follower.heading == 0
+    assert 529 < leader.position[0] < 531 + 30 * dt * 15
+    assert follower.speed < 25 and not follower.crashed
+    assert follower.timer - timer == pytest.approx(30 * dt)
+
+    # Promoted back to the full models within range
+    ego.position = np.array([480., 0.])
+    road.act()
+    assert not road.distant_vehicles
+
+
+
+def test_level_of_detail_next_lane():
+    net = RoadNetwork()
+    net.add_lane("a", "b", StraightLane([0, 0], [500, 0]))
+    net.add_lane("b", "c", StraightLane([500, 0], [2000, 0]))
+    road = Road(network=net)
+    ego = ControlledVehicle(road, [0, 0], speed=0)
+    follower = IDMVehicle(road, [450, 0], speed=20, target_speed=20)
+    obstacle = Obstacle(road, [520, 0])
+    road.vehicles, road.objects = [ego, follower], [obstacle]
+    road.set_level_of_detail([ego], distance=100, period=3)
+
+    # The distant vehicle stops behind the obstacle of the next lane
+    dt = 1/15
+    for _ in range(150):
+        road.act()
+        road.step(dt)
+    assert road.distant_vehicles == [follower]
+    assert follower.position[0] < obstacle.position[0] - follower.LENGTH and follower.speed < 1
+
+
 def test_network_to_from_config(net):
     config_dict = net.to_config()
     net_2 = RoadNetwork.from_config(config_dict)
@@ -0,0 +1,35 @@
+import importlib.util
+import json
+import os
+
+spec = importlib.util.spec_from_file_location(
+    "benchmark", os.path.join(os.path.dirname(__file__), os.pardir, "scripts", "benchmark.py"))
+benchmark = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(benchmark)
+
+
+def test_compare():
+    baseline = {"slower": {"median": 1.}, "faster": {"median": 1.}, "broken": {"median": 1.}, "new": {}}
+    results = {"slower": {"median": 1.5}, "faster": {"median": 0.5}, "broken": {"error": "ImportError: gym"},
+               "new": {"median": 1.}, "unknown": {"error": "ImportError: gym"}}
+    regressions = benchmark.compare(results, baseline, threshold=0.2)
+    assert sorted(regressions) == ["broken", "slower"]
+    assert regressions["slower"]["ratio"] == 1.5
+    assert regressions["broken"]["error"] == "ImportError: gym"
+
+
+def test_main(tmp_path):
+    baseline, output = str(tmp_path / "baseline.json"), str(tmp_path / "results.json")
+    args = ["--quick", "--filter", "copy/variant$", "--output", output]
+    assert benchmark.main(args + ["--save-baseline", baseline]) == 0
+    with open(output) as f:
+        assert list(json.load(f)["results"]) == ["copy/variant"]
+
+    with open(baseline) as f:
+        report = json.load(f)
+    report["results"]["copy/variant"]["median"] *= 1e-3
+    with open(baseline, "w") as f:
+        json.dump(report, f)
+    assert benchmark.main(args + ["--baseline", baseline]) == 1
+    with open(output) as f:
+        assert list(json.load(f)["regressions"]) == ["copy/variant"]
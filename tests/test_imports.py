@@ -0,0 +1,22 @@
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ["pygame", "pandas", "scipy", "matplotlib"]
+
+
+def test_headless_imports():
+    """Creating and stepping an environment without rendering does not import the graphics or data libraries."""
+    code = "\n".join([
+        "import sys",
+        "import gymnasium as gym",
+        "import highway_env",
+        "highway_env.register_highway_envs()",
+        "env = gym.make('highway-v0')",
+        "env.reset(seed=0)",
+        "env.step(1)",
+        "print(','.join(m for m in {} if m in sys.modules))".format(HEAVY_MODULES),
+    ])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, env=env)
+    assert output.stdout.strip() == ""
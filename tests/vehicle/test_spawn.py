@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from highway_env.road.road import Road, RoadNetwork
+from highway_env.vehicle.kinematics import Vehicle
+
+
+def sequential(road, count, **kwargs):
+    for _ in range(count):
+        road.vehicles.append(Vehicle.create_random(road, **kwargs))
+    return road.vehicles
+
+
+@pytest.mark.parametrize("existing", [0, 3])
+def test_batch_matches_sequential(existing):
+    """With given lanes and speeds, only the spacings are random and both methods draw them identically."""
+    roads = [Road(RoadNetwork.straight_road_network(lanes=3), np_random=np.random.default_rng(0)) for _ in range(2)]
+    for road in roads:
+        sequential(road, existing, speed=25, lane_id=1)
+    expected = sequential(roads[0], 10, speed=20, lane_id=2, spacing=0.5)[existing:]
+    batch = Vehicle.create_random_batch(roads[1], 10, speed=20, lane_id=2, spacing=0.5)
+    assert np.allclose([v.position for v in batch], [v.position for v in expected])
+
+
+def test_batch_distribution():
+    count, scenes = 20, 200
+    stats = []
+    for create in [lambda road: sequential(road, count),
+                   lambda road: Vehicle.create_random_batch(road, count)]:
+        positions, lanes, speeds = [], [], []
+        for seed in range(scenes):
+            road = Road(RoadNetwork.straight_road_network(lanes=4), np_random=np.random.default_rng(seed))
+            vehicles = create(road)
+            positions.append(np.diff([v.position[0] for v in vehicles]))
+            lanes.extend(v.position[1] for v in vehicles)
+            speeds.extend(v.speed for v in vehicles)
+        stats.append([np.mean(positions), np.std(positions), np.mean(lanes), np.mean(speeds), np.std(speeds)])
+    assert np.allclose(stats[0], stats[1], rtol=0.03)